@@ -58,7 +58,7 @@ class BezierProfile2D(Profile2D):
             return BSpline.constraint_fit(lower_smooth, constraints)
 
     def fit_region(self, start, stop, num_points, control_points):
-        smoothened = [self[self(x)] for x in np.linspace(start, stop, num=num_points)]
+        smoothened = self.get_points(self(np.linspace(start, stop, num=num_points)))
         return Bezier.fit(smoothened, numpoints=num_points)
 
     def fit_profile(self, num_points, control_points):
@@ -19,6 +19,7 @@
 # along with OpenGlider.  If not, see <http://www.gnu.org/licenses/>.
 
 from __future__ import division
+import collections
 import os
 import math
 import numpy as np
@@ -44,38 +45,75 @@ class Profile2D(Polygon2D):
         return super(Profile2D, self).__imul__(fakt)
 
     def __call__(self, xval):
-        xval = float(xval)
-        if xval < 0.:       # LOWER
-            i = 1
-            xval = -xval
-            while self[i][0] >= xval and i < len(self):
-                i += 1
-            i -= 1
-        elif xval == 0:     # NOSE
-            i = self.noseindex - 1
-        else:               # UPPER
-            i = len(self) - 2
-            while self[i][0] > xval and i > 1:
-                i -= 1
-                # Determine k-value
-        k = -(self[i][0] - xval) / (self[i + 1][0] - self[i][0])
-
-        return i + k
+        """
+        Get the ik-value for an x-value (<0: upper side) or an array of x-values
+        """
+        if np.ndim(xval) > 0:
+            return self.get_ik_values(xval)
+        return float(self.get_ik_values([xval])[0])
 
-    def align(self, p):
-        """Align a point (x, y) on the airfoil. x: (0,1), y: (-1,1)"""
-        x, y = p
-        upper = self[self(-x)]
-        lower = self[self(x)]
+    @property
+    def _x_lookup(self):
+        """
+        monotone x-arrays of both halves for the vectorized lookup.
+        upper: cumulative minimum from the start (reversed to be ascending)
+        lower: cumulative minimum from the end (ascending)
+        Cached until data is set or changed by item assignment
+        """
+        lookup = getattr(self, "_lookup", None)
+        if lookup is None or lookup[0] is not self.data or lookup[1] != self._version:
+            x = self.data[:, 0]
+            upper = np.minimum.accumulate(x[1:])[::-1]
+            lower = np.minimum.accumulate(x[2:-1][::-1])[::-1]
+            lookup = self._lookup = (self.data, self._version, upper, lower)
 
-        return lower + (upper-lower) * (y + 1)/2
+        return lookup[2:]
+
+    def get_ik_values(self, xvals):
+        """
+        Vectorized version of __call__ for an array of x-values
+        (same results as [self(x) for x in xvals])
+        """
+        xvals = np.asarray(xvals, dtype=float)
+        x = self.data[:, 0]
+        upper, lower = self._x_lookup
+        num = len(x)
+
+        # upper side: i = number of leading points (from index 1) with x >= xval
+        x_abs = -xvals
+        i_upper = len(upper) - np.searchsorted(upper, x_abs, side="left")
+        # lower side: walk back from the end while x > xval
+        i_lower = num - 2 - (len(lower) - np.searchsorted(lower, xvals, side="right"))
+
+        indices = np.where(xvals < 0, i_upper, i_lower)
+        indices[xvals == 0] = self.noseindex - 1
+        indices = np.clip(indices, 0, num - 2)
+
+        x_abs = np.abs(xvals)
+        k = (x_abs - x[indices]) / (x[indices + 1] - x[indices])
+
+        return indices + k
+
+    def align(self, p):
+        """
+        Align a point (x, y) on the airfoil. x: (0,1), y: (-1,1)
+        or an array of points (shape (n, 2))
+        """
+        p = np.asarray(p, dtype=float)
+        return self.profilepoint(p[..., 0], p[..., 1])
 
     def profilepoint(self, xval, h=-1.):
         """
         Get airfoil Point for x-value (<0:upper side)
         optional: height (-1:lower,1:upper)
+        xval and h can be arrays
         """
-        if not h == -1:  # middlepoint
+        if np.ndim(xval) > 0 or np.ndim(h) > 0:
+            xval, h = np.broadcast_arrays(np.asarray(xval, dtype=float), np.asarray(h, dtype=float))
+            p1 = self.get_points(self.get_ik_values(xval))
+            p2 = self.get_points(self.get_ik_values(-xval))
+            return p1 + ((1. + h) / 2)[..., np.newaxis] * (p2 - p1)
+        elif not h == -1:  # middlepoint
             p1 = self[self(xval)]
             p2 = self[self(-xval)]
             return p1 + (1. + h) / 2 * (p2 - p1)
@@ -97,17 +135,20 @@ class Profile2D(Polygon2D):
         sin_sq = diff.dot([0, -1]) / norm_squared(diff)  # Angle: a.b=|a|*|b|*sin(alpha)
         cos_sq = diff.dot([1, 0]) / norm_squared(diff)
         matrix = np.array([[cos_sq, -sin_sq], [sin_sq, cos_sq]])  # de-rotate and scale
-        self.data = np.array([matrix.dot(i - nose) for i in self.data])
+        self.data = (self.data - nose).dot(matrix.T)
         return self
 
     @HashedList.data.setter
     def data(self, data):
         HashedList.data.fset(self, data)
         if data is not None:
-            i = 0
-            while data[i + 1][0] < data[i][0] and i < len(data):
-                i += 1
-            self.noseindex = i
+            # nose: first point where x stops decreasing
+            x = self.data[:, 0]
+            decreasing = x[1:] < x[:-1]
+            if decreasing.all():
+                self.noseindex = len(x) - 1
+            else:
+                self.noseindex = int(np.argmin(decreasing))
 
     def get_data(self, negative_x=False):
         if not negative_x:
@@ -126,13 +167,11 @@ class Profile2D(Polygon2D):
         return first
 
     def __iadd__(self, other):
-        for i, point in enumerate(self.data):
-            if i > self.noseindex:
-                x = point[0]
-            else:
-                x = -point[0]
-
-            point[1] += other[other(x)][1]
+        x = self.data[:, 0].copy()
+        x[:self.noseindex + 1] *= -1
+        data = self.data.copy()
+        data[:, 1] += other.get_points(other.get_ik_values(x))[:, 1]
+        self.data = data
         return self
 
     @classmethod
@@ -241,15 +280,52 @@ class Profile2D(Polygon2D):
     @property
     def x_values(self):
         """Get XValues of airfoil. upper side neg, lower positive"""
-        i = self.noseindex
-        return [-vector[0] for vector in self.data[:i]] + \
-               [vector[0] for vector in self.data[i:]]
+        x_values = self.data[:, 0].copy()
+        x_values[:self.noseindex] *= -1
+        return x_values.tolist()
 
     @x_values.setter
     def x_values(self, xval):
         """Set X-Values of airfoil to defined points."""
-        data = [(abs(x), self[self(x)][1]) for x in xval]
-        self.data = np.array(data)
+        xval = np.asarray(xval, dtype=float)
+        y = self.get_points(self.get_ik_values(xval))[:, 1]
+        self.data = np.array([np.abs(xval), y]).T
+
+    @classmethod
+    def resample(cls, profiles, x_values):
+        """
+        Set the same x-values for multiple airfoils (same as profile.x_values = x_values for every profile).
+        Identical airfoils are only interpolated once and airfoils sharing the
+        same x-coordinates are interpolated together.
+        """
+        x_values = np.asarray(x_values, dtype=float)
+        x_abs = np.abs(x_values)
+
+        sources = collections.OrderedDict()
+        for profile in profiles:
+            key = (profile.data.shape, profile.data.tobytes())
+            sources.setdefault(key, []).append(profile)
+
+        groups = collections.OrderedDict()
+        for key, same_profiles in sources.items():
+            source = same_profiles[0]
+            x_key = (source.data.shape, source.data[:, 0].tobytes())
+            groups.setdefault(x_key, []).append(same_profiles)
+
+        for group in groups.values():
+            first = group[0][0]
+            iks = first.get_ik_values(x_values)
+            i = np.clip(np.floor(iks).astype(int), 0, len(first.data) - 2)
+            k = iks - i
+
+            y = np.array([same_profiles[0].data[:, 1] for same_profiles in group])
+            y_new = y[:, i] + k * (y[:, i + 1] - y[:, i])
+
+            for same_profiles, y_profile in zip(group, y_new):
+                for profile in same_profiles:
+                    profile.data = np.array([x_abs, y_profile]).T
+
+        return profiles
 
     @property
     def numpoints(self):
@@ -264,8 +340,10 @@ class Profile2D(Polygon2D):
     @property
     def thickness(self):
         """return the maximum sickness (Sic!) of an airfoil"""
-        xvals = sorted(set(map(abs, self.x_values)))
-        return max([self[self(-i)][1] - self[self(i)][1] for i in xvals])
+        xvals = np.unique(np.abs(self.x_values))
+        upper = self.get_points(self.get_ik_values(-xvals))
+        lower = self.get_points(self.get_ik_values(xvals))
+        return max(upper[:, 1] - lower[:, 1])
 
     @thickness.setter
     def thickness(self, newthick):
@@ -278,8 +356,8 @@ class Profile2D(Polygon2D):
 
     @property
     def camber_line(self):
-        xvals = sorted(set(map(abs, self.x_values)))
-        return np.array([self.profilepoint(i, 0.) for i in xvals])
+        xvals = np.unique(np.abs(self.x_values))
+        return self.profilepoint(xvals, np.zeros(len(xvals)))
 
     #@cached_property('self')
     @property
@@ -27,28 +27,52 @@ from openglider.vector.interpolate import Interpolation
 
 
 class ArcSinc:
+    """
+    Inverse of sinc: phi = arcsinc(sin(phi)/phi) for phi in [0, pi]
+
+    phi is tabulated on a uniform grid of u = sqrt(1 - val), where it is a smooth
+    function of u. A lookup is O(1) (index = u * numpoints) and works on arrays.
+    The table is solved to machine precision (newton), the error of the linear
+    interpolation is below 4 / numpoints**2 (4e-6 for the default 1000 points).
+    Values outside [0, 1] are clipped (phi=0 for val >= 1, phi=pi for val <= 0).
+    """
     def __init__(self):
-        self.start = 0.
-        self.end = np.pi
-        self.arsinc = None
+        self.table = None
 
     def __call__(self, val):
-        if self.arsinc is None:
+        if self.table is None:
             self.interpolate(openglider.config['asinc_interpolation_points'])
-        return self.arsinc(val)
 
-    def interpolate(self, numpoints):
-        data = []
+        numpoints = len(self.table) - 1
+        u = np.sqrt(1 - np.clip(val, 0., 1.)) * numpoints
+        index = np.minimum(u.astype(int), numpoints - 1)
+        k = u - index
+        return self.table[index] + k * (self.table[index + 1] - self.table[index])
+
+    @staticmethod
+    def newton(val, iterations=5):
+        """
+        Solve sin(phi) - val*phi = 0 for phi in [0, pi] (val in [0, 1]).
+        The start value matches both ends (phi = sqrt(6*(1-val)) for val -> 1,
+        phi = pi for val = 0), 4 iterations give machine precision.
+        """
+        val = np.asarray(val, dtype=float)
+        u = np.sqrt(1 - val)
+        phi = u * (np.sqrt(6) + (np.pi - np.sqrt(6)) * u)
+        for _ in range(iterations):
+            f = np.sin(phi) - val * phi
+            df = np.cos(phi) - val
+            phi = np.where(phi > 0, phi - f / np.where(phi > 0, df, 1.), 0.)
 
-        for i in range(numpoints + 1):
-            phi = self.end + (i * 1. / numpoints) * (self.start - self.end)  # reverse for interpolation (increasing x_values)
-            data.append([np.sinc(phi / np.pi), phi])
+        return phi
 
-        self.arsinc = Interpolation(data)
+    def interpolate(self, numpoints):
+        u = np.linspace(0, 1, numpoints + 1)
+        self.table = self.newton(1 - u**2)
 
     @property
     def numpoints(self):
-        return len(self.arsinc.x)
+        return len(self.table) - 1
 
     @numpoints.setter
     def numpoints(self, numpoints):
@@ -68,6 +92,8 @@ class Ballooning(object):
 
     def __getitem__(self, xval):
         """Get Ballooning Value (%) for a certain XValue"""
+        if not np.isscalar(xval):
+            return self.get_values(xval)
         if -1 <= xval < 0:
             #return self.upper.xpoint(-xval)[1]
             return self.upper(-xval)
@@ -81,6 +107,22 @@ class Ballooning(object):
         """Get Ballooning Arc (phi) for a certain XValue"""
         return self.phi(1. / (self[xval] + 1))
 
+    def get_values(self, xvals):
+        """Get Ballooning Values (%) for an array of XValues"""
+        xvals = np.asarray(xvals, dtype=float)
+        if np.any((xvals < -1) | (xvals > 1)):
+            raise ValueError("Values {} not between -1 and 1".format(xvals[(xvals < -1) | (xvals > 1)]))
+
+        values = np.zeros(xvals.shape)
+        upper = xvals < 0
+        values[upper] = self.upper(-xvals[upper])
+        values[~upper] = self.lower(xvals[~upper])
+        return values
+
+    def get_phi(self, xvals):
+        """Get Ballooning Arcs (phi) for an array of XValues"""
+        return self.amount_to_phi(self.get_values(xvals))
+
     def get_tension_factor(self, xval):
         """Get the tension due to ballooning"""
         value =  2. * np.tan(self(xval))
@@ -92,20 +134,16 @@ class Ballooning(object):
 
     def __add__(self, other):
         """Add another Ballooning to this one, needed for merging purposes"""
-        upper = []
-        for point in self.upper.data:
-            upper.append([point[0], point[1]+other.upper(point[0])])
-        lower = []
-        for point in self.lower.data:
-            lower.append([point[0], point[1]+other.lower(point[0])])
+        upper = self.upper.data.copy()
+        upper[:, 1] += other.upper(upper[:, 0])
+        lower = self.lower.data.copy()
+        lower[:, 1] += other.lower(lower[:, 0])
 
         return Ballooning(Interpolation(upper), Interpolation(lower))
 
     def __imul__(self, val):
-        for point in self.upper.data:
-            point[1] *= val
-        for point in self.lower.data:
-            point[1] *= val
+        self.upper.data[:, 1] *= val
+        self.lower.data[:, 1] *= val
         return self
 
     def __mul__(self, value):
@@ -125,8 +163,19 @@ class Ballooning(object):
         """
         return cls.arcsinc(baloon)
 
+    @classmethod
+    def amount_to_phi(cls, amount):
+        """
+        Get the angles for an array of ballooning amounts (0 for amount <= 0)
+        """
+        amount = np.asarray(amount, dtype=float)
+        phi = np.zeros(amount.shape)
+        positive = amount > 0
+        phi[positive] = cls.arcsinc(1. / (amount[positive] + 1))
+        return phi
+
     def mapx(self, xvals):
-        return [self[i] for i in xvals]
+        return list(self.get_values(xvals))
 
     @property
     def amount_maximal(self):
@@ -251,11 +300,21 @@ class BallooningBezierNeu(Ballooning):
 
     def __getitem__(self, xval):
         """Get Ballooning Value (%) for a certain XValue"""
+        if not np.isscalar(xval):
+            return self.get_values(xval)
         if -1 <= xval <= 1:
             return self.upper(xval)
         else:
             raise ValueError("Value {} not between -1 and 1".format(xval))
 
+    def get_values(self, xvals):
+        """Get Ballooning Values (%) for an array of XValues"""
+        xvals = np.asarray(xvals, dtype=float)
+        if np.any((xvals < -1) | (xvals > 1)):
+            raise ValueError("Values {} not between -1 and 1".format(xvals[(xvals < -1) | (xvals > 1)]))
+
+        return self.upper(xvals)
+
     @classmethod
     def from_classic(cls, ballooning, numpoints=14):
         upper = ballooning.upper.data
@@ -298,15 +357,10 @@ class BallooningBezierNeu(Ballooning):
         return self
 
     def __add__(self, other):
-        upper = []
-        lower = []
-        for point in self.upper.data:
-            x, y = point
-            if x <= 0:
-                upper.append([-x, y+other[x]])
-
-            if x >= 0:
-                lower.append([x, y+other[x]])
+        x, y = self.upper.data.T
+        y = y + other.get_values(x)
+        upper = np.array([-x, y]).T[x <= 0].tolist()
+        lower = np.array([x, y]).T[x >= 0].tolist()
 
         p0 = [0, self[0]+other[0]]
         upper.append(p0)
@@ -134,22 +134,20 @@ class Cell(CachedObject):
         if not self.miniribs:
             return cells
 
-        for index, xvalue in enumerate(self.x_values):
-            left_point = self.rib1.profile_3d.data[index]
-            right_point = self.rib2.profile_3d.data[index]
-            bl = self.ballooning[xvalue]
-
-            l = norm(right_point - left_point)  # L
-            lnew = sum([norm(c.prof1.data[index] - c.prof2.data[index]) for c in cells])  # L-NEW
-
-            for c in cells:
-                if bl > 0:
-                    newval = l / lnew * (bl+1/2) - 1/2
-                    #newval = l/lnew / bl
-                    #newval = lnew / l / bl if bl != 0 else 1
-                    c.ballooning_phi.append(Ballooning.arcsinc(1/(1+newval)))  # B/L NEW 1 / (bl * l / lnew)
-                else:
-                    c.ballooning_phi.append(0.)
+        bl = self.ballooning.get_values(self.x_values)
+
+        l = np.linalg.norm(self.rib2.profile_3d.data - self.rib1.profile_3d.data, axis=1)  # L
+        lnew = sum([np.linalg.norm(c.prof1.data - c.prof2.data, axis=1) for c in cells])  # L-NEW
+
+        phi = np.zeros(len(bl))
+        positive = bl > 0
+        newval = l[positive] / lnew[positive] * (bl[positive]+1/2) - 1/2
+        #newval = l/lnew / bl
+        #newval = lnew / l / bl if bl != 0 else 1
+        phi[positive] = Ballooning.arcsinc(1/(1+newval))  # B/L NEW 1 / (bl * l / lnew)
+
+        for c in cells:
+            c.ballooning_phi = list(phi)
         return cells
 
     @property
@@ -195,8 +193,7 @@ class Cell(CachedObject):
     @cached_property('ballooning', 'rib1.profile_2d.numpoints', 'rib2.profile_2d.numpoints')
     def ballooning_phi(self):
         x_values = self.rib1.profile_2d.x_values
-        balloon = [self.ballooning[i] for i in x_values]
-        return HashedList([Ballooning.arcsinc(1. / (1+bal)) if bal > 0 else 0 for bal in balloon])
+        return HashedList(self.ballooning.get_phi(x_values))
 
     @property
     def ribs(self):
@@ -332,67 +329,50 @@ class Cell(CachedObject):
                     {self.rib1.name: ribs[0], self.rib2.name: ribs[-1]})
         return mesh
 
-    def get_flattened_cell(self, midribs=10):
+    def get_flattened_cell(self, midribs=10, debug=False):
+        """
+        Flatten the cell
+        :param midribs: number of inner lines between the ribs
+        :param debug: add the distance lines between the outlines ("debug_1", "debug_2")
+        """
         left, right = openglider.vector.projection.flatten_list(self.prof1, self.prof2)
-        left_bal = left.copy()
-        right_bal = right.copy()
-        ballooning = [self.ballooning[x] for x in self.rib1.profile_2d.x_values]
-        for i in range(len(left)):
-            diff = (right[i] - left[i]) * ballooning[i] / 2
-            left_bal.data[i] -= diff
-            right_bal.data[i] += diff
-
-
+        ballooning = self.ballooning.get_values(self.rib1.profile_2d.x_values)
+        diff = (right.data - left.data) * ballooning[:, np.newaxis] / 2
+        left_bal = PolyLine2D(left.data - diff)
+        right_bal = PolyLine2D(right.data + diff)
 
         def _normalize(line, target_lengths):
-            new_line = [line[0]]
-            last_node = line[0]
-            segments = line.get_segments()
-            for segment, target_length in zip(segments, target_lengths):
-                scale = target_length / norm(segment)
-                last_node = last_node + scale * segment
-                new_line.append(last_node)
-
-            return PolyLine2D(new_line)
-        #
-        left_bal_2 = _normalize(left_bal, left.get_segment_lengthes())
-        right_bal_2 = _normalize(right_bal, right.get_segment_lengthes())
-        right_bal_3 = right_bal_2.copy()
-        left_bal_3 = left_bal_2.copy()
+            segments = np.diff(line.data, axis=0)
+            scale = target_lengths / np.linalg.norm(segments, axis=1)
+            new_line = np.concatenate([[line.data[0]], segments * scale[:, np.newaxis]])
+            return np.cumsum(new_line, axis=0)
 
-        debug_lines = []
-        debug_lines2 = []
+        left_new = _normalize(left_bal, left.get_segment_lengthes())
+        right_new = _normalize(right_bal, right.get_segment_lengthes())
 
-        for i in range(len(left_bal)):
-            diff = left_bal_2[i] - right_bal_2[i]
-
-            dist_new = norm(diff)
-            dist_orig = norm(left_bal[i] - right_bal[i])
-
-            diff_per_side = normalize(diff) * ((dist_new - dist_orig) / 2)
-
-            right_bal_2[i] += diff_per_side
-            left_bal_2[i] -= diff_per_side
-
-            debug_lines.append(PolyLine2D([left_bal_2[i], right_bal_2[i]]))
-            debug_lines2.append(PolyLine2D([left_bal[i], right_bal[i]]))
+        diff = left_new - right_new
+        dist_new = np.linalg.norm(diff, axis=1)
+        dist_orig = np.linalg.norm(left_bal.data - right_bal.data, axis=1)
+        diff_per_side = diff / dist_new[:, np.newaxis] * ((dist_new - dist_orig) / 2)[:, np.newaxis]
 
+        left_bal_2 = PolyLine2D(left_new - diff_per_side)
+        right_bal_2 = PolyLine2D(right_new + diff_per_side)
 
         inner = []
         for x in openglider.utils.linspace(0, 1, 2 + midribs):
-            l1 = left_bal * (1-x)
-            l2 = right_bal * x
-            inner.append(l1.add(l2))
+            inner.append(PolyLine2D(left_bal.data * (1-x) + right_bal.data * x))
 
-        #ballooned = [left_bal, right_bal]
-
-        return {
+        flattened = {
             "inner": inner,
             "ballooned": [left_bal, right_bal],
             "ballooned_new": [left_bal_2, right_bal_2],
-            "ballooned_new_copy": [left_bal_3, right_bal_3],
-            "debug": [left, right],
-            "debug_1": debug_lines,
-            "debug_2": debug_lines2
+            "ballooned_new_copy": [PolyLine2D(left_new), PolyLine2D(right_new)],
+            "debug": [left, right]
             }
 
+        if debug:
+            flattened["debug_1"] = [PolyLine2D([p1, p2]) for p1, p2 in zip(left_bal_2, right_bal_2)]
+            flattened["debug_2"] = [PolyLine2D([p1, p2]) for p1, p2 in zip(left_bal, right_bal)]
+
+        return flattened
+
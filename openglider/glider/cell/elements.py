@@ -31,6 +31,13 @@ from openglider.vector.projection import flatten_list
 from openglider.utils import Config
 
 
+try:
+    from scipy.special import erf as _erf
+except ImportError:
+    # elementwise math.erf (python calls per value)
+    _erf = np.vectorize(math.erf, otypes=[float])
+
+
 class DiagonalRib(object):
     def __init__(self, left_front, left_back, right_front, right_back, material_code="", name="unnamed"):
         """
@@ -496,81 +503,87 @@ class Panel(object):
         :param cell: the parent cell of the panel
         :param sigma: std-deviation parameter of gaussian distribution used to weight the length differences.
         :param inner_2d: list of 2D polylines (flat representation of the cell)s
-        :param midribs: precomputed midribs, None by default
+        :param midribs: precomputed midribs (cell.get_midribs(len(inner_2d) - 2)), None by default
         :return: front, back (lists of lenghts) with length equal to number of midribs
         """
+        return self.integrate_3d_shaping_panels([self], cell, sigma, inner_2d, midribs)[0]
+
+    @classmethod
+    def integrate_3d_shaping_panels(cls, panels, cell, sigma, inner_2d, midribs=None):
+        """
+        integrate_3d_shaping for multiple panels of a cell at once:
+        the segment lengths of all ribs are stacked and every panel/rib only uses the part between its cuts.
+        :return: [(front, back), ...] for every panel
+        """
+        if not panels:
+            return []
+
         numribs = len(inner_2d) - 2
-        if midribs is None or len(midribs) != len(inner_2d):
+        if midribs is None or len(midribs) != numribs:
             midribs = cell.get_midribs(numribs)
 
         ribs = [cell.prof1] + midribs + [cell.prof2]
 
         # ! vorn + hinten < gesamt !
 
-        positions = self._get_ik_values(cell, numribs)
-
-        front = []
-        back = []
+        lengths_2d = np.array([line.get_segment_lengthes() for line in inner_2d])
+        lengths_3d = np.array([rib.get_segment_lengthes() for rib in ribs[:numribs + 2]])
+
+        # shape: (panels, ribs, 2)
+        positions = np.array([panel._get_ik_values(cell, numribs) for panel in panels], dtype=float)
+        front_ik = positions[:, :, 0, np.newaxis]
+        back_ik = positions[:, :, 1, np.newaxis]
+
+        # part of every segment between the cuts (0..1), shape: (panels, ribs, segments)
+        segment_no = np.arange(lengths_3d.shape[1])
+        start = np.minimum(front_ik, back_ik)
+        stop = np.maximum(front_ik, back_ik)
+        overlap = np.clip(np.minimum(stop, segment_no + 1) - np.maximum(start, segment_no), 0, 1)
+
+        l2d = overlap * lengths_2d
+        l3d = overlap * lengths_3d
+
+        # distance from the cut in front/back of every segment
+        distance_up = np.cumsum(l3d, axis=-1) - l3d
+        distance_down = np.cumsum(l3d[..., ::-1], axis=-1)[..., ::-1] - l3d
+        ascending = front_ik <= back_ik
+        distance_front = np.where(ascending, distance_up, distance_down)
+        distance_back = np.where(ascending, distance_down, distance_up)
+
+        # influence factor: e^-(x^2/(2*sigma^2))
+        # -> sigma = einflussfaktor [m]
+        # integral = sqrt(pi/2)*sigma * [ erf(x / (sqrt(2)*sigma) ) ]
+        used = overlap > 0
+        l2d = l2d[used]
+        l3d = l3d[used]
+        factor = (l3d - l2d) / l3d
+        scale = 1 / (sigma * math.sqrt(2))
+
+        def integrate(distance):
+            distance = distance[used]
+            x = _erf((distance + l3d) * scale) - _erf(distance * scale)
+            amount = np.zeros(overlap.shape)
+            amount[used] = factor * x
+            return amount.sum(axis=-1)
 
         ff = math.sqrt(math.pi/2)*sigma
-
-        for rib_no in range(numribs + 2):
-            x1, x2 = positions[rib_no]
-            rib_2d = inner_2d[rib_no][x1:x2]
-            rib_3d = ribs[rib_no][x1:x2]
-
-            lengthes_2d = rib_2d.get_segment_lengthes()
-            lengthes_3d = rib_3d.get_segment_lengthes()
-
-            distance = 0
-            amount_front = 0
-            # influence factor: e^-(x^2/(2*sigma^2))
-            # -> sigma = einflussfaktor [m]
-            # integral = sqrt(pi/2)*sigma * [ erf(x / (sqrt(2)*sigma) ) ]
-
-            for l2d, l3d in zip(lengthes_2d, lengthes_3d):
-                factor = (l3d - l2d) / l3d
-                x = math.erf( (distance + l3d) / (sigma*math.sqrt(2))) - math.erf(distance / (sigma*math.sqrt(2)))
-
-                amount_front += factor * x
-                distance += l3d
-
-            distance = 0
-            amount_back = 0
-
-            for l2d, l3d in zip(lengthes_2d[::-1], lengthes_3d[::-1]):
-                factor = (l3d - l2d) / l3d
-                x = math.erf( (distance + l3d) / (sigma*math.sqrt(2))) - math.erf(distance / (sigma*math.sqrt(2)))
-                amount_back += factor * x
-                distance += l3d
-
-            total = 0
-            for l2d, l3d in zip(lengthes_2d, lengthes_3d):
-                total += l3d - l2d
-
-
-            amount_front *= ff
-            amount_back *= ff
-
-            if self.cut_front["type"] != "cut_3d" and self.cut_back["type"] != "cut_3d":
-                if abs(amount_front + amount_back) > abs(total):
-                    normalization = abs(total / (amount_front + amount_back))
-                    amount_front *= normalization
-                    amount_back *= normalization
-
-            if rib_no == 0 or rib_no == numribs+1:
-                amount_front = 0
-                amount_back = 0
-            #
-            # # compare profile with rib
-            # if rib_no == 0 or rib_no == numribs+1:
-            #     diff = rib_3d.get_length() - rib_2d.get_length()
-            #     amount_front = diff / 2
-            #     amount_back = diff / 2
-            #     if abs(diff > 0.001):
-            #         print(self.name, rib_no, diff, rib_3d.get_length(), rib_2d.get_length())
-
-            front.append(amount_front)
-            back.append(amount_back)
-
-        return front, back
+        amount_front = integrate(distance_front) * ff
+        amount_back = integrate(distance_back) * ff
+
+        total = np.zeros(overlap.shape)
+        total[used] = l3d - l2d
+        total = total.sum(axis=-1)
+
+        # normalize
+        amount_sum = amount_front + amount_back
+        normalize = np.array([panel.cut_front["type"] != "cut_3d" and panel.cut_back["type"] != "cut_3d"
+                              for panel in panels])[:, np.newaxis]
+        normalize = normalize & (np.abs(amount_sum) > np.abs(total))
+        normalization = np.abs(total / np.where(normalize, amount_sum, 1.))
+        amount_front = np.where(normalize, amount_front * normalization, amount_front)
+        amount_back = np.where(normalize, amount_back * normalization, amount_back)
+
+        amount_front[:, [0, -1]] = 0
+        amount_back[:, [0, -1]] = 0
+
+        return [(front.tolist(), back.tolist()) for front, back in zip(amount_front, amount_back)]
@@ -24,6 +24,7 @@ import math
 
 import numpy as np
 
+from openglider.airfoil import Profile2D
 from openglider.glider.in_out import IMPORT_GEOMETRY, EXPORT_3D
 from openglider.glider.shape import Shape
 from openglider.mesh import Mesh
@@ -350,8 +351,7 @@ class Glider(object):
 
     @profile_x_values.setter
     def profile_x_values(self, xvalues):
-        for rib in self.ribs:
-            rib.profile_2d.x_values = xvalues
+        Profile2D.resample([rib.profile_2d for rib in self.ribs], xvalues)
 
     @property
     def span(self):
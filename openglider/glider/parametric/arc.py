@@ -28,7 +28,7 @@ class ArcCurve(object):
         :return: [p0, p1,...]
         """
         # Symmetric-Bezier-> start from 0.5
-        arc_curve = PolyLine2D([self.curve(i) for i in np.linspace(0.5, 1, self.num_interpolation_points)])
+        arc_curve = PolyLine2D(self.curve(np.linspace(0.5, 1, self.num_interpolation_points)))
         arc_curve_length = arc_curve.get_length()
         scale_factor = arc_curve_length / x_values[-1]
         _positions = [arc_curve.extend(0, x * scale_factor) for x in x_values]
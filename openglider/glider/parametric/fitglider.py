@@ -19,16 +19,15 @@ def fit_glider_3d(cls, glider, numpoints=3):
     aoa = [[front[i][0], rib.aoa_relative] for i, rib in enumerate(glider.ribs)]
     zrot = [[front[i][0], rib.zrot] for i, rib in enumerate(glider.ribs)]
 
-    def symmetric_fit(polyline, numpoints=numpoints):
-        mirrored = PolyLine2D(polyline[1:]).mirror([0, 0], [0, 1])
-        symmetric = mirrored[::-1].join(polyline[int(glider.has_center_cell):])
-        return SymmetricBezier.fit(symmetric, numpoints=numpoints)
+    def symmetric_fit(polylines, numpoints=numpoints):
+        symmetric = []
+        for polyline in polylines:
+            mirrored = PolyLine2D(polyline[1:]).mirror([0, 0], [0, 1])
+            symmetric.append(mirrored[::-1].join(polyline[int(glider.has_center_cell):]))
+        # all curves have one point per rib -> one solve
+        return SymmetricBezier.fit_many([line.data for line in symmetric], numpoints=numpoints)
 
-    front_bezier = symmetric_fit(front)
-    back_bezier = symmetric_fit(back)
-    arc_bezier = symmetric_fit(arc)
-    aoa_bezier = symmetric_fit(aoa)
-    zrot_bezier = symmetric_fit(zrot)
+    front_bezier, back_bezier, arc_bezier, aoa_bezier, zrot_bezier = symmetric_fit([front, back, arc, aoa, zrot])
 
     cell_num = len(glider.cells) * 2 - glider.has_center_cell
 
@@ -40,7 +39,8 @@ def fit_glider_3d(cls, glider, numpoints=3):
     cell_centers = [(p1+p2)/2 for p1, p2 in zip(rib_pos[:-1], rib_pos[1:])]
 
     rib_pos_int = Interpolation(zip([0] + rib_pos[1:], const_arr))
-    rib_distribution = [[i, rib_pos_int(i)] for i in np.linspace(0, rib_pos[-1], 30)]
+    rib_distribution = np.linspace(0, rib_pos[-1], 30)
+    rib_distribution = np.array([rib_distribution, rib_pos_int(rib_distribution)]).T.tolist()
     rib_distribution = Bezier.fit(rib_distribution, numpoints=numpoints+3)
 
     profiles = [rib.profile_2d for rib in glider.ribs]
@@ -311,6 +311,10 @@ class ParametricGlider(object):
         aoa_int = self.aoa.interpolation(num=num)
         zrot_int = self.zrot.interpolation(num=num)
 
+        merge_factors = profile_merge_curve(np.abs(x_values))
+        aoa_values = aoa_int(x_values)
+        zrot_values = zrot_int(x_values)
+
         arc_pos = list(self.arc.get_arc_positions(x_values))
         rib_angles = self.arc.get_rib_angles(x_values)
 
@@ -325,6 +329,9 @@ class ParametricGlider(object):
         rib_holes = self.elements.get("holes", [])
         rigids = self.elements.get("rigidfoils", [])
 
+        profiles = [self.get_merge_profile(factor) for factor in merge_factors]
+        Profile2D.resample(profiles, profile_x_values)
+
         cell_centers = [(p1+p2)/2 for p1, p2 in zip(x_values[:-1], x_values[1:])]
         offset_x = shape_ribs[0][0][1]
         for rib_no, pos in enumerate(x_values):
@@ -333,10 +340,8 @@ class ParametricGlider(object):
             startpoint = np.array([-front[1] + offset_x, arc[0], arc[1]])
 
             chord = abs(front[1]-back[1])
-            factor = profile_merge_curve(abs(pos))
-            profile = self.get_merge_profile(factor)
+            profile = profiles[rib_no]
             profile.name = "Profile{}".format(rib_no)
-            profile.x_values = profile_x_values
 
             this_rib_holes = [RibHole(ribhole["pos"], ribhole["size"]) for ribhole in rib_holes if rib_no in ribhole["ribs"]]
             this_rigid_foils = [RigidFoil(rigid["start"], rigid["end"], rigid["distance"]) for rigid in rigids if rib_no in rigid["ribs"]]
@@ -347,13 +352,13 @@ class ParametricGlider(object):
                 chord=chord,
                 arcang=rib_angles[rib_no],
                 glide=self.glide,
-                aoa_absolute=aoa_int(pos),
-                zrot=zrot_int(pos),
+                aoa_absolute=aoa_values[rib_no],
+                zrot=zrot_values[rib_no],
                 holes=this_rib_holes,
                 rigidfoils=this_rigid_foils,
                 name="rib{}".format(rib_no)
             ))
-            ribs[-1].aoa_relative = aoa_int(pos)
+            ribs[-1].aoa_relative = aoa_values[rib_no]
 
         if self.shape.has_center_cell:
             new_rib = ribs[0].copy()
@@ -363,10 +368,11 @@ class ParametricGlider(object):
             ribs.insert(0, new_rib)
             cell_centers.insert(0, 0.)
 
+        ballooning_factors = ballooning_merge_curve(cell_centers)
+
         glider.cells = []
         for cell_no, (rib1, rib2) in enumerate(zip(ribs[:-1], ribs[1:])):
-            ballooning_factor = ballooning_merge_curve(cell_centers[cell_no])
-            ballooning = self.merge_ballooning(ballooning_factor)
+            ballooning = self.merge_ballooning(ballooning_factors[cell_no])
             cell = Cell(rib1, rib2, ballooning, name="c{}".format(cell_no+1))
 
             glider.cells.append(cell)
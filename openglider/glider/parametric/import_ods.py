@@ -232,13 +232,16 @@ def get_geometry_explicit(sheet):
 
         span_last = span
 
-    def symmetric_fit(data, bspline=False):
-        not_from_center = int(data[0][0] == 0)
-        mirrored = [[-p[0], p[1]] for p in data[not_from_center:]][::-1] + data
+    def symmetric_fit(curves, bspline=False):
+        mirrored = []
+        for data in curves:
+            not_from_center = int(data[0][0] == 0)
+            mirrored.append([[-p[0], p[1]] for p in data[not_from_center:]][::-1] + data)
+        # curves with the same number of points share one solve
         if bspline:
-            return SymmetricBSpline.fit(mirrored)
+            return SymmetricBSpline.fit_many(mirrored)
         else:
-            return SymmetricBezier.fit(mirrored)
+            return SymmetricBezier.fit_many(mirrored)
 
     has_center_cell = not front[0][0] == 0
     cell_no = (len(front) - 1) * 2 + has_center_cell
@@ -248,20 +251,24 @@ def get_geometry_explicit(sheet):
     const_arr = [0.] + np.linspace(start, 1, len(front) - (not has_center_cell)).tolist()
     rib_pos = [0.] + [p[0] for p in front[not has_center_cell:]]
     rib_pos_int = Interpolation(zip(rib_pos, const_arr))
-    rib_distribution = [[i, rib_pos_int(i)] for i in np.linspace(0, rib_pos[-1], 30)]
+    rib_distribution = np.linspace(0, rib_pos[-1], 30)
+    rib_distribution = np.array([rib_distribution, rib_pos_int(rib_distribution)]).T.tolist()
 
     rib_distribution = Bezier.fit(rib_distribution)
 
-    parametric_shape = ParametricShape(symmetric_fit(front), symmetric_fit(back), rib_distribution, cell_no)
-    arc_curve = ArcCurve(symmetric_fit(arc))
+    front_curve, back_curve, arc_curve, aoa_curve, zrot_curve = symmetric_fit([front, back, arc, aoa, zrot])
+    profile_merge_curve, ballooning_merge_curve = symmetric_fit([profile_merge, ballooning_merge], bspline=True)
+
+    parametric_shape = ParametricShape(front_curve, back_curve, rib_distribution, cell_no)
+    arc_curve = ArcCurve(arc_curve)
 
     return {
         "shape": parametric_shape,
         "arc": arc_curve,
-        "aoa": symmetric_fit(aoa),
-        "zrot": symmetric_fit(zrot),
-        "profile_merge_curve": symmetric_fit(profile_merge, bspline=True),
-        "ballooning_merge_curve": symmetric_fit(ballooning_merge, bspline=True)
+        "aoa": aoa_curve,
+        "zrot": zrot_curve,
+        "profile_merge_curve": profile_merge_curve,
+        "ballooning_merge_curve": ballooning_merge_curve
 
     }
 
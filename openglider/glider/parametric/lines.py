@@ -7,6 +7,7 @@ from openglider.glider.rib.elements import AttachmentPoint, CellAttachmentPoint
 from openglider.lines import Node, Line, LineSet
 from openglider.utils import recursive_getattr
 from openglider.lines import line_types
+from openglider.lines.topology import LineTopology
 from openglider.utils.table import Table
 
 
@@ -108,6 +109,7 @@ class LineSet2D(object):
     regex_node = re.compile(r"([a-zA-Z]*)([0-9]*)")
     def __init__(self, line_list):
         self.lines = line_list
+        self._topology = None
 
     def __json__(self):
         lines = [copy.copy(line) for line in self.lines]
@@ -130,12 +132,13 @@ class LineSet2D(object):
 
     @property
     def nodes(self):
-        nodes = set()
+        # ordered by first occurrence to get reproducible tables
+        nodes = {}
         for line in self.lines:
-            nodes.add(line.upper_node)
-            nodes.add(line.lower_node)
+            nodes.setdefault(id(line.upper_node), line.upper_node)
+            nodes.setdefault(id(line.lower_node), line.lower_node)
 
-        return list(nodes)
+        return list(nodes.values())
 
     def get_upper_nodes(self, rib_no=None):
         nodes = set()
@@ -189,9 +192,22 @@ class LineSet2D(object):
         '''
         # get upper connected force of the node
         # use z-direction of this force
+        upper_nodes = self.get_topology().get_node_influence_nodes(node)
+        force_z = sum(upper.get_node(glider).force[2] for upper in upper_nodes)
+        if not force_z:
+            raise ValueError("No vertical force in node {}".format(node))
+
         # compute scaling
+        factor = weight / force_z
+
         # scale all forces
-        pass
+        for upper in self.get_upper_nodes():
+            if isinstance(upper.force, (list, tuple, np.ndarray)):
+                upper.force = [f * factor for f in upper.force]
+            else:
+                upper.force *= factor
+
+        return factor
 
 
     def scale(self, factor):
@@ -233,129 +249,127 @@ class LineSet2D(object):
         return [line for line in self.lines if line.upper_node is node]
 
     def get_influence_nodes(self, line):
-        if isinstance(line.upper_node, UpperNode2D):
-            return [line.upper_node]
-        return sum([self.get_influence_nodes(l) for l in self.get_upper_connected_lines(line.upper_node)], [])
+        return list(self.get_topology().get_influence_nodes(line))
 
-    def create_tree(self, start_node=None):
+    @staticmethod
+    def _is_attachment_point(node):
+        return isinstance(node, UpperNode2D)
+
+    def get_topology(self):
+        """
+        Connectivity index of the current lines,
+        rebuilt when lines, nodes or attachment points change
+        """
+        signature = LineTopology.get_signature(self.lines, self._is_attachment_point)
+        if self._topology is None or self._topology.signature != signature:
+            self._topology = LineTopology(self.lines, self._is_attachment_point, signature)
+        return self._topology
+
+    def create_tree(self, start_node=None, topology=None):
         """
         Create a tree of lines
         :return: [(line, [(upper_line1, []),...]),(...)]
         """
+        topology = topology or self.get_topology()
         if start_node is None:
             start_node = self.get_lower_attachment_points()
             lines = []
             for node in start_node:
-                lines += self.get_upper_connected_lines(node)
+                lines += topology.get_upper_connected_lines(node)
         else:
-            lines = self.get_upper_connected_lines(start_node)
-
-        def get_influence_nodes(line):
-            if isinstance(line.upper_node, UpperNode2D):
-                return [line.upper_node]
-            return sum([get_influence_nodes(l) for l in self.get_upper_connected_lines(line.upper_node)], [])
+            lines = topology.get_upper_connected_lines(start_node)
 
         for line in lines:
-            if not get_influence_nodes(line):
+            if not topology.get_influence_nodes(line):
                 return line
 
         def sort_key(line):
-            nodes = get_influence_nodes(line)
-            if not nodes:
-                print("line", line)
-                #return -1
+            nodes = topology.get_influence_nodes(line)
             val = sum([100*(node.cell_no+node.cell_pos)+100*node.rib_pos for node in nodes])/len(nodes)
-            #print(line.name, val)
             return val
 
-        lines.sort(key=sort_key)
-
-        return [(line, self.create_tree(line.upper_node)) for line in lines]
+        return topology.create_tree(lines, sort_key)
 
     def get_input_table(self):
-        table = Table()
+        rows = []
+        topology = self.get_topology()
 
         def insert_block(line, upper, row, column):
-            table[row, column+1] = line.line_type.name
+            row[column+1] = line.line_type.name
             if upper:
-                table[row, column] = round(line.target_length, 3)
+                row[column] = round(line.target_length, 3)
                 for line, line_upper in upper:
                     row = insert_block(line, line_upper, row, column+2)
             else:  # Insert a top node
                 name = line.upper_node.name
                 if not name:
-                    name = "Rib_{}/{}".format(line.upper_node.rib_no,
+                    name = "Rib_{}/{}".format(line.upper_node.cell_no,
                                               line.upper_node.rib_pos)
-                table[row, column] = name
-                row += 1
+                row[column] = name
+                rows.append(row)
+                row = {}
             return row
 
-        row = 0
         for node in self.get_lower_attachment_points():
-            tree = self.create_tree(node)
-            table[row, 0] = node.name
+            tree = self.create_tree(node, topology=topology)
+            row = {0: node.name}
             for line, upper in tree:
                 row = insert_block(line, upper, row, 1)
 
-        return table
+        return Table.from_rows(rows)
 
     @classmethod
     def read_input_table(cls, sheet, attachment_points_lower, attachment_points_upper):
-
+        """
+        Read the lines from a table (see get_input_table):
+        every row holds one gallery line, [lower_node_name, (length, type,)*, gallery_node_name, type]
+        empty cells continue the line from the row above.
+        """
         # upper -> dct {name: node}
-        num_rows = sheet.num_rows
         num_cols = sheet.num_columns
 
         linelist = []
-        current_nodes = [None for row in range(num_cols)]
-        row = 0
-        column = 0
-        count = 0
-
-        while row < num_rows:
-            value = sheet[row, column]  # length or node_no
-
-            if value is not None:
-                if column == 0:  # first (line-)floor
-                    lower_node_name = sheet[row, 0]
-                    if not type(lower_node_name) == str:
-                        lower_node_name = str(int(lower_node_name))
-                    current_nodes = [attachment_points_lower[lower_node_name]] + \
-                                    [None for __ in range(num_cols)]
-                    column += 1
-
+        current_nodes = [None for __ in range(num_cols)]
+
+        for row in sheet.get_rows():
+            if row[0] is not None:  # first (line-)floor
+                lower_node_name = row[0]
+                if not type(lower_node_name) == str:
+                    lower_node_name = str(int(lower_node_name))
+                current_nodes = [attachment_points_lower[lower_node_name]] + \
+                                [None for __ in range(num_cols)]
+
+            column = 1
+            while column < num_cols:
+                value = row[column]  # length or node_no
+
+                if value is None:
+                    if column + 2 >= num_cols:
+                        break
+                    column += 2
+                    continue
+
+                # We have a line
+                line_type_name = row[column + 1] if column + 1 < num_cols else None
+                lower_node = current_nodes[column // 2]
+
+                # gallery
+                is_gallery = column + 2 >= num_cols - 1 or row[column + 2] is None
+                if is_gallery:
+                    upper = attachment_points_upper[value]
+                    line_length = None
+                # other line
                 else:
-                    # We have a line
-                    line_type_name = sheet[row, column + 1]
+                    upper = BatchNode2D([0, 0])
+                    current_nodes[column // 2 + 1] = upper
+                    line_length = row[column]
 
-                    lower_node = current_nodes[column // 2]
+                linelist.append(
+                    Line2D(lower_node, upper, target_length=line_length, line_type=line_type_name))
 
-                    # gallery
-                    if column + 2 >= num_cols - 1 or sheet[row, column + 2] is None:
-
-                        upper = attachment_points_upper[value]
-                        line_length = None
-                        row += 1
-                        column = 0
-                    # other line
-                    else:
-                        upper = BatchNode2D([0, 0])
-                        current_nodes[column // 2 + 1] = upper
-                        line_length = sheet[row, column]
-                        column += 2
-
-                    linelist.append(
-                        Line2D(lower_node, upper, target_length=line_length, line_type=line_type_name))
-                    count += 1
-
-            else:
-                if column == 0:
-                    column += 1
-                elif column + 2 >= num_cols:
-                    row += 1
-                    column = 0
-                else:
-                    column += 2
+                if is_gallery:
+                    break
+                column += 2
 
         return cls(linelist)
 
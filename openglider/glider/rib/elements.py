@@ -21,6 +21,7 @@ import numpy as np
 import math
 
 from openglider.lines import Node
+from openglider.utils.cache import hash_attributes
 from openglider.plots.marks import Polygon
 from openglider.vector.polyline import PolyLine2D
 from openglider.vector.functions import set_dimension
@@ -110,7 +111,7 @@ class FoilCurve(object):
         ]
         profile = rib.profile_2d
 
-        cp = [profile.align(point)*rib.chord for point in curve]
+        cp = list(profile.align(curve) * rib.chord)
 
 
         return Bezier(cp).interpolation(numpoints)
@@ -173,6 +174,9 @@ class GibusArcs(object):
 
 
 class CellAttachmentPoint(Node):
+    cell_hashlist = ('rib1', 'rib2', 'ballooning_phi', 'miniribs')
+    _position_hash = None
+
     def __init__(self, cell, name, cell_pos, rib_pos, force=None):
         super(CellAttachmentPoint, self).__init__(node_type=2)
         self.cell = cell
@@ -198,8 +202,33 @@ class CellAttachmentPoint(Node):
         self.vec = self.cell.midrib(self.cell_pos)[ik]
         return self.vec
 
+    @classmethod
+    def get_positions(cls, points):
+        """
+        Update the positions of many attachment points:
+        every midrib is computed once for all points on it
+        """
+        groups = {}
+        for point in points:
+            groups.setdefault((id(point.cell), point.cell_pos), []).append(point)
+
+        for cell_points in groups.values():
+            cell, cell_pos = cell_points[0].cell, cell_points[0].cell_pos
+            cell_hash = hash_attributes(cell, cls.cell_hashlist)
+            todo = [p for p in cell_points if p._position_hash != (cell_hash, cell_pos, p.rib_pos)]
+            if not todo:
+                continue
+
+            iks = cell.rib1.profile_2d([p.rib_pos for p in todo])
+            positions = cell.midrib(cell_pos).get_points(iks)
+            for point, position in zip(todo, positions):
+                point.vec = position
+                point._position_hash = (cell_hash, cell_pos, point.rib_pos)
+
 # Node from lines
 class AttachmentPoint(Node):
+    _position_hash = None
+
     def __init__(self, rib, name, rib_pos, force=None):
         super(AttachmentPoint, self).__init__(node_type=2)
         self.rib = rib
@@ -221,6 +250,29 @@ class AttachmentPoint(Node):
         self.vec = self.rib.profile_3d[self.rib.profile_2d(self.rib_pos)]
         return self.vec
 
+    @classmethod
+    def get_positions(cls, points):
+        """
+        Update the positions of many attachment points with one
+        profile lookup per rib
+        """
+        groups = {}
+        for point in points:
+            groups.setdefault(id(point.rib), []).append(point)
+
+        for rib_points in groups.values():
+            rib = rib_points[0].rib
+            rib_hash = hash(rib)
+            todo = [p for p in rib_points if p._position_hash != (rib_hash, p.rib_pos)]
+            if not todo:
+                continue
+
+            iks = rib.profile_2d([p.rib_pos for p in todo])
+            positions = rib.profile_3d.get_points(iks)
+            for point, position in zip(todo, positions):
+                point.vec = position
+                point._position_hash = (rib_hash, point.rib_pos)
+
 
 class RibHole(object):
     def __init__(self, pos, size=0.5, horizontal_shift=0., rotation=0.):
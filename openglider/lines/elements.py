@@ -27,7 +27,7 @@ from openglider.lines.functions import proj_force, proj_to_surface
 from openglider.utils.cache import cached_property, CachedObject
 from openglider.vector import PolyLine
 from openglider.vector.functions import norm, normalize
-from openglider.mesh import Mesh, Vertex, Polygon
+from openglider.mesh import Mesh, Polygon
 
 
 class SagMatrix():
@@ -217,9 +217,7 @@ class Line(CachedObject):
         """
         Return points of the line
         """
-        if self.sag_par_1 is None or self.sag_par_2 is None:
-            sag=False
-        return np.array([self.get_line_point(i / (numpoints - 1), sag=sag) for i in range(numpoints)])
+        return get_line_points([self], numpoints=numpoints, sag=sag)[0]
 
     def get_line_point(self, x, sag=True):
         """pos(x) [x,y,z], x: [0,1]"""
@@ -238,18 +236,7 @@ class Line(CachedObject):
         return u
 
     def get_mesh(self, numpoints):
-        line_points = [Vertex(*point) for point in self.get_line_points(numpoints=numpoints)]
-        boundary = {"lines": []}
-        if self.lower_node.type == 0:
-            boundary["lower_attachment_points"] = [line_points[0]]
-        else:
-            boundary["lines"].append(line_points[0])
-        if self.upper_node.type == 2:
-            boundary["attachment_points"] = [line_points[-1]]
-        else:
-            boundary["lines"].append(line_points[-1])
-        line_poly = {"lines": [Polygon(line_points[i:i + 2]) for i in range(len(line_points) - 1)]}
-        return Mesh(line_poly, boundary)
+        return get_lines_mesh([self], numpoints)
 
     @property
     def _get_projected_par(self):
@@ -317,6 +304,63 @@ class Line(CachedObject):
         return f * self.force / l
 
 
+def get_line_points(lines, numpoints=10, sag=True):
+    """
+    Sample many lines at once (vectorized Line.get_line_point)
+    :return: np.array of shape (len(lines), numpoints, 3)
+    """
+    x = np.linspace(0, 1, numpoints)
+    lower = np.array([line.lower_node.vec for line in lines], dtype=float).reshape(-1, 1, 3)
+    upper = np.array([line.upper_node.vec for line in lines], dtype=float).reshape(-1, 1, 3)
+    points = lower * (1. - x[:, np.newaxis]) + upper * x[:, np.newaxis]
+
+    if sag:
+        sag_lines = [i for i, line in enumerate(lines)
+                     if line.sag_par_1 is not None and line.sag_par_2 is not None]
+        if sag_lines:
+            sag_lines = np.array(sag_lines)
+            parameters = np.array([[lines[i].length_projected,
+                                    lines[i].ortho_pressure / lines[i].force_projected,
+                                    lines[i].sag_par_1,
+                                    lines[i].sag_par_2] for i in sag_lines]).T
+            length_projected, pressure_ratio, sag_par_1, sag_par_2 = parameters[:, :, np.newaxis]
+            v_inf_0 = np.array([lines[i].v_inf_0 for i in sag_lines])
+
+            xi = x * length_projected
+            u = -xi ** 2 / 2 * pressure_ratio + xi * sag_par_1 + sag_par_2
+            points[sag_lines] += u[:, :, np.newaxis] * v_inf_0[:, np.newaxis, :]
+
+    return points
+
+
+def get_lines_mesh(lines, numpoints):
+    """
+    Mesh of many lines: one polyline per line (group "lines"),
+    the line name is stored in the polygon attributes
+    """
+    points = get_line_points(lines, numpoints=numpoints)
+    polygons = []
+    boundaries = {"lines": [], "lower_attachment_points": [], "attachment_points": []}
+
+    for line_no, line in enumerate(lines):
+        first = line_no * numpoints
+        last = first + numpoints - 1
+        attributes = {"name": line.name}
+        polygons += [Polygon([i, i + 1], attributes=attributes) for i in range(first, last)]
+
+        if line.lower_node.type == 0:
+            boundaries["lower_attachment_points"].append(first)
+        else:
+            boundaries["lines"].append(first)
+        if line.upper_node.type == 2:
+            boundaries["attachment_points"].append(last)
+        else:
+            boundaries["lines"].append(last)
+
+    boundaries = {name: nodes for name, nodes in boundaries.items() if nodes or name == "lines"}
+    return Mesh.from_indexed(points.reshape(-1, 3), {"lines": polygons}, boundaries)
+
+
 class Node(object):
     def __init__(self, node_type, position_vector=None, attachment_point=None, name=None):
         self.type = node_type  # lower, top, middle (0, 2, 1)
@@ -342,6 +386,15 @@ class Node(object):
     def get_position(self):
         pass
 
+    @classmethod
+    def get_positions(cls, nodes):
+        """
+        Update the position of many nodes at once.
+        Subclasses override this to share the geometry evaluation.
+        """
+        for node in nodes:
+            node.get_position()
+
     def calc_proj_vec(self, v_inf):
         self.vec_proj = proj_to_surface(self.vec, v_inf)
         return proj_to_surface(self.vec, v_inf)
@@ -38,8 +38,7 @@ def import_lines(path):
 
 
 def store_nodes(values, thalist, key_dict):
-    n = Node(try_convert(values[0], int))
-    n.type = try_convert(values[1], int)
+    n = Node(try_convert(values[1], int))
     n.vec = np.array([try_convert(x, float) for x in values[2:5]])
     n.force = np.array([try_convert(x, float) for x in values[5:8]])
     thalist.append(n)
@@ -51,37 +50,92 @@ def store_lines(values, thalist, key_dict):
     upper = key_dict["NODES"][2][upper_no]
     lower = key_dict["NODES"][2][lower_no]
     l = Line(number=try_convert(values[0], int), upper_node=upper, lower_node=lower,
-             v_inf=[10, 0, 0], target_length=try_convert(values[3], float))
-    l.type = LineType.get(values[4])
+             v_inf=[10, 0, 0], target_length=try_convert(values[3], float),
+             line_type=LineType.get(values[4]))
     thalist.append(l)
 
 
 def try_convert(str, form):
+    if str == "None":
+        return None
     try:
         return form(str)
     except Exception:
         return None
 
 
-def import_file(path, key_dict):
+def tokenize(lines, keys):
+    """
+    Split a line-plan into its values.
+    Yields (line_nr, key, values) for every data line, keys start a block
+    and an empty line ends it. Comments (#) are skipped.
+    """
     current_key = None
+    for line_nr, line in enumerate(lines, 1):
+        values = line.split()
+        if not values:
+            current_key = None
+        elif values[0] in keys:
+            current_key = values[0]
+        elif current_key is not None and not values[0].startswith("#"):
+            yield line_nr, current_key, values
+
+
+def import_file(path, key_dict):
     with open(path, "r") as lfile:
-        line_nr = 1
-        for line in lfile:
-            line = line.replace("\n", "")
-            line = line.replace("\t", " ")
-            line = line.split(" ")  # [ 'sfsd', '']
-            line = list(filter(lambda a: a != '', line))  # filter empty elements
-
-            if len(line) > 0:
-                if line[0] in key_dict:
-                    current_key = line[0]
-                elif current_key is not None:
-                    if key_dict[current_key][0] == len(line):
-                        key_dict[current_key][1](line, key_dict[current_key][2], key_dict)  # function from key-dict
-                    elif line[0] != "#":
-                        print("error in inputfile, line " + str(line_nr))
+        for line_nr, key, values in tokenize(lfile, key_dict):
+            num_values, store, thalist = key_dict[key]
+            if num_values == len(values):
+                store(values, thalist, key_dict)  # function from key-dict
             else:
-                current_key = None
-            line_nr += 1
-    return key_dict
\ No newline at end of file
+                print("error in inputfile, line " + str(line_nr))
+    return key_dict
+
+
+def _format(value):
+    if value is None:
+        return "None"
+    return repr(float(value))
+
+
+def dump_lines(lineset, name="LINESET"):
+    """
+    Yield the lines of a line-plan in the text format (see import_lines)
+    """
+    nodes = []
+    node_numbers = {}
+    for line in lineset.lines:
+        for node in (line.lower_node, line.upper_node):
+            if id(node) not in node_numbers:
+                node_numbers[id(node)] = len(nodes)
+                nodes.append(node)
+
+    yield name + "\n"
+    yield "\n"
+    yield "NODES\n"
+    yield "#\tn_nr\tTYP\tx\ty\tz\tfx\tfy\tfz\n"
+    for node_no, node in enumerate(nodes):
+        vec = node.vec if node.vec is not None else [None] * 3
+        force = node.force if node.force is not None else [None] * 3
+        values = [str(node_no), str(node.type)] + [_format(x) for x in vec] + [_format(x) for x in force]
+        yield "\t".join(values) + "\n"
+
+    yield "\n"
+    yield "LINES\n"
+    yield "#\tl_nr\tLOWER\tUPPER\tLENGTH\tTYP\n"
+    for line_no, line in enumerate(lineset.lines):
+        values = [str(line_no),
+                  str(node_numbers[id(line.lower_node)]),
+                  str(node_numbers[id(line.upper_node)]),
+                  _format(line.target_length),
+                  line.type.name]
+        yield "\t".join(values) + "\n"
+
+
+def export_lines(lineset, path, name=None):
+    """
+    Export a LineSet to the text format (see import_lines)
+    """
+    with open(path, "w") as outfile:
+        outfile.writelines(dump_lines(lineset, name or "LINESET"))
+    return path
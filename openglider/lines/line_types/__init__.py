@@ -1,7 +1,5 @@
-from . import cousin
-from . import liros
-
+# manufacturer modules (cousin, liros,...) are loaded lazily by LineType.types
 from .linetype import LineType
 
 LineType("default", 0, [[100, 0]], weight=0)
-LineType("riser", 0, [[100, 0]], weight=0)
\ No newline at end of file
+LineType("riser", 0, [[100, 0]], weight=0)
@@ -16,15 +16,168 @@
 # GNU General Public License for more details.
 #
 # You should have received a copy of the GNU General Public License
-# along with OpenGlider.  If not, see <http://www.gnu.org/licenses/
+# along with OpenGlider.  If not, see <http://www.gnu.org/licenses/>.
 from __future__ import division
-import sys
+import importlib
+import os
+import pkgutil
+
+import numpy as np
 
 from openglider.vector import Interpolation
 
 
+def _interp_extrapolate(x, xp, fp):
+    """
+    np.interp with linear extrapolation beyond both ends
+    (same behaviour as Interpolation(..., extrapolate=True))
+    """
+    x = np.asarray(x, dtype=float)
+    if len(xp) < 2:
+        return np.full(x.shape, fp[0], dtype=float)
+
+    shape = x.shape
+    x = x.reshape(-1)
+    y = np.interp(x, xp, fp)
+    lower = x < xp[0]
+    upper = x > xp[-1]
+    if lower.any():
+        slope = (fp[1] - fp[0]) / (xp[1] - xp[0])
+        y[lower] = fp[0] + (x[lower] - xp[0]) * slope
+    if upper.any():
+        slope = (fp[-1] - fp[-2]) / (xp[-1] - xp[-2])
+        y[upper] = fp[-1] + (x[upper] - xp[-1]) * slope
+    return y.reshape(shape)
+
+
+class LineTypeRegistry(dict):
+    """
+    Dict of all line-types by name.
+    Manufacturer modules (cousin, liros,...) are only imported on the first
+    lookup of one of their line-types or when the whole catalog is listed.
+    """
+    _loaded = False
+
+    def __missing__(self, name):
+        module_name = name.split(".")[0]
+        if "." in name and module_name in self.manufacturers():
+            self._load_module(module_name)
+            if dict.__contains__(self, name):
+                return dict.__getitem__(self, name)
+        raise KeyError(name)
+
+    @staticmethod
+    def manufacturers():
+        path = [os.path.dirname(os.path.abspath(__file__))]
+        return [name for _, name, _ in pkgutil.iter_modules(path) if name != "linetype"]
+
+    @staticmethod
+    def _load_module(module_name):
+        importlib.import_module("openglider.lines.line_types." + module_name)
+
+    def load_all(self):
+        if not self._loaded:
+            for module_name in self.manufacturers():
+                self._load_module(module_name)
+            self._loaded = True
+
+    def __contains__(self, name):
+        try:
+            self[name]
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self):
+        self.load_all()
+        return dict.__iter__(self)
+
+    def __len__(self):
+        self.load_all()
+        return dict.__len__(self)
+
+    def keys(self):
+        self.load_all()
+        return dict.keys(self)
+
+    def values(self):
+        self.load_all()
+        return dict.values(self)
+
+    def items(self):
+        self.load_all()
+        return dict.items(self)
+
+
+class LineTypeCatalog(object):
+    """
+    All registered line-types compiled into flat arrays.
+    The stretch curves are stored sorted and concatenated, curve i is
+    x[offsets[i]:offsets[i+1]] / y[offsets[i]:offsets[i+1]]
+    """
+    def __init__(self, types):
+        self.names = list(types)
+        self.index = {name: i for i, name in enumerate(self.names)}
+
+        line_types = [types[name] for name in self.names]
+        lengths = [len(line_type.stretch_x) for line_type in line_types]
+        self.offsets = np.concatenate([[0], np.cumsum(lengths)]).astype(int)
+        self.stretch_x = np.concatenate([line_type.stretch_x for line_type in line_types])
+        self.stretch_y = np.concatenate([line_type.stretch_y for line_type in line_types])
+
+        def get_values(attribute):
+            values = [getattr(line_type, attribute) for line_type in line_types]
+            return np.array([np.nan if value is None else value for value in values], dtype=float)
+
+        self.thickness = get_values("thickness")
+        self.cw = get_values("cw")
+        self.weight = get_values("weight")
+        self.min_break_load = get_values("min_break_load")
+
+    def get_indices(self, type_ids):
+        """
+        Convert line-types, names or catalog indices to catalog indices
+        """
+        if isinstance(type_ids, np.ndarray) and type_ids.dtype.kind in "iu":
+            return type_ids
+
+        indices = []
+        for type_id in type_ids:
+            if isinstance(type_id, LineType):
+                type_id = type_id.name
+            if isinstance(type_id, str):
+                type_id = self.index[type_id]
+            indices.append(type_id)
+        return np.array(indices, dtype=int)
+
+    def get_stretch(self, type_ids, forces):
+        """
+        Get the stretch [%] for every pair of line-type and force
+        """
+        indices = self.get_indices(type_ids)
+        forces = np.asarray(forces, dtype=float)
+        forces = np.broadcast_to(forces, indices.shape)
+        result = np.zeros(indices.shape)
+
+        for index in np.unique(indices):
+            selection = indices == index
+            start, end = self.offsets[index], self.offsets[index+1]
+            result[selection] = _interp_extrapolate(forces[selection],
+                                                    self.stretch_x[start:end],
+                                                    self.stretch_y[start:end])
+
+        return result
+
+    def get_stretch_factors(self, type_ids, forces):
+        return 1 + self.get_stretch(type_ids, forces) / 100
+
+    def get_min_break_loads(self, type_ids):
+        return self.min_break_load[self.get_indices(type_ids)]
+
+
 class LineType():
-    types = {}
+    types = LineTypeRegistry()
+    _catalog = None
 
     def __init__(self, name, thickness, stretch_curve, min_break_load=None, weight=None, cw=1.1):
         """
@@ -39,18 +192,28 @@ class LineType():
         """
         self.name = name
         self.types[name] = self
+        LineType._catalog = None
         self.cw = cw
         self.thickness = thickness / 1000
         if stretch_curve[0][0] != 0:
             stretch_curve.insert(0, [0, 0])
         self.stretch_curve = stretch_curve
         self.stretch_interpolation = Interpolation(stretch_curve, extrapolate=True)
+
+        curve = np.array(stretch_curve, dtype=float)
+        order = np.argsort(curve[:, 0], kind="stable")
+        self.stretch_x = curve[order, 0]
+        self.stretch_y = curve[order, 1]
+
         self.weight = weight
 
         self.min_break_load = min_break_load
 
     def get_stretch_factor(self, force):
-        return 1 + self.stretch_interpolation(force) / 100
+        stretch = _interp_extrapolate(force, self.stretch_x, self.stretch_y)
+        if stretch.ndim == 0:
+            stretch = float(stretch)
+        return 1 + stretch / 100
 
     def predict_weight(self):
         t_mm = self.thickness * 1000.
@@ -63,7 +226,39 @@ class LineType():
         except KeyError:
             raise KeyError("Line-type {} not found".format(name))
 
+    @classmethod
+    def get_catalog(cls, load_all=False):
+        """
+        Get the compiled catalog of the loaded line-types.
+        The catalog is recompiled whenever a new line-type gets registered.
+        """
+        if load_all:
+            cls.types.load_all()
+        if cls._catalog is None:
+            cls._catalog = LineTypeCatalog(dict(dict.items(cls.types)))
+        return cls._catalog
 
+    @classmethod
+    def _load_types(cls, type_ids):
+        # make sure every named line-type is loaded before compiling the catalog
+        for name in set(type_id for type_id in type_ids if isinstance(type_id, str)):
+            cls.get(name)
 
-# SI UNITS -> thickness [mm], stretch [N, %]
+    @classmethod
+    def get_stretch_factors(cls, type_ids, forces):
+        """
+        Batched stretch-factor lookup
+        :param type_ids: list of line-types, line-type names or catalog indices
+        :param forces: list of forces (or a single force)
+        :return: np.array of stretch factors (1 + stretch/100)
+        """
+        cls._load_types(type_ids)
+        return cls.get_catalog().get_stretch_factors(type_ids, forces)
 
+    @classmethod
+    def get_min_break_loads(cls, type_ids):
+        """
+        Batched strength lookup (nan for unknown minimal break loads)
+        """
+        cls._load_types(type_ids)
+        return cls.get_catalog().get_min_break_loads(type_ids)
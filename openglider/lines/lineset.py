@@ -1,9 +1,11 @@
 import numpy as np
 import copy
 from openglider.lines import SagMatrix
+from openglider.lines.elements import get_line_points, get_lines_mesh
+from openglider.lines.line_types import LineType
 
 from openglider.lines.functions import proj_force
-from openglider.mesh import Mesh
+from openglider.lines.topology import LineTopology
 from openglider.vector.functions import norm, normalize
 from openglider.utils.table import Table
 
@@ -23,7 +25,8 @@ class LineSet():
             line.lineset = self
         self.mat = None
         self.glider = None
-        
+        self._topology = None
+
 
     @property
     def lowest_lines(self):
@@ -66,29 +69,28 @@ class LineSet():
 
     @property
     def floors(self):
-        def recursive_count_floors(node):
-            if node.type == 2:
-                return 1
-
-            lines = self.get_upper_connected_lines(node)
-            nodes = [line.upper_node for line in lines]
-            depths = [recursive_count_floors(node) for node in nodes]
-            return max(depths) + 1
-
-        return [recursive_count_floors(n) for n in self.lower_attachment_points]
+        topology = self.get_topology()
+        return [topology.get_node_floor(n) for n in self.lower_attachment_points]
 
     def get_mesh(self, numpoints=10):
-        return sum([line.get_mesh(numpoints) for line in self.lines], Mesh())
+        return get_lines_mesh(self.lines, numpoints)
 
     def get_upper_line_mesh(self, numpoints=1, breaks=False):
-        mesh = Mesh()
+        lines = []
         for line in self.uppermost_lines:
             if not breaks:
                 # TODO: is there a better solution???
                 if "BR" in line.upper_node.name:
                     continue
-            mesh += line.get_mesh(numpoints)
-        return mesh
+            lines.append(line)
+        return get_lines_mesh(lines, numpoints)
+
+    def get_line_points(self, numpoints=10, sag=True):
+        """
+        Points of all lines, sampled in one vectorized evaluation
+        :return: np.array (len(self.lines), numpoints, 3)
+        """
+        return get_line_points(self.lines, numpoints=numpoints, sag=sag)
 
     def recalc(self, calculate_sag=True, iterations=1):
         """
@@ -108,8 +110,7 @@ class LineSet():
 
         for i in range(iterations):
             self.calculate_sag = calculate_sag
-            for point in self.attachment_points:
-                point.get_position()
+            self.calc_attachment_point_positions()
             self._calc_geo()
             if self.calculate_sag:
                 self._calc_sag()
@@ -119,17 +120,30 @@ class LineSet():
                     line.sag_par_1 = line.sag_par_2  = None
         return self
 
-    def _calc_geo(self, start=None):
+    def calc_attachment_point_positions(self):
+        """
+        Update the positions of all attachment points,
+        batched per attachment-point type
+        """
+        groups = {}
+        for point in self.attachment_points:
+            groups.setdefault(point.__class__, []).append(point)
+
+        for point_class, points in groups.items():
+            point_class.get_positions(points)
+
+    def _calc_geo(self, start=None, topology=None):
+        topology = topology or self.get_topology()
         if start is None:
             start = self.lowest_lines
         for line in start:
             # print(line.number)
             if line.upper_node.type == 1:  # no gallery line
                 lower_point = line.lower_node.vec
-                tangential = self.get_tangential_comp(line, lower_point)
+                tangential = self.get_tangential_comp(line, lower_point, topology)
                 line.upper_node.vec = lower_point + tangential * line.init_length
 
-                self._calc_geo(self.get_upper_connected_lines(line.upper_node))
+                self._calc_geo(topology.get_upper_connected_lines(line.upper_node), topology)
 
     def _calc_sag(self, start=None):
         if start is None:
@@ -141,21 +155,23 @@ class LineSet():
         for n in self.nodes:
             n.calc_proj_vec(self.v_inf)
 
-        self.calc_forces(start)
+        topology = self.get_topology()
+        self.calc_forces(start, topology)
         for line in start:
-            self._calc_matrix_entries(line)
+            self._calc_matrix_entries(line, topology)
         # print(self.mat)
         self.mat.solve_system()
         for l in self.lines:
             l.sag_par_1, l.sag_par_2 = self.mat.get_sag_parameters(l.number)
 
     # -----CALCULATE SAG-----#
-    def _calc_matrix_entries(self, line):
-        up = self.get_upper_connected_lines(line.upper_node)
+    def _calc_matrix_entries(self, line, topology=None):
+        topology = topology or self.get_topology()
+        up = topology.get_upper_connected_lines(line.upper_node)
         if line.lower_node.type == 0:
             self.mat.insert_type_0_lower(line)
         else:
-            lo = self.get_lower_connected_lines(line.lower_node)
+            lo = topology.get_lower_connected_lines(line.lower_node)
             self.mat.insert_type_1_lower(line, lo[0])
 
         if line.upper_node.type == 1:
@@ -163,17 +179,18 @@ class LineSet():
         else:
             self.mat.insert_type_2_upper(line)
         for u in up:
-            self._calc_matrix_entries(u)
+            self._calc_matrix_entries(u, topology)
 
-    def calc_forces(self, start_lines):
+    def calc_forces(self, start_lines, topology=None):
+        topology = topology or self.get_topology()
         for line_lower in start_lines:
             upper_node = line_lower.upper_node
             vec = line_lower.diff_vector
             if line_lower.upper_node.type != 2:  # not a gallery line
                 # recursive force-calculation
                 # setting the force from top to down
-                lines_upper = self.get_upper_connected_lines(upper_node)
-                self.calc_forces(lines_upper)
+                lines_upper = topology.get_upper_connected_lines(upper_node)
+                self.calc_forces(lines_upper, topology)
 
                 force = np.zeros(3)
                 for line in lines_upper:
@@ -243,16 +260,19 @@ class LineSet():
         return self.get_drag()[1] / norm(self.v_inf) ** 2 * 2
 
     # -----CALCULATE GEO-----#
-    def get_tangential_comp(self, line, pos_vec):
+    def get_tangential_comp(self, line, pos_vec, topology=None):
         # upper_lines = self.get_upper_connected_lines(line.upper_node)
         # first we try to use already computed forces
         # and shift the upper node by residual force
         # we have to make sure to not overcompansate the residual force
+        topology = topology or self.get_topology()
         if line.has_geo and line.force is not None:
-            r = self.get_residual_force(line.upper_node)
+            r = self.get_residual_force(line.upper_node, topology)
             s = 0
 
-            for con_line in self.get_connected_lines(line.upper_node):
+            con_lines = (topology.get_upper_connected_lines(line.upper_node) +
+                         topology.get_lower_connected_lines(line.upper_node))
+            for con_line in con_lines:
                 s += con_line.get_correction_influence(r)
             # the additional factor is needed for stability. A better aproach would be to
             # compute the compansation factor s with a system of linear equation. The movement
@@ -272,7 +292,7 @@ class LineSet():
             # the direction of the line
 
             tangent = np.array([0., 0., 0.])
-            upper_node = self.get_upper_influence_nodes(line)
+            upper_node = topology.get_influence_nodes(line)
             for node in upper_node:
                 tangent += node.calc_force_infl(pos_vec)
             return normalize(tangent)
@@ -282,15 +302,7 @@ class LineSet():
         get the points that have influence on the line and
         are connected to the wing
         """
-        upper_node = line.upper_node
-        if upper_node.type == 2:
-            return [upper_node]
-        else:
-            upper_lines = self.get_upper_connected_lines(upper_node)
-            result = []
-            for upper_line in upper_lines:
-                result += self.get_upper_influence_nodes(upper_line)
-            return result
+        return list(self.get_topology().get_influence_nodes(line))
 
     def iterate_target_length(self, steps=10, pre_load=50):
         """
@@ -298,9 +310,10 @@ class LineSet():
         """
         self.recalc()
         for i in range(steps):
-            for l in self.lines:
+            stretch_factors = self.get_stretch_factors(pre_load)
+            for l, factor in zip(self.lines, stretch_factors):
                 if l.target_length is not None:
-                    diff = l.get_stretched_length(pre_load) - l.target_length
+                    diff = l.length_with_sag * factor - l.target_length
                     l.init_length -= diff
                     #l.init_length = l.target_length * l.init_length / l.get_stretched_length(pre_load)
             #print("------")
@@ -311,40 +324,54 @@ class LineSet():
             line.number = i
 
     def sort_lines(self):
-        new_lines_list = []
-        for line in self.lines:
-            attachment_points = self.get_upper_influence_nodes(line)
-            x = sum(p.rib_pos for p in attachment_points) / len(attachment_points)
-            new_lines_list.append((x, line))
-
-        new_lines_list.sort(key=lambda x: x[0])
-
-        return [line for x, line in new_lines_list]
-
+        topology = self.get_topology()
+        return sorted(self.lines, key=topology.get_mean_rib_pos)
 
+    def get_stretch_factors(self, pre_load=50):
+        """
+        Stretch-correction factors of all lines (see Line.get_stretched_length)
+        evaluated with one batched line-type lookup
+        """
+        types = [line.type for line in self.lines]
+        forces = [line.force for line in self.lines]
+        return (LineType.get_stretch_factors(types, pre_load) /
+                LineType.get_stretch_factors(types, forces))
 
     @property
     def total_length(self):
-        length = 0
-        for line in self.lines:
-            length += line.get_stretched_length()
-        return length
+        lengths = [line.length_with_sag for line in self.lines]
+        return float(np.dot(lengths, self.get_stretch_factors()))
 
-    def create_tree(self, start_node=None):
+    @staticmethod
+    def _is_attachment_point(node):
+        return node.type == 2
+
+    def get_topology(self):
+        """
+        Connectivity index of the current lines,
+        rebuilt when lines, nodes or attachment points change
+        """
+        signature = LineTopology.get_signature(self.lines, self._is_attachment_point)
+        if self._topology is None or self._topology.signature != signature:
+            self._topology = LineTopology(self.lines, self._is_attachment_point, signature)
+        return self._topology
+
+    def create_tree(self, start_node=None, topology=None):
         """
         Create a tree of lines
         :return: [(line, [(upper_line1, []),...]),(...)]
         """
+        topology = topology or self.get_topology()
         if start_node is None:
             start_node = self.lower_attachment_points
             lines = []
             for node in start_node:
-                lines += self.get_upper_connected_lines(node)
+                lines += topology.get_upper_connected_lines(node)
         else:
-            lines = self.get_upper_connected_lines(start_node)
+            lines = topology.get_upper_connected_lines(start_node)
 
         def sort_key(line):
-            nodes = self.get_upper_influence_nodes(line)
+            nodes = topology.get_influence_nodes(line)
             val_x = 0
             val_rib_pos = 0
             for node in nodes:
@@ -356,20 +383,17 @@ class LineSet():
 
             return (10*val_rib_pos + val_x) / len(nodes)
 
-        lines.sort(key=sort_key)
-
-        return [(line, self.create_tree(line.upper_node)) for line in lines]
+        return topology.create_tree(lines, sort_key)
 
     def get_table(self, start_node=None):
         line_tree = self.create_tree(start_node=start_node)
-        table = Table()
-
         floors = max(self.floors)
+        rows = []
 
         def insert_block(line, upper, row, column):
             length = round(line.get_stretched_length()*1000)
-            table.set(column, row, length)
-            table.set(column + floors + 3, row, line.type.name)
+            row[column] = length
+            row[column + floors + 3] = line.type.name
             if upper:
                 for line, line_upper in upper:
                     row = insert_block(line, line_upper, row, column-1)
@@ -377,37 +401,39 @@ class LineSet():
                 name = line.upper_node.name
                 if not name:
                     name = "XXX"
-                table.set(column-1, row, name)
-                table.set(column+2+floors, row, name)
-                row += 1
+                row[column-1] = name
+                row[column+2+floors] = name
+                rows.append(row)
+                row = {}
             return row
 
-        row = 1
+        row = {}
         for line, upper in line_tree:
             row = insert_block(line, upper, row, floors)
 
-        return table
+        return Table.from_rows(rows, start_row=1)
 
     def get_table_2(self):
         line_tree = self.create_tree()
-        table = Table()
+        rows = []
 
         def insert_block(line, upper, row, column):
             length = round(line.get_stretched_length()*1000)
-            table[row, column] = line.name
-            table[row, column + 1] = line.type.name
-            table[row, column + 2] = length
+            row[column] = line.name
+            row[column + 1] = line.type.name
+            row[column + 2] = length
             if upper:
                 for line, line_upper in upper:
                     row = insert_block(line, line_upper, row, column + 4)
             else:  # Insert a top node
-                row += 1
+                rows.append(row)
+                row = {}
             return row
 
-        row = 1
+        row = {}
         for line, upper in sorted(line_tree, key=(lambda x: x[0].name)):
             row = insert_block(line, upper, row, 0)
-        return table
+        return Table.from_rows(rows, start_row=1)
 
     def get_upper_connected_force(self, node):
         '''
@@ -418,13 +444,14 @@ class LineSet():
             force += line.force * line.diff_vector
         return force
 
-    def get_residual_force(self, node):
+    def get_residual_force(self, node, topology=None):
         '''
         compute the residual force in a node to due simplified computation of lines
         '''
+        topology = topology or self.get_topology()
         residual_force = np.zeros(3)
-        upper_lines = self.get_upper_connected_lines(node)
-        lower_lines = self.get_lower_connected_lines(node)
+        upper_lines = topology.get_upper_connected_lines(node)
+        lower_lines = topology.get_lower_connected_lines(node)
         for line in upper_lines:
             residual_force += line.force * line.diff_vector
         for line in lower_lines:
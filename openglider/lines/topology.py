@@ -0,0 +1,151 @@
+import numpy as np
+
+
+class LineTopology(object):
+    """
+    Connectivity index for a list of lines (3d LineSet or parametric LineSet2D).
+
+    One bottom-up pass computes for every line:
+        - the influence nodes (connected attachment points above the line)
+        - the aggregate force of these attachment points
+        - the mean rib_pos of these attachment points
+        - the floor (number of line-levels up to the attachment points)
+
+    Build it once and use it for all tree walks instead of scanning the
+    whole line list for every node. The signature is used by the linesets
+    to detect changes (topology, attachment point position/force).
+    """
+    def __init__(self, lines, is_attachment_point, signature=None):
+        """
+        :param lines: list of lines with lower_node/upper_node attributes
+        :param is_attachment_point: function(node) -> True for upper attachment points
+        """
+        self.lines = list(lines)
+        self.is_attachment_point = is_attachment_point
+        self.signature = signature
+        self._upper_lines = {}
+        self._lower_lines = {}
+        self._data = {}
+
+        for line in self.lines:
+            self._upper_lines.setdefault(id(line.lower_node), []).append(line)
+            self._lower_lines.setdefault(id(line.upper_node), []).append(line)
+
+        for line in self.lines:
+            self._get_data(line)
+
+    @staticmethod
+    def get_signature(lines, is_attachment_point):
+        signature = []
+        for line in lines:
+            upper = line.upper_node
+            signature.append((id(line), id(line.lower_node), id(upper)))
+            if is_attachment_point(upper):
+                force = upper.force
+                if isinstance(force, (list, tuple, np.ndarray)):
+                    force = tuple(force)
+                signature.append((getattr(upper, "rib_pos", None), force))
+
+        return signature
+
+    @staticmethod
+    def _get_node_force(node):
+        try:
+            return np.array(node.force, dtype=float)
+        except (TypeError, ValueError):
+            return None
+
+    def _get_data(self, line):
+        key = id(line)
+        if key not in self._data:
+            upper = line.upper_node
+            if self.is_attachment_point(upper):
+                rib_pos = getattr(upper, "rib_pos", None)
+                data = {
+                    "nodes": [upper],
+                    "force": self._get_node_force(upper),
+                    "rib_pos_sum": rib_pos,
+                    "floor": 1
+                }
+            else:
+                upper_data = [self._get_data(upper_line) for upper_line in self._upper_lines.get(id(upper), [])]
+                nodes = []
+                force = 0
+                rib_pos_sum = 0
+                for d in upper_data:
+                    nodes += d["nodes"]
+                    if force is not None:
+                        force = None if d["force"] is None else force + d["force"]
+                    if rib_pos_sum is not None:
+                        rib_pos_sum = None if d["rib_pos_sum"] is None else rib_pos_sum + d["rib_pos_sum"]
+
+                data = {
+                    "nodes": nodes,
+                    "force": force if upper_data else None,
+                    "rib_pos_sum": rib_pos_sum if upper_data else None,
+                    "floor": max([d["floor"] for d in upper_data] + [0]) + 1
+                }
+            self._data[key] = data
+
+        return self._data[key]
+
+    def get_upper_connected_lines(self, node):
+        return list(self._upper_lines.get(id(node), []))
+
+    def get_lower_connected_lines(self, node):
+        return list(self._lower_lines.get(id(node), []))
+
+    def get_influence_nodes(self, line):
+        """
+        get the attachment points that are connected (above) to a line
+        """
+        return self._get_data(line)["nodes"]
+
+    def get_node_influence_nodes(self, node):
+        """
+        get the attachment points that are connected (above) to a node
+        """
+        if self.is_attachment_point(node):
+            return [node]
+        nodes = []
+        for line in self._upper_lines.get(id(node), []):
+            nodes += self.get_influence_nodes(line)
+        return nodes
+
+    def get_force(self, line):
+        """
+        sum of the forces of the influence nodes (None if not all forces are set)
+        """
+        return self._get_data(line)["force"]
+
+    def get_mean_rib_pos(self, line):
+        """
+        mean rib_pos of the influence nodes (None if not available)
+        """
+        data = self._get_data(line)
+        if data["rib_pos_sum"] is None or not data["nodes"]:
+            return None
+        return data["rib_pos_sum"] / len(data["nodes"])
+
+    def get_floor(self, line):
+        """
+        number of line-floors from this line up to the attachment points (gallery lines: 1)
+        """
+        return self._get_data(line)["floor"]
+
+    def get_node_floor(self, node):
+        if self.is_attachment_point(node):
+            return 1
+        return max([self.get_floor(line) for line in self._upper_lines.get(id(node), [])] + [0]) + 1
+
+    def create_tree(self, lines, sort_key=None):
+        """
+        Create a tree of lines
+        :return: [(line, [(upper_line1, []),...]),(...)]
+        """
+        lines = list(lines)
+        if sort_key is not None:
+            lines.sort(key=sort_key)
+
+        return [(line, self.create_tree(self._upper_lines.get(id(line.upper_node), []), sort_key))
+                for line in lines]
@@ -6,6 +6,7 @@ from openglider import jsonify
 import openglider.plots.spreadsheets
 import openglider.plots.cuts
 from openglider.plots.drawing import PlotPart, Layout
+from openglider.plots.drawing.nesting import Nesting
 from openglider.plots.glider import PlotMaker
 import openglider.plots.marks
 #import openglider.plots.sketches
@@ -76,6 +77,20 @@ class Patterns(object):
             glider.lineset.iterate_target_length()
             
         plots.unwrap()
+
+        if self.config.nesting_roll_width:
+            print("nest patterns")
+            nesting = Nesting(self.config.nesting_roll_width, resolution=self.config.nesting_resolution,
+                              distance=self.config.nesting_distance, rotations=self.config.nesting_rotations)
+            rolls = nesting.pack_layout(plots.get_all_parts(), workers=self.config.unwrap_workers)
+
+            for roll_no, (material_code, roll) in enumerate(rolls.items()):
+                print(roll.get_report(material_code))
+                if not roll.parts:
+                    continue
+                roll.scale(1000)
+                roll.export_dxf(fn("nesting_{}.dxf".format(roll_no)), blocks=self.config.dxf_blocks)
+
         all_patterns = plots.get_all_grouped()
 
         # with open(fn("patterns.json"), "w") as outfile:
@@ -87,20 +102,19 @@ class Patterns(object):
         print("export patterns")
 
         all_patterns.scale(1000)
-        all_patterns.export_svg(fn("plots_all.svg"))
-        all_patterns.export_dxf(fn("plots_all_dxf2000.dxf"))
-        all_patterns.export_dxf(fn("plots_all_dxf2007.dxf"), "AC1021")
-        all_patterns.export_ntv(fn("plots_all.ntv"))
-
+        report = all_patterns.export([
+            (fn("plots_all.svg"), "svg", {"compact": self.config.svg_compact,
+                                          "precision": self.config.svg_precision,
+                                          "tolerance": self.config.svg_tolerance}),
+            (fn("plots_all_dxf2000.dxf"), "dxf", {"dxfversion": "AC1015", "blocks": self.config.dxf_blocks}),
+            (fn("plots_all_dxf2007.dxf"), "dxf", {"dxfversion": "AC1021", "blocks": self.config.dxf_blocks}),
+            (fn("plots_all.ntv"), "ntv", None)
+        ], workers=self.config.unwrap_workers)
 
+        for path, seconds, size in report:
+            print("{}: {:.2f}s, {} bytes".format(os.path.split(path)[-1], seconds, size))
 
-        # ribs = packer.pack_parts(parts["ribs"].parts, sheet_size=sheet_size)
-        # panels = packer.pack_parts(parts["panels"].parts, sheet_size=sheet_size)
 
-        # for sheet_no, sheet in enumerate(ribs):
-        #     openglider.plots.create_svg(sheet, fn("ribs_{}".format(sheet_no)))
-        # for sheet_no, sheet in enumerate(panels):
-        #     openglider.plots.create_svg(sheet, fn("panels_{}".format(sheet_no)))
 
         # sketches = openglider.plots.sketches.get_all_plots(self.glider_2d, glider)
         #
@@ -0,0 +1,488 @@
+"""
+Export of layouts.
+
+The layout is walked once into LayoutData (flat coordinate buffer + part/layer metadata),
+the writers (svg, dxf, ntv, json, npz) only read this data and can run in parallel.
+"""
+import collections
+import concurrent.futures
+import json
+import os
+import re
+import time
+from xml.sax.saxutils import escape
+
+import numpy as np
+
+from openglider.plots import config
+from openglider.plots.drawing.part import Layer
+from openglider.utils.css import get_material_color, normalize_class_names
+from openglider.vector.functions import douglas_peucker
+
+
+class LayoutData(object):
+    """
+    Normalized layout:
+        points: all points (n, 2)
+        line_offsets: start of every line in points (+ end)
+        groups: (part_no, layer_name, first_line, last_line + 1) for every layer of every part
+        parts: (name, material_code)
+        layers: {layer_name: Layer (without polylines)}
+    """
+    def __init__(self, points, line_offsets, groups, parts, layers, extent=None):
+        self.points = points
+        self.line_offsets = line_offsets
+        self.groups = groups
+        self.parts = parts
+        self.layers = layers
+        self.extent = extent
+
+    @classmethod
+    def from_layout(cls, layout):
+        points = []
+        line_lengths = []
+        groups = []
+        parts = []
+        layers = {}
+
+        for part_no, part in enumerate(layout.parts):
+            parts.append((part.name, part.material_code))
+
+            for layer_name, layer in part.layers.items():
+                if layer_name not in layers:
+                    layers[layer_name] = Layer(None, layer.stroke, layer.stroke_width, layer.visible)
+
+                _, layer_points, offsets, _ = layer._get_buffer()
+                groups.append((part_no, layer_name, len(line_lengths), len(line_lengths) + len(offsets) - 1))
+                points.append(layer_points)
+                line_lengths += np.diff(offsets).tolist()
+
+        points = np.concatenate([np.zeros((0, 2))] + points)
+        line_offsets = np.cumsum([0] + line_lengths)
+        extent = layout.get_extent() if layout.parts else None
+
+        return cls(points, line_offsets, groups, parts, layers, extent)
+
+    def get_lines(self, first_line, last_line):
+        """
+        Yield the point arrays of lines [first_line, last_line)
+        """
+        offsets = self.line_offsets[first_line:last_line+1]
+        for start, end in zip(offsets[:-1], offsets[1:]):
+            yield self.points[start:end]
+
+    def get_part_groups(self):
+        """
+        Yield (part_no, [(layer_name, first_line, last_line), ...])
+        """
+        part_groups = [[] for _ in self.parts]
+        for part_no, layer_name, first_line, last_line in self.groups:
+            part_groups[part_no].append((layer_name, first_line, last_line))
+
+        return enumerate(part_groups)
+
+    def __json__(self):
+        return {
+            "points": self.points.tolist(),
+            "line_offsets": self.line_offsets.tolist(),
+            "groups": self.groups,
+            "parts": self.parts,
+            "layers": {name: {"stroke": layer.stroke, "stroke_width": layer.stroke_width, "visible": layer.visible}
+                       for name, layer in self.layers.items()},
+            "extent": None if self.extent is None else np.asarray(self.extent).tolist()
+        }
+
+    @classmethod
+    def read_npz(cls, path):
+        with np.load(path) as npz:
+            meta = json.loads(str(npz["meta"]))
+            layers = {name: Layer(None, **attributes) for name, attributes in meta["layers"].items()}
+            groups = [tuple(group) for group in meta["groups"]]
+            parts = [tuple(part) for part in meta["parts"]]
+            extent = meta.get("extent")
+            if extent is not None:
+                extent = np.array(extent)
+            return cls(npz["points"], npz["line_offsets"], groups, parts, layers, extent)
+
+
+def _format_points(points, point_format, separator=" "):
+    """
+    Format all points with one format-call
+    """
+    return separator.join([point_format] * len(points)).format(*points.ravel().tolist())
+
+
+_trailing_zeros = re.compile(r"\.?0+(?= |$)")
+_leading_zeros = re.compile(r"(?<![\d.])0(?=\.)")
+
+
+def _format_numbers(values, precision):
+    """
+    Short svg-number format of integers (in units of 10**-precision): "0.500 -1.000" -> ".5-1"
+    """
+    if precision > 0:
+        text = " ".join(["{{:.{}f}}".format(precision)] * len(values)).format(*(values / 10**precision).tolist())
+        text = _leading_zeros.sub("", _trailing_zeros.sub("", text))
+    else:
+        text = " ".join(str(value) for value in values.tolist())
+
+    return text.replace(" -", "-")
+
+
+def _get_path_data(points, precision, tolerance=0):
+    """
+    Relative svg-path data: ("Mx y", "ldx dy dx dy...z")
+    """
+    if tolerance and len(points) > 2:
+        points = points[douglas_peucker(points, tolerance)]
+
+    points = np.round(points * 10**precision).astype(np.int64)
+    closed = len(points) > 2 and (points[0] == points[-1]).all()
+    if closed:
+        points = points[:-1]
+
+    diffs = np.diff(points, axis=0)
+    diffs = diffs[diffs.any(axis=1)]
+
+    relative = ""
+    if len(diffs):
+        relative = "l" + _format_numbers(diffs.ravel(), precision)
+    if closed:
+        relative += "z"
+
+    return _format_numbers(points[0], precision), relative
+
+
+def _get_attributes(attributes, exclude=()):
+    return ['{}="{}"'.format(key, escape(str(value), {'"': "&quot;"}))
+            for key, value in sorted(attributes.items()) if key not in exclude]
+
+
+def _get_svg_polylines(data, parts):
+    body = []
+    for layer_groups in parts:
+        if not layer_groups:
+            body.append("<g />")
+            continue
+
+        body.append("<g>")
+        for attributes, first_line, last_line in layer_groups:
+            if last_line == first_line:
+                body.append("<g />")
+                continue
+
+            # attributes are sorted by name, points in between
+            position = sum(key < "points" for key in attributes)
+            attributes = _get_attributes(attributes)
+            element_start = " ".join(["<polyline"] + attributes[:position] + ['points="'])
+            element_end = " ".join(['"'] + attributes[position:] + ["/>"])
+
+            body.append("<g>")
+            for line in data.get_lines(first_line, last_line):
+                body += [element_start, _format_points(line, "{},{}"), element_end]
+            body.append("</g>")
+        body.append("</g>")
+
+    return [], body
+
+
+def _get_svg_compact(data, parts, precision, tolerance, symbols):
+    """
+    Layer groups with the stroke attributes, one path for every line (relative coordinates).
+    Lines repeated at different positions (marks, text) are defined once as symbol.
+    """
+    paths = [[[_get_path_data(line, precision, tolerance)
+               for line in data.get_lines(first_line, last_line) if len(line)]
+              for _, first_line, last_line in layer_groups]
+             for layer_groups in parts]
+
+    shapes = {}
+    if symbols:
+        count = collections.Counter(relative for part_paths in paths for layer_paths in part_paths
+                                    for _, relative in layer_paths)
+        for relative, number in count.items():
+            # a <use> costs ~35 characters
+            if number > 1 and len(relative) > 35:
+                shapes[relative] = "s{}".format(len(shapes))
+
+    defs = ['<symbol id="{}" overflow="visible"><path d="M0 0{}"/></symbol>'.format(shape_id, relative)
+            for relative, shape_id in shapes.items()]
+
+    body = []
+    for layer_groups, part_paths in zip(parts, paths):
+        body.append("<g>")
+        for (attributes, _, _), layer_paths in zip(layer_groups, part_paths):
+            if not layer_paths:
+                continue
+
+            body.append("<g {}>".format(" ".join(_get_attributes(attributes, exclude=("id",)))))
+            for start, relative in layer_paths:
+                if relative in shapes:
+                    x, y = start.replace("-", " -").split()
+                    body.append('<use x="{}" y="{}" xlink:href="#{}"/>'.format(x, y, shapes[relative]))
+                else:
+                    body.append('<path d="M{}{}"/>'.format(start, relative))
+            body.append("</g>")
+        body.append("</g>")
+
+    return defs, body
+
+
+def write_svg(data, outfile, add_styles=False, layer_config=None, unit="mm", border=0.02,
+              compact=False, precision=3, tolerance=0, symbols=True):
+    """
+    Same output as Layout.get_svg_drawing (+ Layout.add_svg_styles) without building the element tree
+
+    :param compact: write path elements with relative coordinates and the attributes on the layer groups
+    :param precision: decimals (compact)
+    :param tolerance: simplify lines (douglas-peucker), 0 -> no simplification (compact)
+    :param symbols: use symbols for repeated lines (compact)
+    """
+    layer_config = layer_config or config.sewing_config["layers"]
+    default_config = {"stroke": "black", "fill": "none", "stroke-width": "1"}
+
+    lower, upper = data.extent
+    width, height = upper - lower
+    border_w, border_h = [2*border*x for x in (width, height)]
+    width, height = width+border_w, height+border_h
+    viewbox = ",".join(str(x) for x in (lower[0]-border_w/2, -upper[1]-border_h/2, width, height))
+
+    styles = {}
+    parts = []
+
+    for part_no, layer_groups in data.get_part_groups():
+        name, material_code = data.parts[part_no]
+        part_layers = []
+
+        for layer_name, first_line, last_line in layer_groups:
+            classes = [layer_name]
+            if material_code:
+                classes.append(normalize_class_names(material_code))
+                classes.append(material_code)
+            class_name = " ".join(classes)
+
+            if add_styles:
+                for _class in classes:
+                    colour = get_material_color(_class)
+                    if colour:
+                        styles[normalize_class_names(_class)] = colour
+                class_name = normalize_class_names(class_name) or class_name
+
+            attributes = dict(layer_config.get(layer_name, default_config))
+            attributes["class"] = class_name
+            part_layers.append((attributes, first_line, last_line))
+
+        parts.append(part_layers)
+
+    if compact:
+        defs, body = _get_svg_compact(data, parts, precision, tolerance, symbols)
+    else:
+        defs, body = _get_svg_polylines(data, parts)
+
+    if add_styles:
+        style = "".join(".{} {{\n\tfill: {};\n}}\n".format(css_class, colour) for css_class, colour in styles.items())
+        style += "\nline { vector-effect: non-scaling-stroke; stroke-width: 1; }"
+        style += "\npolyline { vector-effect: non-scaling-stroke; stroke-width: 1; }"
+        defs.insert(0, '<style type="text/css"><![CDATA[{}]]></style>'.format(style))
+
+    head = ('<?xml version="1.0" encoding="utf-8" ?>\n'
+            '<svg baseProfile="full" height="{height}{unit}" version="1.1" viewBox="{viewbox}" width="{width}{unit}" '
+            'xmlns="http://www.w3.org/2000/svg" xmlns:ev="http://www.w3.org/2001/xml-events" '
+            'xmlns:xlink="http://www.w3.org/1999/xlink">').format(height=height, width=width, unit=unit, viewbox=viewbox)
+
+    outfile.write(head)
+    outfile.write("<defs>{}</defs>".format("".join(defs)) if defs else "<defs />")
+    outfile.write('<g transform="scale(1,-1)">')
+    outfile.write("".join(body))
+    outfile.write("</g></svg>")
+
+
+def _get_shape(line, quantum=1e-6):
+    """
+    Normalize a line to its first segment (first point -> origin, first segment -> unit x-vector).
+    Lines with the same key are equal up to translation, rotation and uniform scale.
+
+    :param quantum: key precision, relative to the length of the first segment
+    :return: (key, normalized points, rotation [rad], scale) or None for lines without length
+    """
+    diff = line - line[0]
+    lengths = np.hypot(diff[:, 0], diff[:, 1])
+    first = np.argmax(lengths > 0)
+    if not lengths[first]:
+        return None
+
+    scale = lengths[first]
+    angle = np.arctan2(diff[first, 1], diff[first, 0])
+    cos, sin = np.cos(angle) / scale, np.sin(angle) / scale
+    normalized = np.array([cos * diff[:, 0] + sin * diff[:, 1], cos * diff[:, 1] - sin * diff[:, 0]]).T
+    closed = len(line) > 2 and all(line[-1] == line[0])
+    key = closed, np.round(normalized / quantum).astype(np.int64).tobytes()
+
+    return key, normalized, angle, scale
+
+
+def _get_dxf_blocks(data, layers=("marks", "text"), min_points=3):
+    """
+    Find lines of the given layers drawn more than once (marks, text glyphs) up to position, rotation and scale.
+    Other layers (cuts) are never replaced by blocks.
+
+    :return: {line_no: (block_no, rotation, scale)}, [normalized lines (one per block)]
+    """
+    lines = collections.defaultdict(list)
+    for _, layer_name, first_line, last_line in data.groups:
+        if layer_name not in layers:
+            continue
+        for line_no in range(first_line, last_line):
+            start, end = data.line_offsets[line_no], data.line_offsets[line_no + 1]
+            if end - start >= min_points:
+                shape = _get_shape(data.points[start:end])
+                if shape is not None:
+                    lines[shape[0]].append((line_no,) + shape[1:])
+
+    inserts = {}
+    blocks = []
+    for instances in lines.values():
+        if len(instances) > 1:
+            for line_no, _, angle, scale in instances:
+                inserts[line_no] = len(blocks), angle, scale
+            blocks.append(instances[0][1])
+
+    return inserts, blocks
+
+
+def write_dxf(data, path, dxfversion="AC1015", blocks=False):
+    """
+    :param blocks: define repeated shapes of the marks and text layers once as blocks
+        and place them with INSERT entities
+    """
+    import ezdxf
+    drawing = ezdxf.new(dxfversion=dxfversion)
+
+    if data.extent is not None:
+        lower, upper = data.extent
+        drawing.header["$EXTMAX"] = (upper[0], upper[1], 0)
+        drawing.header["$EXTMIN"] = (lower[0], lower[1], 0)
+    ms = drawing.modelspace()
+
+    inserts = {}
+    if blocks:
+        inserts, shapes = _get_dxf_blocks(data)
+        for block_no, shape in enumerate(shapes):
+            # entities on layer 0 -> drawn on the layer of the insert
+            block = drawing.blocks.new(name="shape_{}".format(block_no))
+            dxf_obj = block.add_lwpolyline(shape, format="xy")
+            if len(shape) > 2 and all(shape[-1] == shape[0]):
+                dxf_obj.closed = True
+
+    for part_no, layer_groups in data.get_part_groups():
+        entities = []
+        for layer_name, first_line, last_line in layer_groups:
+            if layer_name not in drawing.layers:
+                layer = data.layers[layer_name]
+                dwg_layer = drawing.layers.new(name=layer_name, dxfattribs=layer._get_dxf_attributes())
+                if not layer.visible:
+                    dwg_layer.off()
+
+            dxfattribs = {"layer": layer_name}
+            for line_no, line in enumerate(data.get_lines(first_line, last_line), first_line):
+                if line_no in inserts:
+                    block_no, angle, scale = inserts[line_no]
+                    entities.append(ms.add_blockref("shape_{}".format(block_no), line[0], dxfattribs={
+                        "layer": layer_name,
+                        "rotation": np.degrees(angle),
+                        "xscale": scale,
+                        "yscale": scale
+                    }))
+                elif len(line) == 1:
+                    entities.append(ms.add_point(line[0], dxfattribs=dxfattribs))
+                else:
+                    dxf_obj = ms.add_lwpolyline(line, format="xy", dxfattribs=dxfattribs)
+                    if len(line) > 2 and all(line[-1] == line[0]):
+                        dxf_obj.closed = True
+                    entities.append(dxf_obj)
+
+        drawing.groups.new().set_data(entities)
+
+    drawing.saveas(path)
+    return drawing
+
+
+ntv_layer_config = {
+    "C": ["cuts"],
+    "P": ["marks", "text"],
+    "R": ["stitches"]
+}
+
+
+def write_ntv(data, outfile, filename=""):
+    outfile.write("A {} {} 1 1 0 0 0 0\n".format(len(filename), filename))
+
+    for part_no, layer_groups in data.get_part_groups():
+        name = data.parts[part_no][0] or "unnamed"
+        # part-header: 1A {name}, {position_x} {pos_y} {rot_degrees} {!derivePerimeter} {useAngle} {flipped}
+        content = ["\n1A {} {} (0, 0) 0 0 0 0 0 0".format(len(name), name)]
+        layer_lines = {layer_name: (first_line, last_line) for layer_name, first_line, last_line in layer_groups}
+
+        for plottype, layer_names in ntv_layer_config.items():
+            for layer_name in layer_names:
+                if layer_name not in layer_lines:
+                    continue
+                # line-header type: (R->ignore, P->plot, C->cut
+                line_header = "\n1A P 0 {} 0 0 0".format(plottype)
+                for line in data.get_lines(*layer_lines[layer_name]):
+                    content.append(line_header)
+                    content.append("\nA {} ".format(len(line)))
+                    content.append(_format_points(line, "({:.5f},{:.5f})"))
+
+        # part-end
+        content.append("\n0\n")
+        outfile.write("".join(content))
+
+    outfile.write("\n0")
+
+
+def write_json(data, outfile):
+    json.dump(data.__json__(), outfile, separators=(",", ":"))
+
+
+def write_npz(data, path):
+    meta = data.__json__()
+    meta.pop("points")
+    meta.pop("line_offsets")
+    np.savez_compressed(path, points=data.points, line_offsets=data.line_offsets, meta=json.dumps(meta))
+
+
+def _write(data, path, file_format, options):
+    start = time.time()
+
+    if file_format == "dxf":
+        write_dxf(data, path, **options)
+    elif file_format == "npz":
+        write_npz(data, path)
+    else:
+        writer = {"svg": write_svg, "ntv": write_ntv, "json": write_json}[file_format]
+        if file_format == "ntv":
+            options = dict(options, filename=os.path.split(path)[-1])
+        with open(path, "w") as outfile:
+            writer(data, outfile, **options)
+
+    return path, time.time() - start, os.path.getsize(path)
+
+
+def export_layout(layout, outputs, workers=1):
+    """
+    Export a layout to several files, walking the layout only once
+
+    :param outputs: [(path, format, {options})]; format: svg, dxf, ntv, json or npz
+    :param workers: number of processes
+    :return: [(path, seconds, bytes)]
+    """
+    data = LayoutData.from_layout(layout)
+    outputs = [(path, file_format, options or {}) for path, file_format, options in outputs]
+
+    if workers > 1 and len(outputs) > 1:
+        with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+            futures = [executor.submit(_write, data, *output) for output in outputs]
+            return [future.result() for future in futures]
+
+    return [_write(data, *output) for output in outputs]
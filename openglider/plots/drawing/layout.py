@@ -7,6 +7,7 @@ import svgwrite.container
 import svgwrite.shapes
 
 from openglider.plots import config
+from openglider.plots.drawing.export import LayoutData, export_layout, ntv_layer_config, write_dxf, write_ntv, write_svg
 from openglider.plots.drawing.part import PlotPart
 from openglider.utils.css import get_material_color, normalize_class_names
 from openglider.vector import PolyLine2D
@@ -264,38 +265,50 @@ class Layout(object):
             last_y = 0.
 
 
+    def get_extent(self):
+        """
+        Bounding box of all parts: (lower_left, upper_right)
+        """
+        if not self.parts:
+            raise ValueError("empty layout")
+        extents = np.array([part.get_extent() for part in self.parts])
+        return extents[:, 0].min(axis=0), extents[:, 1].max(axis=0)
+
     @property
     def min_x(self):
-        return min([part.min_x for part in self.parts])
+        return self.get_extent()[0][0]
 
     @property
     def max_x(self):
-        return max([part.max_x for part in self.parts])
+        return self.get_extent()[1][0]
 
     @property
     def min_y(self):
-        return min([part.min_y for part in self.parts])
+        return self.get_extent()[0][1]
 
     @property
     def max_y(self):
-        return max([part.max_y for part in self.parts])
+        return self.get_extent()[1][1]
 
     @property
     def bbox(self):
-        return [[self.min_x, self.min_y], [self.max_x, self.min_y],
-                [self.max_x, self.max_y], [self.min_x, self.max_y]]
+        (min_x, min_y), (max_x, max_y) = self.get_extent()
+        return [[min_x, min_y], [max_x, min_y],
+                [max_x, max_y], [min_x, max_y]]
 
     @property
     def width(self):
         try:
-            return abs(self.max_x - self.min_x)
+            lower, upper = self.get_extent()
+            return abs(upper[0] - lower[0])
         except ValueError:
             return 0
 
     @property
     def height(self):
         try:
-            return abs(self.max_y - self.min_y)
+            lower, upper = self.get_extent()
+            return abs(upper[1] - lower[1])
         except ValueError:
             return 0
 
@@ -354,12 +367,20 @@ class Layout(object):
 
             for entity in panel:
                 layer = entity.dxf.layer
-                new_panel.layers[layer].append(PolyLine2D([p[:2] for p in entity]))
+                # repeated shapes (export_dxf(blocks=True)) are inserted into the part
+                if entity.dxftype() == "INSERT":
+                    for line in entity.virtual_entities():
+                        new_panel.layers[layer].append(PolyLine2D([p[:2] for p in line]))
+                else:
+                    new_panel.layers[layer].append(PolyLine2D([p[:2] for p in entity]))
 
+        grouped = {entity.dxf.handle for _, panel in groups for entity in panel}
         #blocks = list(dxf.blocks)
         blockrefs = dxf.modelspace().query("INSERT")
 
         for blockref in blockrefs:
+            if blockref.dxf.handle in grouped:
+                continue
             name = blockref.dxf.name
             block = dxf.blocks.get(name)
 
@@ -424,11 +445,13 @@ class Layout(object):
         return group
 
     def get_svg_drawing(self, unit="mm", border=0.02):
-        border_w, border_h = [2*border*x for x in (self.width, self.height)]
-        width, height = self.width+border_w, self.height+border_h
+        lower, upper = self.get_extent()
+        width, height = upper - lower
+        border_w, border_h = [2*border*x for x in (width, height)]
+        width, height = width+border_w, height+border_h
 
         drawing = svgwrite.Drawing(size=[("{}"+unit).format(n) for n in (width, height)])
-        drawing.viewbox(self.min_x-border_w/2, -self.max_y-border_h/2, width, height)
+        drawing.viewbox(lower[0]-border_w/2, -upper[1]-border_h/2, width, height)
         group = self.get_svg_group()
         drawing.add(group)
 
@@ -482,92 +505,35 @@ class Layout(object):
 
         return drawing.tostring()
 
-    def export_svg(self, path, add_styles=False):
-        drawing = self.get_svg_drawing()
-
-        if add_styles:
-            self.add_svg_styles(drawing)
-
+    def export_svg(self, path, add_styles=False, **svg_options):
+        """
+        :param svg_options: compact, precision, tolerance, symbols (see export.write_svg)
+        """
         with open(path, "w") as outfile:
-            drawing.write(outfile)
-
-    def export_dxf(self, path, dxfversion="AC1015"):
-        import ezdxf
-        drawing = ezdxf.new(dxfversion=dxfversion)
-
-        drawing.header["$EXTMAX"] = (self.max_x, self.max_y, 0)
-        drawing.header["$EXTMIN"] = (self.min_x, self.min_y, 0)
-        ms = drawing.modelspace()
+            write_svg(LayoutData.from_layout(self), outfile, add_styles=add_styles, **svg_options)
 
-        for part in self.parts:
-            group = drawing.groups.new()
-            with group.edit_data() as part_group:
-                for layer_name, layer in part.layers.items():
-                    if layer_name not in drawing.layers:
-                        attributes = layer._get_dxf_attributes()
-                        dwg_layer = drawing.layers.new(name=layer_name, dxfattribs=attributes)
-                        if not layer.visible:
-                            dwg_layer.off()
-
-                    for elem in layer:
-                        dxfattribs = {"layer": layer_name}
-                        if len(elem) == 1:
-                            dxf_obj = ms.add_point(elem[0], dxfattribs=dxfattribs)
-                        else:
-                            dxf_obj = ms.add_lwpolyline(elem, dxfattribs=dxfattribs)
-                            if len(elem) > 2 and all(elem[-1] == elem[0]):
-                                dxf_obj.closed = True
-                        part_group.append(dxf_obj)
-
-        drawing.saveas(path)
-        return drawing
+    def export_dxf(self, path, dxfversion="AC1015", blocks=False):
+        """
+        :param blocks: write repeated shapes (marks, text) as block references
+        """
+        return write_dxf(LayoutData.from_layout(self), path, dxfversion, blocks)
 
-    ntv_layer_config = {
-        "C": ["cuts"],
-        "P": ["marks", "text"],
-        "R": ["stitches"]
-    }
+    ntv_layer_config = ntv_layer_config
 
     def export_ntv(self, path):
         filename = os.path.split(path)[-1]
 
-        def format_line(line):
-            a = "\nA {} ".format(len(line))
-            b = " ".join(["({:.5f},{:.5f})".format(p[0], p[1]) for p in line])
-            return a+b
-
         with open(path, "w") as outfile:
-            # head
-            outfile.write("A {} {} 1 1 0 0 0 0\n".format(len(filename), filename))
-            for part in self.parts:
-                # part-header: 1A {name}, {position_x} {pos_y} {rot_degrees} {!derivePerimeter} {useAngle} {flipped}
-                part_header = "\n1A {len_name} {name} ({pos_x}, {pos_y}) {rotation_deg} 0 0 0 0 0"
-                name = part.name or "unnamed"
-                args = {"len_name": len(name),
-                        "name": name,
-                        "pos_x": 0,
-                        "pos_y": 0,
-                        "rotation_deg": 0}
-                outfile.write(part_header.format(**args))
-
-                # part-boundary
-                part_boundary = "\n{boundary_len} {line}"
-                #outfile.write()
-
-                for plottype in self.ntv_layer_config:
-                    for layer_origin in self.ntv_layer_config[plottype]:
-                        for line in part.layers[layer_origin]:
-                            # line-header type: (R->ignore, P->plot, C->cut
-                            outfile.write("\n1A P 0 {} 0 0 0".format(plottype))
-                            outfile.write(format_line(line))
-
-
-                # part-end
-                outfile.write("\n0\n")
-
-
-            # end
-            outfile.write("\n0")
+            write_ntv(LayoutData.from_layout(self), outfile, filename)
+
+    def export(self, outputs, workers=1):
+        """
+        Export to several files at once (see export_layout)
+
+        :param outputs: [(path, format, {options})]; format: svg, dxf, ntv, json or npz
+        :return: [(path, seconds, bytes)]
+        """
+        return export_layout(self, outputs, workers=workers)
 
     def scale_a4(self):
         width = max(self.width, self.height)
@@ -0,0 +1,327 @@
+"""
+Nesting of PlotParts onto cloth rolls.
+
+Every part is rasterized (outline filled, grown by half the distance between parts)
+and placed bottom-left onto a roll of fixed width and unlimited length.
+The roll is an occupancy raster. Free cells per column (prefix sums) serve as a spatial index
+to skip positions without enough space, the remaining candidates are checked for collisions in
+blocks using a fft-correlation of the part raster with the roll raster.
+"""
+import concurrent.futures
+import math
+
+import numpy as np
+
+from openglider.plots.drawing.layout import Layout
+
+
+def _fft_size(n):
+    """
+    Smallest 5-smooth number >= n (fast fft lengths)
+    """
+    best = 2 ** int(math.ceil(math.log(n, 2)))
+    power_5 = 1
+    while power_5 < best:
+        power_35 = power_5
+        while power_35 < best:
+            size = power_35 * 2 ** max(0, int(math.ceil(math.log(n / power_35, 2))))
+            best = min(best, size)
+            power_35 *= 3
+        power_5 *= 5
+
+    return best
+
+
+def _max_runs(mask):
+    """
+    Length of the longest run of True values in every column of a boolean array
+    """
+    index = np.arange(1, mask.shape[0] + 1)[:, np.newaxis]
+    last_false = np.maximum.accumulate(np.where(mask, 0, index), axis=0)
+    return (index - last_false).max(axis=0, initial=0)
+
+
+class RollLayout(Layout):
+    """
+    Layout of the parts nested onto one roll (x: along the roll, y: across the roll).
+    """
+    def __init__(self, parts=None, roll_width=0., roll_length=0., parts_area=0., unplaced=None):
+        super(RollLayout, self).__init__(parts)
+        self.roll_width = roll_width
+        self.roll_length = roll_length
+        self.parts_area = parts_area
+        self.unplaced = unplaced or []
+
+    def copy(self):
+        return self.__class__([p.copy() for p in self.parts], self.roll_width, self.roll_length,
+                              self.parts_area, [p.copy() for p in self.unplaced])
+
+    @property
+    def utilization(self):
+        """
+        (rasterized) area of the parts / used area of the roll
+        """
+        if not self.roll_length:
+            return 0.
+        return self.parts_area / (self.roll_width * self.roll_length)
+
+    def get_report(self, name=""):
+        report = "{}: {} parts, length: {:.3f}, utilization: {:.1%}".format(
+            name, len(self.parts), self.roll_length, self.utilization)
+        if self.unplaced:
+            report += ", not placed: {}".format(", ".join(str(p.name) for p in self.unplaced))
+        return report
+
+
+class Nesting(object):
+    """
+    Pack PlotParts onto a roll of cloth.
+
+    :param roll_width: usable width of the roll
+    :param resolution: raster size
+    :param distance: minimal distance between parts
+    :param rotations: allowed rotations (degrees). Woven cloth needs the grain direction kept -> (0, 180);
+        can also be a function part -> rotations (has to be picklable for multiprocessing)
+    :param search_block: number of positions (columns) checked for collisions at once
+    :param minimize_area: rotate the parts to their minimal bounding box first (rotations are added),
+        only for cloth without grain direction
+    """
+    def __init__(self, roll_width, resolution=0.005, distance=0.01, rotations=(0, 180), search_block=64,
+                 minimize_area=False):
+        self.roll_width = roll_width
+        self.resolution = resolution
+        self.distance = distance
+        self.rotations = rotations
+        self.search_block = search_block
+        self.minimize_area = minimize_area
+
+    @staticmethod
+    def get_outline(part):
+        """
+        Polylines describing the area of a part: envelope or cuts
+        """
+        if len(part.layers["envelope"]) > 0:
+            return list(part.layers["envelope"])
+        return list(part.layers["cuts"])
+
+    @property
+    def padding(self):
+        """
+        Cells added around a part: half the distance + one extra cell as cells are filled by their center
+        """
+        return int(math.ceil(self.distance / 2 / self.resolution)) + 1
+
+    def rasterize(self, part):
+        """
+        Rasterize a part (even-odd fill of the outline + all drawn points),
+        grown by half the distance between parts.
+
+        :return: (raster[y, x], origin, area)
+        """
+        res = self.resolution
+        pad = self.padding
+        lower, upper = part.get_extent()
+        origin = lower - pad * res
+        size_x = int(math.ceil((upper[0] - lower[0]) / res)) + 2 * pad + 1
+        size_y = int(math.ceil((upper[1] - lower[1]) / res)) + 2 * pad + 1
+
+        raster = np.zeros((size_y, size_x), dtype=bool)
+        centers_y = origin[1] + (np.arange(size_y) + 0.5) * res
+
+        for line in self.get_outline(part):
+            points = np.asarray(line)[:, :2]
+            if len(points) < 3:
+                continue
+            start = points
+            end = np.roll(points, -1, axis=0)
+
+            y_min = np.minimum(start[:, 1], end[:, 1])
+            y_max = np.maximum(start[:, 1], end[:, 1])
+            rows, edges = np.nonzero((centers_y[:, np.newaxis] >= y_min) & (centers_y[:, np.newaxis] < y_max))
+
+            p1 = start[edges]
+            p2 = end[edges]
+            x_cut = p1[:, 0] + (centers_y[rows] - p1[:, 1]) / (p2[:, 1] - p1[:, 1]) * (p2[:, 0] - p1[:, 0])
+            # first cell with the center right of the cut
+            columns = np.clip(np.ceil((x_cut - origin[0]) / res - 0.5), 0, size_x).astype(int)
+
+            crossings = np.zeros((size_y, size_x + 1), dtype=int)
+            np.add.at(crossings, (rows, columns), 1)
+            raster ^= (np.cumsum(crossings, axis=1)[:, :size_x] % 2).astype(bool)
+
+        area = raster.sum() * res**2
+
+        cells = np.floor((part.get_points() - origin) / res).astype(int)
+        raster[cells[:, 1], cells[:, 0]] = True
+
+        return self._grow(raster, pad), origin, area
+
+    @staticmethod
+    def _grow(raster, cells):
+        """
+        Dilate a raster by a square of (2*cells+1)**2
+        """
+        for axis in (0, 1):
+            grown = raster.copy()
+            for shift in range(1, cells + 1):
+                if shift >= raster.shape[axis]:
+                    break
+                index_a = [slice(None), slice(None)]
+                index_b = [slice(None), slice(None)]
+                index_a[axis] = slice(shift, None)
+                index_b[axis] = slice(None, -shift)
+                grown[tuple(index_a)] |= raster[tuple(index_b)]
+                grown[tuple(index_b)] |= raster[tuple(index_a)]
+            raster = grown
+
+        return raster
+
+    def get_rotations(self, part):
+        if callable(self.rotations):
+            return self.rotations(part)
+        return self.rotations
+
+    def _find_position(self, roll, column_free, column_runs, raster, first_column=0):
+        """
+        Find the bottom-left position (x, y) [cells] of a raster on the roll, starting at first_column.
+        The roll has to be free beyond the last checked column.
+
+        :param column_free: number of free cells of every column of the roll
+        :param column_runs: longest run of free cells of every column of the roll
+        """
+        height, width = raster.shape
+        roll_height = roll.shape[0]
+        if height > roll_height:
+            return None
+
+        free = column_free[first_column:]
+        runs = column_runs[first_column:]
+        positions = len(free) - width + 1
+        if positions < 1:
+            return None
+
+        # every window needs as many free cells as the part has,
+        # every column a free run as long as the longest run of the part's column
+        free_sum = np.concatenate([[0], np.cumsum(free)])
+        possible = free_sum[width:] - free_sum[:-width] >= raster.sum()
+        for column, run in enumerate(_max_runs(raster)):
+            possible &= runs[column:column+positions] >= run
+        candidates = np.nonzero(possible)[0]
+
+        shape = (_fft_size(roll_height + height), _fft_size(self.search_block + 2 * width))
+        raster_fft = np.conj(np.fft.rfft2(raster, shape))
+
+        while len(candidates):
+            start = candidates[0]
+            block = min(self.search_block, positions - start)
+
+            section = roll[:, first_column+start:first_column+start+block+width-1]
+            overlap = np.fft.irfft2(np.fft.rfft2(section, shape) * raster_fft, shape)
+            fits = overlap[:roll_height - height + 1, :block] < 0.5
+            fits &= possible[start:start+block]
+
+            columns = np.nonzero(fits.any(axis=0))[0]
+            if len(columns):
+                x = columns[0]
+                y = np.nonzero(fits[:, x])[0][0]
+                return first_column + start + x, y
+
+            candidates = candidates[candidates >= start + block]
+
+        return None
+
+    def pack(self, parts):
+        """
+        Nest parts onto a roll (largest bounding box first). The parts are copied.
+
+        :return: RollLayout
+        """
+        res = self.resolution
+        roll_height = int(math.floor(self.roll_width / res))
+        roll = np.zeros((roll_height, 0), dtype=bool)
+        column_free = np.zeros(0, dtype=int)
+        column_runs = np.zeros(0, dtype=int)
+        # every column of a (grown) raster has a run of at least 2 * padding + 1 cells:
+        # no part starts left of the first column with such a free run (low-water mark)
+        min_cells = 2 * self.padding + 1
+        first_column = 0
+
+        placed = []
+        unplaced = []
+        parts_area = 0.
+        length = 0.
+        used_columns = 0
+
+        # rasterize one part after the other (memory)
+        for part in sorted(parts, key=lambda p: -p.area):
+            rasters = []
+            start_angle = 0
+            if self.minimize_area:
+                start_angle = part.get_minimal_rotation() * 180 / np.pi
+
+            for angle in self.get_rotations(part):
+                rotated = part.copy()
+                if angle + start_angle:
+                    rotated.rotate(angle + start_angle, radians=False)
+                rasters.append((rotated,) + self.rasterize(rotated))
+
+            # keep free space for the part behind the used columns
+            max_width = max([raster.shape[1] for _, raster, _, _ in rasters] + [0])
+            missing = used_columns + max_width + self.search_block - roll.shape[1]
+            if missing > 0:
+                extension = max(missing, roll.shape[1])
+                roll = np.concatenate([roll, np.zeros((roll_height, extension), dtype=bool)], axis=1)
+                column_free = np.concatenate([column_free, np.full(extension, roll_height)])
+                column_runs = np.concatenate([column_runs, np.full(extension, roll_height)])
+
+            best = None
+            for rotated, raster, origin, area in rasters:
+                position = self._find_position(roll, column_free, column_runs, raster, first_column)
+                if position is None:
+                    continue
+                key = (position[0] + raster.shape[1], position[1])
+                if best is None or key < best[0]:
+                    best = key, position, rotated, raster, origin, area
+
+            if best is None:
+                unplaced.append(part)
+                continue
+
+            _, (x, y), part, raster, origin, area = best
+            height, width = raster.shape
+            roll[y:y+height, x:x+width] |= raster
+            # update the index for the changed columns only
+            free_cells = ~roll[:, x:x+width]
+            column_free[x:x+width] = free_cells.sum(axis=0)
+            column_runs[x:x+width] = _max_runs(free_cells)
+            first_column += np.argmax(np.append(column_runs[first_column:] >= min_cells, True))
+            used_columns = max(used_columns, x + width)
+            part.move(np.array([x, y]) * res - origin)
+            placed.append(part)
+            parts_area += area
+            length = max(length, part.max_x)
+
+        return RollLayout(placed, self.roll_width, length, parts_area, unplaced)
+
+    def pack_layout(self, layout, workers=1):
+        """
+        Nest every material of a layout onto a separate roll
+
+        :param workers: number of processes (materials are packed in parallel)
+        :return: {material_code: RollLayout}
+        """
+        groups = {}
+        for part in layout.parts:
+            if part.material_code != "grid":
+                groups.setdefault(part.material_code, []).append(part)
+
+        material_codes = list(groups)
+
+        if workers > 1 and len(material_codes) > 1:
+            with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+                results = executor.map(self.pack, [groups[code] for code in material_codes])
+                results = list(results)
+        else:
+            results = [self.pack(groups[code]) for code in material_codes]
+
+        return dict(zip(material_codes, results))
@@ -2,6 +2,8 @@ import copy
 
 import numpy as np
 
+from openglider.vector.functions import minimum_area_rectangle, rotation_2d
+
 
 class Layer(object):
     stroke = "black"
@@ -13,6 +15,7 @@ class Layer(object):
         self.stroke = stroke
         self.stroke_width = stroke_width
         self.visible = visible
+        self._buffer = None
 
     def __add__(self, other):
         self.polylines += other
@@ -37,6 +40,84 @@ class Layer(object):
     def copy(self):
         return Layer([p.copy() for p in self])
 
+    def _get_state(self):
+        return [(line.data, getattr(line, "_version", 0)) for line in self.polylines]
+
+    @staticmethod
+    def _is_current(buffer, state):
+        if buffer is None or len(buffer[0]) != len(state):
+            return False
+        return all(data is old_data and version == old_version
+                   for (data, version), (old_data, old_version) in zip(state, buffer[0]))
+
+    def _get_buffer(self):
+        """
+        All points of the layer as one array (+offsets of the polylines) and the bounding box.
+        Cached until a polyline is added, its data is set or changed by item assignment
+        """
+        state = self._get_state()
+        buffer = getattr(self, "_buffer", None)
+        if not self._is_current(buffer, state):
+            arrays = [np.asarray(line_data, dtype=float) for line_data, _ in state]
+            arrays = [array[:, :2] if array.ndim == 2 else array.reshape(-1, 2) for array in arrays]
+            offsets = np.cumsum([0] + [len(array) for array in arrays])
+            points = np.concatenate(arrays) if arrays else np.zeros((0, 2))
+            buffer = self._set_buffer(state, points, offsets)
+
+        return buffer
+
+    def _set_buffer(self, state, points, offsets, bbox=None):
+        if bbox is None and len(points):
+            bbox = np.array([points.min(axis=0), points.max(axis=0)])
+        self._buffer = (state, points, offsets, bbox)
+        return self._buffer
+
+    def get_points(self):
+        return self._get_buffer()[1]
+
+    @property
+    def bbox(self):
+        """
+        [[min_x, min_y], [max_x, max_y]] or None for an empty layer
+        """
+        return self._get_buffer()[3]
+
+    def transform(self, matrix=None, offset=None):
+        """
+        Apply an affine transformation (point -> matrix.dot(point) + offset) to all polylines at once
+        """
+        _, points, offsets, bbox = self._get_buffer()
+
+        if matrix is not None:
+            matrix = np.asarray(matrix)
+            points = points.dot(matrix.T)
+            if np.count_nonzero(matrix - np.diag(np.diag(matrix))):
+                bbox = None  # rotation -> new extents
+            elif bbox is not None:
+                bbox = np.sort(bbox * np.diag(matrix), axis=0)
+        if offset is not None:
+            points = points + offset
+            if bbox is not None:
+                bbox = bbox + offset
+
+        for line, start, end in zip(self.polylines, offsets[:-1], offsets[1:]):
+            line.data = points[start:end]
+
+        self._set_buffer(self._get_state(), points, offsets, bbox)
+
+    def move(self, vector):
+        self.transform(offset=np.asarray(vector, dtype=float)[:2])
+
+    def rotate(self, angle, radians=True):
+        if not radians:
+            angle = np.pi * angle / 180
+        self.transform(rotation_2d(angle))
+
+    def scale(self, x, y=None):
+        if y is None:
+            y = x
+        self.transform(np.diag([x, y]))
+
     def _get_dxf_attributes(self):
         # color mapping: red->1, green->3, blue->5, black->7
         if self.stroke == "red":
@@ -138,66 +219,70 @@ class PlotPart(object):
         return copy.deepcopy(self)
 
     def max_function(self, axis, layer):
-        start = float("-Inf")
-        if layer:
-            for line in layer:
-                if line:
-                    values = [p[axis] for p in line]
-                    start = max(start, max(values))
-        return start
+        if layer.bbox is None:
+            return float("-Inf")
+        return layer.bbox[1][axis]
 
     def min_function(self, axis, layer):
-        start = float("Inf")
-        if layer:
-            for line in layer:
-                if line:
-                    values = [p[axis] for p in line]
-                    start = min(start, min(values))
-        return start
+        if layer.bbox is None:
+            return float("Inf")
+        return layer.bbox[0][axis]
+
+    def get_extent(self):
+        """
+        Bounding box of all layers: (lower_left, upper_right); (inf, -inf) for an empty part
+        """
+        bboxes = [layer.bbox for layer in self.layers.values()]
+        bboxes = [bbox for bbox in bboxes if bbox is not None]
+        if not bboxes:
+            return np.array([np.inf, np.inf]), np.array([-np.inf, -np.inf])
+
+        bboxes = np.array(bboxes)
+        return bboxes[:, 0].min(axis=0), bboxes[:, 1].max(axis=0)
 
     @property
     def max_x(self):
-        return max(self.max_function(0, l) for l in self.layers.values())
+        return self.get_extent()[1][0]
 
     @property
     def max_y(self):
-        return max(self.max_function(1, l) for l in self.layers.values())
+        return self.get_extent()[1][1]
 
     @property
     def min_x(self):
-        return min(self.min_function(0, l) for l in self.layers.values())
+        return self.get_extent()[0][0]
 
     @property
     def min_y(self):
-        return min(self.min_function(1, l) for l in self.layers.values())
+        return self.get_extent()[0][1]
 
     @property
     def width(self):
-        return self.max_x - self.min_x
+        lower, upper = self.get_extent()
+        return upper[0] - lower[0]
 
     @property
     def height(self):
-        return self.max_y - self.min_y
+        lower, upper = self.get_extent()
+        return upper[1] - lower[1]
 
     @property
     def bbox(self):
-        return [[self.min_x, self.min_y], [self.max_x, self.min_y],
-                [self.max_x, self.max_y], [self.min_x, self.max_y]]
+        (min_x, min_y), (max_x, max_y) = self.get_extent()
+        return [[min_x, min_y], [max_x, min_y],
+                [max_x, max_y], [min_x, max_y]]
 
     def rotate(self, angle, radians=True):
         for layer in self.layers.values():
-            for polyline in layer:
-                polyline.rotate(angle, radians=radians)
+            layer.rotate(angle, radians=radians)
 
     def move(self, vector):
-        for layer_name, layer in self.layers.items():
-            for vectorlist in layer:
-                vectorlist.move(vector)
+        for layer in self.layers.values():
+            layer.move(vector)
 
     def move_to(self, vector):
-        minx = self.min_x
-        miny = self.min_y
-        self.move([vector[0] - minx, vector[1] - miny])
+        lower, _ = self.get_extent()
+        self.move([vector[0] - lower[0], vector[1] - lower[1]])
 
     def intersects(self, other):
         """
@@ -217,30 +302,35 @@ class PlotPart(object):
     def area(self):
         return self.width * self.height
 
-    def minimize_area(self):
-        new_part = self.copy()
-        area = new_part.area
-        width = new_part.width
-        height = new_part.height
-        rotation = 0
-        for alpha in range(1, 90):
-            new_part.rotate(np.pi/180)
-            if new_part.area < area:
-                rotation = alpha
-                area = new_part.area
-                width = new_part.width
-                height = new_part.height
+    def get_points(self):
+        """
+        All points of all layers as one array
+        """
+        return np.concatenate([np.zeros((0, 2))] + [layer.get_points() for layer in self.layers.values()])
+
+    def get_minimal_rotation(self):
+        """
+        Rotation [rad] (PlotPart.rotate) to the minimal bounding box with the long side along x
+        """
+        angle, width, height = minimum_area_rectangle(self.get_points())
+
+        quarters = round(angle / (np.pi/2))
+        rotation = angle - quarters * np.pi/2
+        if quarters % 2:
+            width, height = height, width
 
         if width < height:
-            rotation -= 90
+            rotation -= np.pi/2
 
-        self.rotate(rotation*np.pi/180)
+        return rotation
+
+    def minimize_area(self):
+        self.rotate(self.get_minimal_rotation())
         return self
 
     def scale(self, factor):
         for layer in self.layers.values():
-            for p in layer:
-                p.scale(factor)
+            layer.scale(factor)
 
     def get_svg_group(self, non_scaling_stroke=True):
         import svgwrite
@@ -1,4 +1,6 @@
 import collections
+import concurrent.futures
+import pickle
 
 from openglider.plots.drawing import Layout
 from openglider.plots.glider.cell import CellPlotMaker
@@ -47,16 +49,27 @@ class PlotMaker(object):
 
         return self._cellplotmakers[cell]
 
-    def get_panels(self):
+    def get_panels(self, cell_panels=None):
+        """
+        :param cell_panels: (optional) precalculated (lower, upper) layouts for every cell
+        """
         self.panels.clear()
         panels_upper = []
         panels_lower = []
         panels = []
 
-        for cell in self.glider_3d.cells:
+        def get_cell_panels(cell_no, cell, again=False):
+            if cell_panels is not None:
+                lower, upper = cell_panels[cell_no]
+                if again:
+                    return lower.copy(), upper.copy()
+                return lower, upper
+
             pm = self._get_cellplotmaker(cell)
-            lower = pm.get_panels_lower()
-            upper = pm.get_panels_upper()
+            return pm.get_panels_lower(), pm.get_panels_upper()
+
+        for cell_no, cell in enumerate(self.glider_3d.cells):
+            lower, upper = get_cell_panels(cell_no, cell)
             panels_lower.append(lower)
             panels_upper.append(upper)
             panels.append([])
@@ -71,10 +84,9 @@ class PlotMaker(object):
         else:
             height = 0
 
-            for cell in self.glider_3d.cells:
-                lower = self._get_cellplotmaker(cell).get_panels_lower()
+            for cell_no, cell in enumerate(self.glider_3d.cells):
+                lower, upper = get_cell_panels(cell_no, cell, again=True)
                 #lower.rotate(180, radians=False)
-                upper = self._get_cellplotmaker(cell).get_panels_upper()
                 height = max(height, lower.height)
                 panels_lower.append(lower)
                 panels_upper.append(upper)
@@ -88,18 +100,22 @@ class PlotMaker(object):
         return self.panels
 
     def get_ribs(self, rotate=False):
-        from openglider.glider.rib.rib import SingleSkinRib
         self.ribs = []
         for rib in self.glider_3d.ribs:
-            if isinstance(rib, SingleSkinRib):
-                rib_plot = SingleSkinRibPlot(rib)
-            else:
-                rib_plot = RibPlot(rib, self.config)
-
-            rib_plot.flatten(self.glider_3d)
+            plotpart = self._get_rib_plot(rib)
             if rotate:
-                rib_plot.plotpart.rotate(90, radians=False)
-            self.ribs.append(rib_plot.plotpart)
+                plotpart.rotate(90, radians=False)
+            self.ribs.append(plotpart)
+
+    def _get_rib_plot(self, rib):
+        from openglider.glider.rib.rib import SingleSkinRib
+        if isinstance(rib, SingleSkinRib):
+            rib_plot = SingleSkinRibPlot(rib)
+        else:
+            rib_plot = RibPlot(rib, self.config)
+
+        rib_plot.flatten(self.glider_3d)
+        return rib_plot.plotpart
 
     def get_dribs(self):
         self.dribs.clear()
@@ -167,23 +183,89 @@ class PlotMaker(object):
 
         return Layout.stack_column(all_layouts, 0.01, center_x=False)
 
-    def unwrap(self):
+    def unwrap(self, workers=None):
+        """
+        Create all patterns (panels, ribs, dribs and straps)
+        :param workers: number of processes (default: config.unwrap_workers), 1 -> no multiprocessing
+        """
+        workers = workers or self.config.unwrap_workers
+        if workers > 1:
+            return self._unwrap_parallel(workers)
+
         self.get_panels()
         self.get_ribs()
         self.get_dribs()
         self.get_straps()
         return self
 
+    def _unwrap_parallel(self, workers):
+        """
+        Flatten every cell and rib in a process pool.
+        The glider is pickled once and loaded by every worker, results are gathered in order.
+        """
+        glider_pickle = pickle.dumps((self.__class__, self.glider_3d, self.config))
+        cells = self.glider_3d.cells
+
+        with concurrent.futures.ProcessPoolExecutor(workers, initializer=_init_worker,
+                                                    initargs=(glider_pickle,)) as executor:
+            cell_results = executor.map(_unwrap_cell, range(len(cells)))
+            rib_results = executor.map(_unwrap_rib, range(len(self.glider_3d.ribs)))
+
+            cell_results = list(cell_results)
+            self.ribs = list(rib_results)
+
+        # apply the 3d-shaping amounts calculated by the workers
+        for cell, (_, _, _, _, amounts) in zip(cells, cell_results):
+            for panel, (amount_front, amount_back) in zip(cell.panels, amounts):
+                panel.cut_front["amount_3d"] = amount_front
+                panel.cut_back["amount_3d"] = amount_back
+
+        self.get_panels([(lower, upper) for lower, upper, _, _, _ in cell_results])
+
+        self.dribs.clear()
+        self.straps.clear()
+        for cell, (_, _, dribs, straps, _) in zip(cells, cell_results):
+            self.dribs[cell] = dribs
+            self.straps[cell] = straps
+
+        return self
+
     def get_all_parts(self):
-        parts = []
-        for cell in self.panels.values():
-            parts += [p.copy() for p in cell]
+        parts = [p.copy() for p in self.panels if p.material_code != "grid"]
         for rib in self.ribs:
             parts.append(rib.copy())
         for dribs in self.dribs.values():
             parts += [p.copy() for p in dribs]
+        for straps in self.straps.values():
+            parts += [p.copy() for p in straps]
         return Layout(parts)
 
     #def get_all_grouped(self):
     #    return self.get_all_parts().group_materials()
 
+
+
+# process pool workers (PlotMaker.unwrap)
+_worker_plotmaker = None
+
+
+def _init_worker(glider_pickle):
+    global _worker_plotmaker
+    plotmaker_cls, glider_3d, config = pickle.loads(glider_pickle)
+    _worker_plotmaker = plotmaker_cls(glider_3d, config)
+
+
+def _unwrap_cell(cell_no):
+    cell = _worker_plotmaker.glider_3d.cells[cell_no]
+    pm = _worker_plotmaker._get_cellplotmaker(cell)
+    lower = pm.get_panels_lower()
+    upper = pm.get_panels_upper()
+    dribs = pm.get_dribs()
+    straps = pm.get_straps()
+    amounts = [(panel.cut_front.get("amount_3d"), panel.cut_back.get("amount_3d")) for panel in cell.panels]
+
+    return lower, upper, dribs, straps, amounts
+
+
+def _unwrap_rib(rib_no):
+    return _worker_plotmaker._get_rib_plot(_worker_plotmaker.glider_3d.ribs[rib_no])
@@ -2,6 +2,7 @@ import math
 import numpy as np
 
 from openglider.airfoil import get_x_value
+from openglider.glider.cell import Panel
 from openglider.plots import cuts, PlotPart
 from openglider.plots.glider.config import PatternConfig
 from openglider.vector import PolyLine2D, vector_angle
@@ -493,7 +494,7 @@ class DribPlot(object):
 
         ik_1 = foil(x1)
         ik_2 = foil(x2)
-        length = foil[ik_1:ik_2].get_length() * rib.chord
+        length = foil.get_length(ik_1, ik_2) * rib.chord
 
         ik_new = inner.extend(0, length)
         return inner[ik_new], outer[ik_new]
@@ -592,6 +593,8 @@ class CellPlotMaker:
         self.config = self.DefaultConf(config)
 
         self._flattened_cell = None
+        self._midribs = None
+        self._cuts_3d = None
 
     def _get_flatten_cell(self):
         if self._flattened_cell is None:
@@ -612,17 +615,37 @@ class CellPlotMaker:
 
         return self._flattened_cell
 
+    def _get_midribs(self):
+        if self._midribs is None:
+            inner = self._get_flatten_cell()["inner"]
+            self._midribs = self.cell.get_midribs(len(inner) - 2)
+
+        return self._midribs
+
     def _get_3d_shaping(self):
+        """
+        Integrate the 3d-shaping amounts of all panels (once per cell) and set them to the panel cuts
+        """
+        if self._cuts_3d is None:
+            self._cuts_3d = self._integrate_3d_shaping()
+
+        for panel in self.cell.panels:
+            for cut in (panel.cut_front, panel.cut_back):
+                cut["amount_3d"] = self._cuts_3d[self._cut_hash(cut)]
+
+    @staticmethod
+    def _cut_hash(cut):
+        return "{}-{}-{}".format(cut["left"], cut["right"], cut["type"])
+
+    def _integrate_3d_shaping(self):
         flat = self._get_flatten_cell()
         inner = flat["inner"]
+        midribs = self._get_midribs()
 
         cuts_3d = {}
 
-        def cut_hash(cut):
-            return "{}-{}-{}".format(cut["left"], cut["right"], cut["type"])
-
         def add_amount(cut, amount):
-            cut_key = cut_hash(cut)
+            cut_key = self._cut_hash(cut)
 
             for key in cuts_3d:
                 if key == cut_key:
@@ -633,20 +656,14 @@ class CellPlotMaker:
 
             cuts_3d[cut_key] = amount
 
-        def get_amount(cut):
-            cut_key = cut_hash(cut)
-            data = cuts_3d[cut_key]
-            return data
-
-        for panel in self.cell.panels:
-            amount_front, amount_back = panel.integrate_3d_shaping(self.cell, self.config.sigma_3d_cut, inner)
+        panels = self.cell.panels
+        amounts = Panel.integrate_3d_shaping_panels(panels, self.cell, self.config.sigma_3d_cut, inner, midribs)
 
+        for panel, (amount_front, amount_back) in zip(panels, amounts):
             add_amount(panel.cut_front, amount_front)
             add_amount(panel.cut_back, amount_back)
 
-        for panel in self.cell.panels:
-            panel.cut_front["amount_3d"] = get_amount(panel.cut_front)
-            panel.cut_back["amount_3d"] = get_amount(panel.cut_back)
+        return cuts_3d
 
     def get_panels(self, panels=None):
         cell_panels = []
@@ -60,6 +60,22 @@ class PatternConfig(Config):
 
     layout_seperate_panels = True
 
+    unwrap_workers = 1
+
+    # nesting onto rolls (Patterns.unwrap), None -> no nesting
+    nesting_roll_width = None
+    nesting_resolution = 0.005
+    nesting_distance = 0.01
+    nesting_rotations = (0, 180)
+
+    # svg export (Patterns.unwrap): path-data with relative coordinates [mm]
+    svg_compact = False
+    svg_precision = 2
+    svg_tolerance = 0
+
+    # dxf export (Patterns.unwrap): repeated marks and text as block references
+    dxf_blocks = False
+
 
 class OtherPatternConfig(PatternConfig):
     complete_glider = False
@@ -19,6 +19,12 @@ class CachedObject(object):
     def __hash__(self):
         return hash_attributes(self, self.hashlist)
 
+    def __getstate__(self):
+        # cached values are bound to the (local) property classes -> recalculate after unpickling / copying
+        state = self.__dict__.copy()
+        state.pop("_cache", None)
+        return state
+
     def __del__(self):
         for prop in self.cached_properties:
             if id(self) in prop.cache:
@@ -130,6 +136,8 @@ class HashedList(CachedObject):
     Hashed List to use cached properties
     """
     name = "unnamed"
+    _version = 0  # incremented when the data is changed in place (__setitem__)
+
     def __init__(self, data, name=None):
         self._data = None
         self._hash = None
@@ -147,6 +155,7 @@ class HashedList(CachedObject):
     def __setitem__(self, key, value):
         self.data[key] = np.array(value)
         self._hash = None
+        self._version += 1
 
     def __hash__(self):
         if self._hash is None:
@@ -174,7 +183,8 @@ class HashedList(CachedObject):
     @data.setter
     def data(self, data):
         if data is not None:
-            data = list(data)  # np.array(zip(x,y)) is shit
+            if not isinstance(data, np.ndarray):
+                data = list(data)  # np.array(zip(x,y)) is shit
             self._data = np.array(data)
             #self._data = np.array(data)
             #self._data = [np.array(vector) for vector in data]  # 1,5*execution time
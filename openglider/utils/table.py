@@ -94,6 +94,35 @@ class Table():
         for i, el in enumerate(row):
             self.set(i, row_no, el)
 
+    def get_rows(self):
+        """
+        Get all values as a list of rows (one pass over the table)
+        """
+        rows = [[None] * self.num_columns for _ in range(self.num_rows)]
+        for key, value in self.dct.items():
+            column_no, row_no = self.str_decrypt(key)
+            rows[row_no][column_no] = value
+
+        return rows
+
+    @classmethod
+    def from_rows(cls, rows, start_row=0, start_column=0):
+        """
+        Create a table from a list of rows,
+        a row can be a list or a dict {column_no: value}
+        """
+        table = cls()
+        for row_no, row in enumerate(rows):
+            if isinstance(row, dict):
+                items = row.items()
+            else:
+                items = enumerate(row)
+            for column_no, value in items:
+                if value is not None:
+                    table.set(start_column + column_no, start_row + row_no, value)
+
+        return table
+
     def get(self, column_no, row_no):
         key = self.str_encrypt(column_no, row_no)
         return self.dct.get(key, None)
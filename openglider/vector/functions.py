@@ -82,6 +82,96 @@ def cut(p1, p2, p3, p4):
     return p1 + k * (p2 - p1), k, l
 
 
+def convex_hull(points):
+    """
+    2D-Convex hull (monotone chain), counter-clockwise without collinear points
+    """
+    points = np.unique(np.asarray(points, dtype=float)[:, :2], axis=0)  # sorted by x, y
+    if len(points) < 3:
+        return points
+
+    def half_hull(pts):
+        hull = []
+        for point in pts:
+            while len(hull) > 1:
+                (x1, y1), (x2, y2) = hull[-1] - hull[-2], point - hull[-2]
+                if x1 * y2 - y1 * x2 > 0:
+                    break
+                hull.pop()
+            hull.append(point)
+        return hull[:-1]
+
+    return np.array(half_hull(points) + half_hull(points[::-1]))
+
+
+def minimum_area_rectangle(points):
+    """
+    Minimal bounding rectangle of 2D-points (rotating calipers on the convex hull).
+    One side of the rectangle is collinear with a hull edge; the extreme hull points for every
+    edge-direction are found with a binary search in the (sorted) edge angles.
+
+    :return: (angle[rad] of the rectangle's first side, width (along that side), height)
+    """
+    hull = convex_hull(points)
+    if len(hull) < 3:
+        if len(hull) == 2:
+            diff = hull[1] - hull[0]
+            return math.atan2(diff[1], diff[0]), norm(diff), 0.
+        return 0., 0., 0.
+
+    edges = np.roll(hull, -1, axis=0) - hull
+    angles = np.unwrap(np.arctan2(edges[:, 1], edges[:, 0]))
+    # outward normals (ccw hull) separate the extreme points for each direction
+    normals = angles - np.pi/2
+
+    def extreme_points(directions):
+        directions = (directions - normals[0]) % (2*np.pi) + normals[0]
+        return hull[np.searchsorted(normals, directions) % len(hull)]
+
+    directions = np.array([np.cos(angles), np.sin(angles)]).T
+    front = extreme_points(angles)
+    back = extreme_points(angles + np.pi)
+    top = extreme_points(angles + np.pi/2)
+
+    widths = np.sum((front - back) * directions, axis=1)
+    heights = np.sum((top - hull) * directions[:, ::-1] * [-1, 1], axis=1)
+    i = np.argmin(widths * heights)
+
+    return angles[i], widths[i], heights[i]
+
+
+def douglas_peucker(points, tolerance):
+    """
+    Ramer-Douglas-Peucker simplification of a 2D-line.
+    Return the indices of the points to keep (first and last are always kept)
+    """
+    points = np.asarray(points, dtype=float)
+    keep = np.zeros(len(points), dtype=bool)
+    keep[[0, -1]] = True
+    segments = [(0, len(points) - 1)]
+
+    while segments:
+        start, end = segments.pop()
+        if end - start < 2:
+            continue
+
+        direction = points[end] - points[start]
+        diff = points[start+1:end] - points[start]
+        length = norm(direction)
+        if length > 0:
+            distance = np.abs(direction[0] * diff[:, 1] - direction[1] * diff[:, 0]) / length
+        else:
+            distance = np.hypot(diff[:, 0], diff[:, 1])
+
+        i = np.argmax(distance)
+        if distance[i] > tolerance:
+            index = start + 1 + i
+            keep[index] = True
+            segments += [(start, index), (index, end)]
+
+    return np.nonzero(keep)[0]
+
+
 def set_dimension(array, dim=3):
     array = np.array(array)
     if len(array.shape) == 1:
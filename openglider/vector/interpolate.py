@@ -1,24 +1,70 @@
+import numpy as np
+
 from openglider.vector import PolyLine2D
 
 
 class Interpolation(PolyLine2D):
+    """
+    Linear interpolation of 2d-points (x, y).
+    Call with a scalar or an array of x-values.
+    """
     def __init__(self, data, name=None, extrapolate=True):
         super(Interpolation, self).__init__(data, name)
         self.extrapolate = extrapolate
 
-    def __call__(self, xval):
-        last_point = self.data[0]
-        for index, point in enumerate(self.data):
-            if index == 0:
-                continue
+    @property
+    def _x_lookup(self):
+        """
+        non-decreasing x-values for the segment lookup
+        (cumulative maximum -> same segment as a sequential scan for unsorted data)
+        and a flag for strictly increasing data.
+        Cached until data is set or changed by item assignment
+        (cheaper than hashing the data of short-lived interpolations)
+        """
+        lookup = getattr(self, "_lookup", None)
+        if lookup is None or lookup[0] is not self.data or lookup[1] != self._version:
+            x = self.data[:, 0]
+            x_max = np.maximum.accumulate(x[1:])
+            increasing = bool(np.all(x[1:] > x[:-1]))
+            lookup = self._lookup = (self.data, self._version, x_max, increasing)
+
+        return lookup[2:]
+
+    def get_indices(self, xvals):
+        """
+        Get the index of the upper point of the segment used for each x-value
+        """
+        xvals = np.asarray(xvals, dtype=float)
+        x_max, increasing = self._x_lookup
 
-            lower_bound = self.extrapolate or last_point[0] < xval
-            end_of_list = self.extrapolate and index == len(self.data) - 1
+        if self.extrapolate:
+            # first point (from index 1) with x > xval, else the last segment
+            indices = np.searchsorted(x_max, xvals, side="right") + 1
+            return np.minimum(indices, len(self.data) - 1)
 
-            if (lower_bound and xval < point[0]) or end_of_list:
-                d_x = point[0] - last_point[0]
-                return last_point[1] + (xval-last_point[0])/d_x * (point[1] - last_point[1])
+        x = self.data[:, 0]
+        if increasing:
+            indices = np.searchsorted(x, xvals, side="left")
+            valid = (indices > 0) & (indices < len(x))
+            indices = np.clip(indices, 1, len(x) - 1)
+            valid &= x[indices] > xvals
+        else:
+            xvals_col = xvals[..., np.newaxis]
+            inside = (x[:-1] < xvals_col) & (xvals_col < x[1:])
+            valid = inside.any(axis=-1)
+            indices = inside.argmax(axis=-1) + 1
+
+        if not np.all(valid):
+            raise ValueError("Value out of interpolation range: {}".format(xvals[~valid]))
+
+        return indices
+
+    def __call__(self, xval):
+        xvals = np.asarray(xval, dtype=float)
+        indices = self.get_indices(xvals)
 
-            last_point = point
+        last_point = self.data[indices - 1]
+        point = self.data[indices]
 
-        raise Exception
+        d_x = point[..., 0] - last_point[..., 0]
+        return last_point[..., 1] + (xvals-last_point[..., 0])/d_x * (point[..., 1] - last_point[..., 1])
@@ -2,7 +2,7 @@ import numpy as np
 
 from openglider.utils import sign
 from openglider.utils.cache import cached_property, HashedList
-from openglider.vector.functions import norm, normalize, rangefrom, rotation_2d, cut
+from openglider.vector.functions import norm, normalize, rotation_2d
 from openglider.utils.table import Table
 
 
@@ -28,6 +28,10 @@ class PolyLine(HashedList):
                 k = ik % 1 + max(0, int(ik) - len(self.data) + 2)
             return self.data[i] + k * (self.data[i + 1] - self.data[i])
 
+    def __setitem__(self, key, value):
+        super(PolyLine, self).__setitem__(key, value)
+        self._length_index = None
+
     def __mul__(self, other):
         """Scale"""
         new = self.copy()
@@ -66,6 +70,15 @@ class PolyLine(HashedList):
         """List.point(x) is the same as List[x]"""
         return self[x]
 
+    def get_points(self, iks):
+        """
+        Vectorized List[ik] for an array of (float) ik-values
+        """
+        iks = np.asarray(iks, dtype=float)
+        i = np.clip(np.floor(iks).astype(int), 0, len(self.data) - 2)
+        k = (iks - i)[..., np.newaxis]
+        return self.data[i] + k * (self.data[i + 1] - self.data[i])
+
     def last(self):
         return self[len(self) - 1]
 
@@ -96,38 +109,56 @@ class PolyLine(HashedList):
 
 
     def check(self):
-        # remove zero-length segments
-        index = 0
-        while index < len(self)-1:
-            if norm(self[index+1] - self[index]) < 0.0000001:
-                self.data = np.concatenate([self[:index], self[index+1:]])
-            else:
-                index += 1
+        # remove zero-length segments (drop the first point of the segment, keep the endpoint)
+        if len(self.data) > 1:
+            keep = np.ones(len(self.data), dtype=bool)
+            keep[:-1] = np.linalg.norm(np.diff(self.data, axis=0), axis=1) >= 0.0000001
+            if not keep.all():
+                self.data = self.data[keep]
 
         return self
 
+    @property
+    def _lengths(self):
+        """
+        Cumulative length at every point and the length of every segment.
+        Cached until data is set (cheaper than hashing the data of short-lived lines)
+        """
+        index = getattr(self, "_length_index", None)
+        if index is None or index[0] is not self.data:
+            segment_lengths = np.linalg.norm(np.diff(self.data, axis=0), axis=1)
+            cumulative = np.concatenate([[0.], np.cumsum(segment_lengths)])
+            index = self._length_index = (self.data, cumulative, segment_lengths)
+
+        return index[1:]
+
+    def get_lengths(self, iks):
+        """
+        Vectorized length from the start of the line to (float) ik-values.
+        Beyond the ends the first/last segment is extended linearly.
+        """
+        cumulative, segment_lengths = self._lengths
+        iks = np.asarray(iks, dtype=float)
+        i = np.clip(np.floor(iks).astype(int), 0, len(self.data) - 2)
+        return cumulative[i] + (iks - i) * segment_lengths[i]
+
+    def positions_at_lengths(self, lengths):
+        """
+        Vectorized inverse of get_lengths: get the ik-values for lengths measured from the start of the line
+        """
+        cumulative, segment_lengths = self._lengths
+        lengths = np.asarray(lengths, dtype=float)
+        i = np.searchsorted(cumulative, lengths, side="right") - 1
+        i = np.clip(i, 0, len(self.data) - 2)
+        return i + (lengths - cumulative[i]) / segment_lengths[i]
+
     def extend(self, start, length):
         """
         Move from a starting point for a given length in direction of the line
         """
         if length == 0:
             return start
-        direction = sign(length)
-        length = abs(length)
-        next_value = start - start % 1 + (direction > 0)
-        difference = norm(self[start] - self[next_value])
-        length -= difference
-        #
-        while length > 0:
-            if (next_value > len(self) and direction > 0) or (next_value < 0 and direction < 0):
-                break
-            start = next_value
-            next_value += direction
-            difference = norm(self[next_value] - self[start])
-            length -= difference
-            # Length is smaller than zero
-        length = length
-        return next_value + direction * length * abs(next_value - start) / difference
+        return float(self.positions_at_lengths(self.get_lengths(start) + length))
 
     def get_length(self, first=0, second=None):
         """
@@ -135,37 +166,14 @@ class PolyLine(HashedList):
         """
         if second is None:
             second = len(self) - 1
-        direction = sign(float(second - first))
-        length = 0
-        next_value = int(first - first % 1 + (direction > 0))
-        # Just to fasten up
-        if next_value > len(self) and direction < 0:
-            next_value = len(self)
-        elif next_value < 0 < direction:
-            next_value = 0
-        while next_value * direction < second * direction:
-            length += norm(self[next_value] - self[first])
-            first = next_value
-            next_value += direction
-            # Fasten up aswell
-            if (next_value > len(self) and direction > 0) or (next_value < 0 and direction < 0):
-                break
-        return length + norm(self[second] - self[first])
+        first_length, second_length = self.get_lengths([first, second])
+        return abs(second_length - first_length)
 
     def get_segment_lengthes(self):
-        lengths = []
-        segments = self.get_segments()
-        for s in segments:
-            lengths.append(norm(s))
-
-        return lengths
+        return list(self._lengths[1])
 
     def get_segments(self):
-        segments = []
-        for p1, p2 in zip(self.data[:-1], self.data[1:]):
-            segments.append(p2 - p1)
-
-        return segments
+        return list(np.diff(self.data, axis=0))
 
     def scale(self, x, y=None):
         if y is None:
@@ -209,33 +217,95 @@ class PolyLine2D(PolyLine):
             return PolyLine2D(res.data)
         return res
 
+    def get_segment_cuts(self, p1, p2):
+        """
+        Cut every segment with one or more lines p1p2 (vectorized functions.cut).
+        p1 and p2 can be points or arrays of points (shape (..., 2))
+        Returns (k, l) with shape (..., len(self)-1):
+            k: position on the segment, l: position on the line p1p2
+            nan for parallel segments
+        """
+        p1 = np.asarray(p1, dtype=float)[..., np.newaxis, :]
+        p2 = np.asarray(p2, dtype=float)[..., np.newaxis, :]
+        start = self.data[:-1]
+        segment = self.data[1:] - start
+        line = p1 - p2
+        rhs = p1 - start
+
+        det = segment[:, 0] * line[..., 1] - line[..., 0] * segment[:, 1]
+        parallel = det == 0
+        det = np.where(parallel, 1., det)
+
+        k = (rhs[..., 0] * line[..., 1] - line[..., 0] * rhs[..., 1]) / det
+        l = (segment[:, 0] * rhs[..., 1] - segment[:, 1] * rhs[..., 0]) / det
+
+        k[parallel] = np.nan
+        l[parallel] = np.nan
+
+        return k, l
+
+    def _filter_cuts(self, k, l, startpoint, extrapolate, cut_only_positive):
+        """
+        Select the cuts of get_segment_cuts (for multiple lines) the same way as cut() and order them around startpoint
+        Returns an array of segment-numbers for every line
+        """
+        num_segments = len(self.data) - 1
+        i = np.arange(num_segments)
+        with np.errstate(invalid="ignore"):
+            good_cut = ((0 < k) & (k <= 1)) | ((k == 0) & (i == 0))
+            if extrapolate:
+                extrapolated_front = (i == 0) & (k <= 0)
+                extrapolated_back = (i == num_segments - 1) & (k > 0)
+                good_cut |= extrapolated_front | extrapolated_back
+            if cut_only_positive:
+                good_cut &= l >= 0
+
+        # same order as rangefrom(num_segments, startpoint)
+        startpoint = int(startpoint)
+        order = np.lexsort((i < startpoint, np.abs(i - startpoint)))
+
+        return [order[mask[order]] for mask in good_cut.reshape(-1, num_segments)]
+
     def cut(self, p1, p2, startpoint=0, extrapolate=False, cut_only_positive=False):
         """
         Iterate over all cuts with the line p1p2
         if extrapolate is true, cuts will be exceeding the lists length
         """
-        startpoint = int(startpoint)
-        for i in rangefrom(len(self)-1, startpoint):
-            try:
-                # (x,y), i, k
-                pos, ik1, ik2 = cut(self[i], self[i+1], p1, p2)
-                good_cut = 0 < ik1 <= 1 or ik1 == i == 0
-                extrapolated_front = i == 0 and ik1 <= 0
-                extrapolated_back = i == len(self)-2 and ik1 > 0
-                extrapolated_cut = extrapolated_front or extrapolated_back
-
-                if good_cut or extrapolate and extrapolated_cut:
-                    if cut_only_positive and ik2 < 0:
-                        continue
-                    yield i+ik1, ik2
-            except np.linalg.LinAlgError:
-                continue
+        for ik1, ik2 in self.cut_many([(p1, p2)], startpoint, extrapolate, cut_only_positive)[0]:
+            yield ik1, ik2
+
+    def cut_many(self, lines, startpoint=0, extrapolate=False, cut_only_positive=False):
+        """
+        Cut with multiple lines [(p1, p2), ...] at once
+        Returns a list of cuts [(ik1, ik2), ...] for every line, ordered like cut()
+        """
+        if len(self.data) < 2 or len(lines) == 0:
+            return [[] for _ in lines]
+
+        lines = np.asarray(lines, dtype=float)
+        k, l = self.get_segment_cuts(lines[:, 0], lines[:, 1])
+        indices = self._filter_cuts(k, l, startpoint, extrapolate, cut_only_positive)
+
+        return [list(zip(segments + k_line[segments], l_line[segments]))
+                for segments, k_line, l_line in zip(indices, k, l)]
 
     def cut_with_polyline(self, pl, startpoint=0):
-        for i, (p1, p2) in enumerate(zip(pl[:-1], pl[1:])):
-            l = norm(p2-p1)
-            for ik1, k2 in self.cut(p1, p2, startpoint, cut_only_positive=True):
-                ik2 = i + (norm(self[ik1] - p1) / l)
+        p1 = np.array(list(pl[:-1]))
+        p2 = np.array(list(pl[1:]))
+        num_lines = min(len(p1), len(p2))
+        if num_lines == 0 or len(self.data) < 2:
+            return
+
+        p1 = p1[:num_lines]
+        p2 = p2[:num_lines]
+        k, l = self.get_segment_cuts(p1, p2)
+        indices = self._filter_cuts(k, l, startpoint, False, True)
+        lengths = np.linalg.norm(p2 - p1, axis=1)
+
+        for i, segments in enumerate(indices):
+            iks = segments + k[i][segments]
+            ik2s = i + np.linalg.norm(self.get_points(iks) - p1[i], axis=1) / lengths[i]
+            for ik1, ik2 in zip(iks, ik2s):
                 yield ik1, ik2
 
     def check(self):  # TODO: IMPROVE (len = len(self.data), len-=,...)
@@ -243,22 +313,72 @@ class PolyLine2D(PolyLine):
         Check for mistakes in the array, such as for the moment: self-cuttings,..
         """
         super(PolyLine2D, self).check()
-        for i in range(len(self.data) - 3):
-            if i > len(self.data) - 4:
-                break
-            for j in range(i + 2, len(self.data) - 2):
-                if j > len(self.data) - 3:
-                    break
-                try:
-                    temp = cut(self.data[i], self.data[i + 1], self.data[j], self.data[j + 1])
-                    if 0 < temp[1] < 1. and 0 < temp[2] < 1.:
-                        #self.data = self.data[:i] + [temp[0]] + self.data[j + 1:]
-                        self.data = np.concatenate([self.data[:i], [temp[0]], self.data[j+1:]])
-                except np.linalg.linalg.LinAlgError:
-                    continue
+
+        data = self.data
+        new_data = []
+        last_index = 0
+        for i, j, point in self.get_self_intersections():
+            if i < last_index:
+                # segment already removed by a previous loop
+                continue
+            new_data += [data[last_index:i], [point]]
+            last_index = j + 1
+
+        if new_data:
+            self.data = np.concatenate(new_data + [data[last_index:]])
 
         return self
 
+    def get_self_intersections(self):
+        """
+        Find all cuts of non-neighbouring segments (excluding the last segment) using a sweep along the x-axis:
+        only segments with overlapping x-ranges are candidates for the exact test.
+        Returns a list of (segment_1, segment_2, point) sorted by segment numbers
+        """
+        num_segments = len(self.data) - 2
+        if num_segments < 3:
+            return []
+
+        start = self.data[:-2]
+        end = self.data[1:-1]
+        x_min = np.minimum(start[:, 0], end[:, 0])
+        x_max = np.maximum(start[:, 0], end[:, 0])
+
+        # sweep: every segment is active until the sweep-line passes its x_max
+        order = np.argsort(x_min, kind="stable")
+        x_min_sorted = x_min[order]
+        active_until = np.searchsorted(x_min_sorted, x_max[order], side="right")
+        num_candidates = active_until - np.arange(num_segments) - 1
+        first = np.repeat(np.arange(num_segments), num_candidates)
+        offset = np.arange(len(first)) - np.repeat(np.cumsum(num_candidates) - num_candidates, num_candidates)
+        second = first + 1 + offset
+
+        seg_1 = np.minimum(order[first], order[second])
+        seg_2 = np.maximum(order[first], order[second])
+
+        y_min = np.minimum(start[:, 1], end[:, 1])
+        y_max = np.maximum(start[:, 1], end[:, 1])
+        candidate = (seg_2 - seg_1 >= 2) & (y_min[seg_1] <= y_max[seg_2]) & (y_min[seg_2] <= y_max[seg_1])
+        seg_1 = seg_1[candidate]
+        seg_2 = seg_2[candidate]
+
+        # exact test (functions.cut for all candidates)
+        d_1 = end[seg_1] - start[seg_1]
+        d_2 = start[seg_2] - end[seg_2]
+        rhs = start[seg_2] - start[seg_1]
+        det = d_1[:, 0] * d_2[:, 1] - d_2[:, 0] * d_1[:, 1]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            k = (rhs[:, 0] * d_2[:, 1] - d_2[:, 0] * rhs[:, 1]) / det
+            l = (d_1[:, 0] * rhs[:, 1] - d_1[:, 1] * rhs[:, 0]) / det
+            cuts = (det != 0) & (0 < k) & (k < 1) & (0 < l) & (l < 1)
+
+        seg_1 = seg_1[cuts]
+        seg_2 = seg_2[cuts]
+        points = start[seg_1] + k[cuts][:, np.newaxis] * d_1[cuts]
+        sort = np.lexsort((seg_2, seg_1))
+
+        return [(int(seg_1[n]), int(seg_2[n]), points[n]) for n in sort]
+
     @cached_property('self')
     def normvectors(self):   #RENAME: norm_point_vectors?
         """
@@ -37,7 +37,60 @@ def point2d(p1_3d, p1_2d, p2_3d, p2_2d, point_3d):
     return np.array(point_2d + diff_2d * diff_3d.dot(diff_point))
 
 
+def _triangle_coordinates(p1, p2, point):
+    """
+    Local 2D coordinates (u, v) of points relative to the edges p1->p2 (arrays of 3D points),
+    u: along the edge, v: distance to the edge (same as point2d)
+    """
+    edge = p2 - p1
+    edge /= np.linalg.norm(edge, axis=1)[:, np.newaxis]
+    diff = point - p1
+    u = np.sum(edge * diff, axis=1)
+    v = np.linalg.norm(diff - edge * u[:, np.newaxis], axis=1)
+    return u, v
+
+
 def flatten_list(list1, list2):
+    """
+    Unfold the triangle strip between two 3D polylines to 2D.
+    The triangles (left_i, right_i, left_i+1) and (left_i+1, right_i, right_i+1)
+    are placed one after another, starting with left_0 at (0, 0) and right_0 on the x-axis.
+    """
+    if len(list1) != len(list2) or len(list1) < 2:
+        return _flatten_list(list1, list2)
+
+    left = np.asarray(list1.data if hasattr(list1, "data") else list1, dtype=float)
+    right = np.asarray(list2.data if hasattr(list2, "data") else list2, dtype=float)
+
+    # triangle left_i, right_i -> left_i+1
+    u_left, v_left = _triangle_coordinates(left[:-1], right[:-1], left[1:])
+    # triangle left_i+1, right_i -> right_i+1
+    u_right, v_right = _triangle_coordinates(left[1:], right[:-1], right[1:])
+
+    rung_length = np.linalg.norm(right[:-1] - left[:-1], axis=1)
+    # angle of the edge left_i+1 -> right_i relative to left_i -> right_i
+    angle_diagonal = np.arctan2(-v_left, rung_length - u_left)
+    # angle of the edge left_i+1 -> right_i+1 relative to left_i+1 -> right_i
+    angle_rung = np.arctan2(v_right, u_right)
+
+    turn = np.zeros(2 * len(angle_rung) + 1)
+    turn[1::2] = angle_diagonal
+    turn[2::2] = angle_rung
+    angles = np.cumsum(turn)
+    direction_rung = np.exp(1j * angles[:-1:2])
+    direction_diagonal = np.exp(1j * angles[1::2])
+
+    flat_left = np.zeros(len(left), dtype=complex)
+    flat_left[1:] = np.cumsum((u_left + 1j * v_left) * direction_rung)
+    flat_right = np.zeros(len(right), dtype=complex)
+    flat_right[0] = np.linalg.norm(left[0] - right[0])
+    flat_right[1:] = flat_left[1:] + (u_right + 1j * v_right) * direction_diagonal
+
+    return (PolyLine2D(np.array([flat_left.real, flat_left.imag]).T),
+            PolyLine2D(np.array([flat_right.real, flat_right.imag]).T))
+
+
+def _flatten_list(list1, list2):
     index_left = index_right = 0
     flat_left = [np.array([0, 0])]
     flat_right = [np.array([norm(list1[0]-list2[0]), 0])]
@@ -19,6 +19,8 @@
 # along with OpenGlider.  If not, see <http://www.gnu.org/licenses/>.
 from __future__ import division
 
+import collections
+
 import numpy as np
 
 from openglider.utils.cache import HashedList
@@ -27,19 +29,99 @@ from openglider.vector.transformation import Reflection
 from openglider.utils import dualmethod
 
 
-class _BernsteinFactory():
-    def __init__(self):
-        self.bases = {}
+class _BasisFactory(object):
+    """
+    Base for the curve bases: basis functions and cached basis matrices
+    (matrix[row, column] = basis[column](values[row]))
+    """
+    max_cached_matrices = 256
+    matrices = collections.OrderedDict()
+    fit_matrices = collections.OrderedDict()
+
+    def __call__(self, numpoints):
+        """list of the basis functions for a number of controlpoints"""
+        def basis_function(column):
+            return lambda x: self.get_basis_matrix(numpoints, [x])[0, column]
+
+        return [basis_function(column) for column in range(numpoints)]
+
+    def get_key(self, numpoints):
+        return (self.__class__, numpoints)
+
+    def get_basis_matrix(self, numpoints, values):
+        raise NotImplementedError
+
+    def get_matrix(self, numpoints, values):
+        """
+        Cached basis matrix for a batch of parameters
+        (least recently used matrices are dropped, single values are not cached)
+        """
+        values = np.asarray(values, dtype=float)
+        if values.size <= 1:
+            return self.get_basis_matrix(numpoints, values.reshape(-1))
+
+        key = self.get_key(numpoints) + (values.tobytes(), )
+        if key in self.matrices:
+            self.matrices.move_to_end(key)
+        else:
+            if len(self.matrices) >= self.max_cached_matrices:
+                self.matrices.popitem(last=False)
+            matrix = self.get_basis_matrix(numpoints, values)
+            matrix.flags.writeable = False
+            self.matrices[key] = matrix
+
+        return self.matrices[key]
+
+    def get_fit_matrices(self, numpoints, num_samples, fixed=()):
+        """
+        Cached least-squares operators to fit numpoints controlpoints to num_samples
+        (equally spaced) points, with the controlpoints in fixed given:
+        controlpoints[free] = solve.dot(points) - solve_fixed.dot(controlpoints[fixed])
+        :return: free, solve, solve_fixed
+        """
+        fixed = tuple(fixed)
+        key = self.get_key(numpoints) + (num_samples, fixed)
+        if key in self.fit_matrices:
+            self.fit_matrices.move_to_end(key)
+        else:
+            if len(self.fit_matrices) >= self.max_cached_matrices:
+                self.fit_matrices.popitem(last=False)
+            matrix = self.get_matrix(numpoints, np.linspace(0, 1, num_samples))
+            free = [index for index in range(numpoints) if index not in fixed]
+            solve = np.linalg.pinv(matrix[:, free])
+            solve_fixed = solve.dot(matrix[:, list(fixed)])
+            self.fit_matrices[key] = free, solve, solve_fixed
+
+        return self.fit_matrices[key]
+
+    def fit(self, numpoints, points, fixed=(), fixed_points=None):
+        """
+        Least-squares fit of controlpoints to equally spaced points.
+        Fits one (num_samples, dim) or a stack (..., num_samples, dim) of curves in one solve.
+        :param fixed: indices of given controlpoints
+        :param fixed_points: values of the given controlpoints (..., len(fixed), dim)
+        :return: controlpoints (..., numpoints, dim)
+        """
+        points = np.asarray(points, dtype=float)
+        free, solve, solve_fixed = self.get_fit_matrices(numpoints, points.shape[-2], fixed)
 
-    def __call__(self, degree):
-        """degree is the number of controlpoints"""
-        if degree not in self.bases:
-            def bsf(n):
-                return lambda x: choose(degree - 1, n) * (x ** n) * ((1 - x) ** (degree - 1 - n))
+        controlpoints = np.zeros(points.shape[:-2] + (numpoints, points.shape[-1]))
+        controlpoints[..., free, :] = np.matmul(solve, points)
+        if len(fixed):
+            fixed_points = np.asarray(fixed_points, dtype=float)
+            controlpoints[..., free, :] -= np.matmul(solve_fixed, fixed_points)
+            controlpoints[..., list(fixed), :] = fixed_points
 
-            self.bases[degree] = [bsf(i) for i in range(degree)]
+        return controlpoints
 
-        return self.bases[degree]
+
+class _BernsteinFactory(_BasisFactory):
+    def get_basis_matrix(self, numpoints, values):
+        """the degree is given by the number of controlpoints (numpoints - 1)"""
+        values = np.asarray(values, dtype=float)[:, np.newaxis]
+        n = np.arange(numpoints)
+        factors = np.array([choose(numpoints - 1, i) for i in n], dtype=float)
+        return factors * values ** n * (1 - values) ** (numpoints - 1 - n)
 
 BernsteinBase = _BernsteinFactory()
 
@@ -52,7 +134,6 @@ class Bezier(HashedList):
         Bezier Curve representative
         http://en.wikipedia.org/wiki/Bezier_curve#Generalization
         """
-        self._matrix = None
         super(Bezier, self).__init__(controlpoints)
 
     def __repr__(self):
@@ -66,14 +147,14 @@ class Bezier(HashedList):
         return cls(controlpoints)
 
     def __call__(self, value):
-        dim = len(self.data[0])
-        assert 0 <= value <= 1, "value must be in the range (0,1), not {}".format(value)
+        """
+        Get the point(s) for a parameter or an array of parameters
+        """
+        values = np.asarray(value, dtype=float)
+        assert np.all((0 <= values) & (values <= 1)), "value must be in the range (0,1), not {}".format(value)
 
-        val = np.zeros(dim)
-        base = self.basefactory(len(self.data))
-        for i, point in enumerate(self.data):
-            val += point * base[i](value)
-        return val
+        matrix = self.basefactory.get_matrix(len(self.data), values.reshape(-1))
+        return matrix.dot(self.data).reshape(values.shape + (-1, ))
 
     @property
     def numpoints(self):
@@ -85,13 +166,12 @@ class Bezier(HashedList):
     @numpoints.setter
     def numpoints(self, num_ctrl, num_points=50):
         if not num_ctrl == self.numpoints:
-            data = [self(i) for i in np.linspace(0, 1, num_points)]
+            data = self(np.linspace(0, 1, num_points))
             self.fit(data, num_ctrl)
 
     def change_base(self, base, num_points=50):
-        data = [self(i) for i in np.linspace(0, 1, num_points)]
+        data = self(np.linspace(0, 1, num_points))
         self.basefactory = base
-        self._matrix = None
         self.fit(data, self.numpoints)
 
     @property
@@ -108,49 +188,7 @@ class Bezier(HashedList):
         Fit to a given set of points with a certain number of spline-points (default=3)
         if start (/ end) is True, the first (/ last) point of the Curve is included
         """
-        base = self.basefactory(numpoints)
-        matrix = np.matrix(
-            [[base[column](row * 1. / (len(points) - 1))
-                for column in range(len(base))]
-                    for row in range(len(points))])
-
-        if not start and not end:
-            matrix = np.linalg.pinv(matrix)
-            out = np.array(matrix * points)
-            return out
-        else:
-            A1 = np.array(matrix)
-            A2 = []
-            points2 = []
-            points1 = np.array(points)
-            solution = []
-
-            if start:
-                # add first column to A2 and remove first column of A1
-                A2.append(A1[:, 0])
-                A1 = A1[:, 1:]
-                points2.append(points[0])
-                points1 = points1[1:]
-
-            if end:
-                # add last column to A2 and remove last column of A1
-                A2.append(A1[:, -1])
-                A1 = A1[:, :-1]
-                points2.append(points[-1])
-                points1 = points[:-1]
-            A1_inv = np.linalg.inv(np.dot(A1.T, A1))
-            A2 = np.array(A2).T
-            points1 = np.array(points).T
-            points2 = np.array(points2).T
-            for dim, point in enumerate(points1):
-                rhs1 = np.array(A1.T.dot(point))
-                rhs2 = np.array((A1.T.dot(A2)).dot(points2[dim])).T
-                solution.append(np.array(A1_inv.dot(rhs1 - rhs2)))
-            solution = np.matrix(solution).T.tolist()
-            if start:
-                solution.insert(0, points[0])
-            if end:
-                solution.append(points[-1])
+        solution = self._fit(self.basefactory, points, numpoints, start, end).tolist()
 
         if type(self) == type:  # classmethod
             return self(solution)
@@ -158,6 +196,30 @@ class Bezier(HashedList):
             self.controlpoints = solution
             return self
 
+    @classmethod
+    def fit_many(cls, curves, numpoints=5, start=True, end=True):
+        """
+        Fit a list of point-lists, curves with the same number of points are fitted in one solve
+        """
+        groups = {}
+        for index, points in enumerate(curves):
+            groups.setdefault(len(points), []).append(index)
+
+        result = [None] * len(curves)
+        for indices in groups.values():
+            solution = cls._fit(cls.basefactory, [curves[i] for i in indices], numpoints, start, end)
+            for index, controlpoints in zip(indices, solution):
+                result[index] = cls(controlpoints.tolist())
+
+        return result
+
+    @staticmethod
+    def _fit(basefactory, points, numpoints, start, end):
+        points = np.asarray(points, dtype=float)
+        fixed = [0] * start + [numpoints - 1] * end
+        fixed_points = points[..., [0] * start + [-1] * end, :]
+        return basefactory.fit(numpoints, points, fixed, fixed_points)
+
     @dualmethod
     def constraint_fit(self, points, constraint):
         """constraint is a matrix in size of the controlpointmatrix
@@ -167,23 +229,15 @@ class Bezier(HashedList):
         # all points have same dimension
         dim = len(constraint[0])
         num_ctrl_pts = len(constraint)
+        points = np.asarray(points, dtype=float)
 
-        # create the base matrix:
-        base = self.basefactory(num_ctrl_pts)
-        matrix = np.array(
-            [[base[column](row * 1. / (len(points) - 1))
-                for column in range(len(base))]
-                    for row in range(len(points))])
-
-        # create the b vector for each dim
-        b = np.array(list(zip(*points)))
-
-        # fit
+        # fit each dimension with its own constraints
         solution = []
         constraints_T = list(zip(*constraint))
         for i in range(dim):
-            constraints = [[index, val] for index, val in enumerate(constraints_T[i]) if val != None]
-            solution.append(self.constraint_least_square_sol(matrix, b[i], constraints))
+            fixed = [index for index, val in enumerate(constraints_T[i]) if val is not None]
+            fixed_points = [[constraints_T[i][index]] for index in fixed]
+            solution.append(self.basefactory.fit(num_ctrl_pts, points[:, i:i+1], fixed, fixed_points)[:, 0])
         if type(self) == type:
             return self(np.array(solution).transpose())
         else:
@@ -227,16 +281,7 @@ class Bezier(HashedList):
         self.controlpoints = [p*[x,y] for p in self.controlpoints]
 
     def get_matrix(self, num=50):
-        num_points = len(self._data)
-        if self._matrix is not None and self._matrix.shape == (num, num_points):
-            return self._matrix
-        else:
-            self._matrix = np.ndarray([num, num_points])
-            functions = self.basefactory(num_points)
-            for row, value in enumerate(np.linspace(0, 1 , num)):
-                for col, foo in enumerate(functions):
-                    self._matrix[row, col] = foo(value)
-            return self._matrix
+        return self.basefactory.get_matrix(len(self._data), np.linspace(0, 1, num))
 
     def get_sequence(self, num=50):
         return np.dot(self.get_matrix(num), self._data)
@@ -278,8 +323,8 @@ class SymmetricBezier(Bezier):
     @numpoints.setter
     def numpoints(self, num_ctrl, num_points=50):
         if not num_ctrl == self.numpoints:
-            data = [self(i) for i in np.linspace(0, 1, num_points)]
-            self.fit(np.array(data), num_ctrl)
+            data = self(np.linspace(0, 1, num_points))
+            self.fit(data, num_ctrl)
 
     @dualmethod
     def fit(cls, data, numpoints=3, start=True, end=True):
@@ -287,6 +332,13 @@ class SymmetricBezier(Bezier):
         bez.controlpoints = bez.controlpoints[numpoints:]
         return bez
 
+    @classmethod
+    def fit_many(cls, curves, numpoints=3, start=True, end=True):
+        result = super(SymmetricBezier, cls).fit_many(curves, numpoints=2*numpoints, start=start, end=start)
+        for bez in result:
+            bez.controlpoints = bez.controlpoints[numpoints:]
+        return result
+
 
 
 def choose(n, k):
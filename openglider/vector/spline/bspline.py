@@ -1,54 +1,60 @@
-from openglider.vector.spline.bezier import Bezier, SymmetricBezier
-from openglider.utils import dualmethod
-
-class BSplineBase():
-    def __init__(self, degree=3):
-        self.degree = degree
-        self.bases = {}
-
-    def __call__(self, numpoints):      # number of controlpoints
-        if numpoints not in self.bases and True:
-            knots = self.make_knot_vector(self.degree, numpoints)
-            basis = [self.get_basis(self.degree, i, knots) for i in range(numpoints)]
-            self.bases[numpoints] = basis
+import numpy as np
 
-        return self.bases[numpoints]
+from openglider.vector.spline.bezier import Bezier, SymmetricBezier, _BasisFactory
+from openglider.utils import dualmethod
 
-    def get_basis(self, degree, i, knots):
-        """ Returns a basis_function for the given degree """
-        if degree == 0:
-            def basis_function(t):
-                """The basis function for degree = 0 as per eq. 7"""
-                t_this = knots[i]
-                t_next = knots[i+1]
-                return t_next >= t > t_this
-        else:
 
-            def basis_function(t):
-                """The basis function for degree > 0 as per eq. 8"""
-                if i == t == 0:
-                    return 1
-                out = 0.
-                t_this = knots[i]
-                t_next = knots[i+1]
-                t_precog  = knots[i+degree]
-                t_horizon = knots[i+degree+1]
+class BSplineBase(_BasisFactory):
+    recursions = {}
 
-                top = (t-t_this)
-                bottom = (t_precog-t_this)
+    def __init__(self, degree=3):
+        self.degree = degree
 
-                if bottom != 0:
-                    out = top/bottom * self.get_basis(degree-1, i, knots)(t)
+    def get_key(self, numpoints):
+        return (self.__class__, self.degree, numpoints)
 
-                top = (t_horizon-t)
-                bottom = (t_horizon-t_next)
-                if bottom != 0:
-                    out += top/bottom * self.get_basis(degree-1, i+1, knots)(t)
-                return out
+    def get_recursion(self, numpoints):
+        """
+        knot differences for all levels of the recursion:
+        [(t_this, t_next, t_horizon, 1/(t_precog-t_this), 1/(t_horizon-t_next)), ...]
+        (0 for zero knot spans)
+        """
+        key = (self.degree, numpoints)
+        if key not in self.recursions:
+            knots = np.array(self.make_knot_vector(self.degree, numpoints))
+            levels = []
+            for degree in range(1, self.degree + 1):
+                num = len(knots) - degree - 1
+                t_this = knots[:num]
+                t_next = knots[1:num+1]
+                t_precog = knots[degree:num+degree]
+                t_horizon = knots[degree+1:num+degree+1]
+                bottom_left = t_precog - t_this
+                bottom_right = t_horizon - t_next
+                levels.append((t_this, t_next, t_horizon,
+                               (bottom_left != 0) / np.where(bottom_left != 0, bottom_left, 1),
+                               (bottom_right != 0) / np.where(bottom_right != 0, bottom_right, 1)))
+            self.recursions[key] = knots, levels
+
+        return self.recursions[key]
+
+    def get_basis_matrix(self, numpoints, values):
+        """
+        Evaluate all basis functions (Cox-de Boor recursion) for an array of parameters
+        """
+        t = np.asarray(values, dtype=float)[:, np.newaxis]
+        knots, levels = self.get_recursion(numpoints)
 
-        return basis_function
+        # degree 0
+        basis = ((knots[1:] >= t) & (t > knots[:-1])).astype(float)
 
+        for t_this, t_next, t_horizon, factor_left, factor_right in levels:
+            num = len(t_this)
+            basis = ((t - t_this) * factor_left * basis[:, :num] +
+                     (t_horizon - t) * factor_right * basis[:, 1:num+1])
+            basis[t[:, 0] == 0, 0] = 1
 
+        return basis
 
     def make_knot_vector(self, degree, num_points):
         """
@@ -102,7 +108,6 @@ class SymmetricBSpline3(SymmetricBSpline):
 
 if __name__ == '__main__':
     import matplotlib.pyplot as plt
-    import numpy as np
 
     data = [[-0.2, 0.], [-0.5, 0.5], [-1., 0.], [-2, 3]]
     curve = SymmetricBSpline(data)
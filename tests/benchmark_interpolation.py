@@ -0,0 +1,33 @@
+"""
+Benchmark for the (batch) evaluation of Interpolation and ArcSinc.
+Run: python tests/benchmark_interpolation.py [number_of_queries]
+"""
+import sys
+
+import numpy as np
+
+import common
+
+from openglider.glider.ballooning import ArcSinc
+from openglider.vector.interpolate import Interpolation
+from benchmark_lines import timeit
+
+
+if __name__ == '__main__':
+    num_queries = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    print("{} queries".format(num_queries))
+
+    phi = np.linspace(np.pi, 0, 1001)
+    interpolation = Interpolation(np.array([np.sinc(phi / np.pi), phi]).T)
+    x_values = np.random.random(num_queries)
+
+    timeit("array call", interpolation, x_values)
+    timeit("scalar calls (1/100 sample)", lambda: [interpolation(x) for x in x_values[::100]])
+
+    unsorted = Interpolation(np.random.random((1000, 2)))
+    timeit("array call (unsorted data)", unsorted, x_values)
+
+    arcsinc = ArcSinc()
+    arcsinc.interpolate(1000)
+    timeit("arcsinc (table)", arcsinc, x_values)
+    timeit("arcsinc (newton)", ArcSinc.newton, x_values)
@@ -0,0 +1,83 @@
+"""
+Benchmark for the line-plan import/export with large synthetic linesets.
+Run: python tests/benchmark_lines.py [number_of_lines]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+import common
+
+from openglider.lines import LineSet
+from openglider.lines.import_text import import_lines, export_lines
+from openglider.glider.parametric.lines import LineSet2D, Line2D, LowerNode2D, UpperNode2D, BatchNode2D
+
+
+def create_text_input(path, num_lines, lines_per_tree=100):
+    with open(path, "w") as outfile:
+        nodes = []
+        lines = []
+
+        for tree_no in range(num_lines // lines_per_tree):
+            nodes.append("{}\t0\t0.\t{}\t-9.\tNone\tNone\tNone".format(len(nodes), tree_no))
+            free_nodes = [len(nodes) - 1]
+            for line_no in range(lines_per_tree):
+                lower = free_nodes[line_no // 2]
+                if line_no < lines_per_tree // 2 - 1:
+                    nodes.append("{}\t1\tNone\tNone\tNone\tNone\tNone\tNone".format(len(nodes)))
+                    free_nodes.append(len(nodes) - 1)
+                    length = 2.
+                else:
+                    nodes.append("{}\t2\t0\t{}\t4\t0\t0\t5".format(len(nodes), random.random() * 10))
+                    length = None
+                lines.append("{}\t{}\t{}\t{}\tliros.ltc45".format(len(lines), lower, len(nodes) - 1, length))
+
+        outfile.write("SYNTHETIC\n\nNODES\n")
+        outfile.write("\n".join(nodes))
+        outfile.write("\n\nLINES\n")
+        outfile.write("\n".join(lines))
+
+
+def create_lineset_2d(num_lines, lines_per_tree=100):
+    lines = []
+    for tree_no in range(num_lines // lines_per_tree):
+        lower = LowerNode2D([0, 0], [0, tree_no, -9], name="L{}".format(tree_no))
+        free_nodes = [lower]
+        for line_no in range(lines_per_tree):
+            if line_no < lines_per_tree // 2 - 1:
+                upper = BatchNode2D([0, 0])
+                free_nodes.append(upper)
+                length = 2.
+            else:
+                upper = UpperNode2D(tree_no, random.random(), name="A{}_{}".format(tree_no, line_no))
+                length = None
+            lines.append(Line2D(free_nodes[line_no // 2], upper, target_length=length, line_type="liros.ltc45"))
+
+    return LineSet2D(lines)
+
+
+def timeit(name, function, *args):
+    start = time.time()
+    result = function(*args)
+    print("{:<32}{:.3f}s".format(name, time.time() - start))
+    return result
+
+
+if __name__ == '__main__':
+    num_lines = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    print("{} lines".format(num_lines))
+    path = os.path.join(tempfile.gettempdir(), "benchmark_lines.txt")
+    create_text_input(path, num_lines)
+
+    lines = timeit("import text", import_lines, path)["LINES"][2]
+    lineset = LineSet(lines, [10, 0, 1])
+    timeit("export text", export_lines, lineset, path)
+    timeit("create tree (3d)", lineset.create_tree)
+
+    lineset_2d = create_lineset_2d(num_lines)
+    table = timeit("get_input_table (2d)", lineset_2d.get_input_table)
+    lower = {node.name: node for node in lineset_2d.get_lower_attachment_points()}
+    upper = {node.name: node for node in lineset_2d.get_upper_nodes()}
+    timeit("read_input_table (2d)", LineSet2D.read_input_table, table, lower, upper)
@@ -0,0 +1,36 @@
+"""
+Benchmark for the nesting of many small parts onto one roll.
+Run: python tests/benchmark_nesting.py [number_of_parts] [resolution]
+"""
+import sys
+
+import numpy as np
+
+import common
+
+from openglider.plots.drawing import PlotPart
+from openglider.plots.drawing.nesting import Nesting
+from openglider.vector import PolyLine2D
+from benchmark_lines import timeit
+
+
+def create_parts(num_parts):
+    parts = []
+    for part_no in range(num_parts):
+        width, height = np.random.random(2) * 0.3 + 0.05
+        outline = PolyLine2D([[0, 0], [width, 0], [width, height], [0, height], [0, 0]])
+        parts.append(PlotPart(cuts=[outline], name="p{}".format(part_no)))
+
+    return parts
+
+
+if __name__ == '__main__':
+    num_parts = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    resolution = float(sys.argv[2]) if len(sys.argv) > 2 else 0.01
+    print("{} parts, resolution: {}".format(num_parts, resolution))
+
+    np.random.seed(1)
+    parts = create_parts(num_parts)
+    nesting = Nesting(1.5, resolution=resolution)
+    roll = timeit("pack", nesting.pack, parts)
+    print(roll.get_report("roll"))
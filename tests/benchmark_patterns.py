@@ -0,0 +1,63 @@
+"""
+Benchmark for the pattern creation (PlotMaker.unwrap) of the demo kite.
+Run: python tests/benchmark_patterns.py [workers]
+"""
+import os
+import sys
+import tempfile
+
+import common
+import openglider.plots
+
+from benchmark_lines import timeit
+
+
+def unwrap(glider_3d, workers):
+    plotmaker = openglider.plots.PlotMaker(glider_3d)
+    return plotmaker.unwrap(workers=workers)
+
+
+def export_svg(layout, compact=False, precision=3, tolerance=0):
+    path = os.path.join(tempfile.gettempdir(), "benchmark_patterns.svg")
+    layout.export_svg(path, compact=compact, precision=precision, tolerance=tolerance)
+    size = os.path.getsize(path)
+    print("  {} bytes".format(size))
+    return size
+
+
+def export_dxf(layout, blocks=False):
+    path = os.path.join(tempfile.gettempdir(), "benchmark_patterns.dxf")
+    drawing = layout.export_dxf(path, blocks=blocks)
+    size = os.path.getsize(path)
+    print("  {} bytes, {} entities, {} blocks".format(size, len(drawing.modelspace()), len(drawing.blocks)))
+    return size
+
+
+if __name__ == '__main__':
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+    print("{} workers".format(workers))
+
+    glider_3d = timeit("get_glider_3d", common.TestCase.import_glider)
+    plotmaker = openglider.plots.PlotMaker(glider_3d)
+    cells = glider_3d.cells
+
+    timeit("flattened cells", lambda: [plotmaker._get_cellplotmaker(cell)._get_flatten_cell() for cell in cells])
+    timeit("midribs", lambda: [plotmaker._get_cellplotmaker(cell)._get_midribs() for cell in cells])
+    timeit("3d shaping", lambda: [plotmaker._get_cellplotmaker(cell)._get_3d_shaping() for cell in cells])
+    timeit("get_panels", plotmaker.get_panels)
+    timeit("get_ribs", plotmaker.get_ribs)
+    timeit("get_dribs", plotmaker.get_dribs)
+    timeit("get_straps", plotmaker.get_straps)
+    timeit("unwrap (new PlotMaker)", unwrap, glider_3d, workers)
+
+    layout = plotmaker.get_all_grouped()
+    layout.scale(1000)
+    size = timeit("export svg", export_svg, layout)
+    for precision, tolerance in ((3, 0), (2, 0), (2, 0.05)):
+        compact_size = timeit("compact svg ({}, {})".format(precision, tolerance),
+                              export_svg, layout, True, precision, tolerance)
+        print("  size reduction: {:.1%}".format(1 - compact_size / size))
+
+    size = timeit("export dxf", export_dxf, layout)
+    blocks_size = timeit("export dxf (blocks)", export_dxf, layout, True)
+    print("  size reduction: {:.1%}".format(1 - blocks_size / size))
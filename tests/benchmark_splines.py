@@ -0,0 +1,34 @@
+"""
+Benchmark for the evaluation of the shape curves (SymmetricBSpline) of a parametric glider.
+Run: python tests/benchmark_splines.py [repetitions]
+"""
+import sys
+
+import numpy as np
+
+import common
+
+from benchmark_lines import timeit
+
+
+def repeat(function, repetitions, *args):
+    for _ in range(repetitions):
+        result = function(*args)
+    return result
+
+
+if __name__ == '__main__':
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    print("{} repetitions".format(repetitions))
+
+    glider_2d = common.TestCase.import_glider_2d()
+    shape = glider_2d.shape
+    curves = [shape.front_curve, shape.back_curve, shape.rib_distribution, glider_2d.arc.curve]
+
+    timeit("get_sequence(50)", repeat, lambda: [c.get_sequence(50) for c in curves], repetitions)
+    timeit("interpolation(50)", repeat, lambda: [c.interpolation(50) for c in curves], repetitions)
+    timeit("__call__ (100 values)", repeat, lambda: [[c(x) for x in np.linspace(0, 1, 100)] for c in curves], repetitions)
+    timeit("__call__ (array of 100 values)", repeat, lambda: [c(np.linspace(0, 1, 100)) for c in curves], repetitions)
+    timeit("shape.ribs", repeat, lambda: shape.ribs, repetitions)
+    timeit("arc positions", repeat, glider_2d.arc.get_arc_positions, repetitions, shape.rib_x_values)
+    timeit("get_glider_3d", repeat, glider_2d.get_glider_3d, max(1, repetitions // 20))
@@ -20,6 +20,8 @@
 import unittest
 import random
 
+import numpy as np
+
 from common import openglider
 from openglider.glider import ballooning
 
@@ -52,6 +54,32 @@ class TestBallooningBezier(unittest.TestCase):
         for x in x_values:
             self.assertAlmostEqual(b1[x]+b2[x], mixed[x], places=2)
 
+    def test_array_values(self):
+        x_values = np.linspace(-1, 1, 101)
+        values = self.ballooning[x_values]
+        phi = self.ballooning.get_phi(x_values)
+        for x, value, angle in zip(x_values, values, phi):
+            self.assertAlmostEqual(self.ballooning[x], value)
+            self.assertAlmostEqual(self.ballooning(x)[0], angle)
+
+        self.assertRaises(ValueError, self.ballooning.get_values, [0.5, 1.5])
+
+
+class TestArcSinc(unittest.TestCase):
+    def setUp(self):
+        self.arcsinc = ballooning.ArcSinc()
+        self.arcsinc.interpolate(1000)
+
+    def test_newton(self):
+        phi = np.linspace(0, np.pi, 100)
+        self.assertTrue(np.allclose(ballooning.ArcSinc.newton(np.sinc(phi / np.pi)), phi, atol=1e-12))
+
+    def test_table(self):
+        phi = np.random.random(1000) * np.pi
+        values = self.arcsinc(np.sinc(phi / np.pi))
+        self.assertLess(abs(values - phi).max(), 4 / self.arcsinc.numpoints**2)
+        self.assertAlmostEqual(self.arcsinc(np.sinc(phi[0] / np.pi)), values[0])
+
 
 if __name__ == '__main__':
     unittest.main(verbosity=2)
\ No newline at end of file
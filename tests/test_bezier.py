@@ -22,7 +22,9 @@ from __future__ import division
 import unittest
 import random
 
-from openglider.vector.spline import Bezier
+import numpy as np
+
+from openglider.vector.spline import Bezier, BSpline, SymmetricBSpline
 
 
 class TestBezier(unittest.TestCase):
@@ -43,6 +45,16 @@ class TestBezier(unittest.TestCase):
             self.assertAlmostEqual(p1[0], p2[0], 0)
             self.assertAlmostEqual(p1[1], p2[1], 0)
 
+    def test_fit_many(self):
+        curves = [self.bezier.get_sequence(30) * random.random() for _ in range(5)]
+        curves.append(self.bezier.get_sequence(20))
+        fitted = Bezier.fit_many(curves, numpoints=6)
+        for curve, bezier in zip(curves, fitted):
+            single = Bezier.fit(curve, numpoints=6)
+            self.assertTrue(np.allclose(single.controlpoints, bezier.controlpoints))
+            self.assertTrue(np.allclose(bezier.controlpoints[0], curve[0]))
+            self.assertTrue(np.allclose(bezier.controlpoints[-1], curve[-1]))
+
     def test_length(self):
         self.bezier.controlpoints = [[0, 0], [2, 0]]
         self.assertAlmostEqual(self.bezier.get_length(10), 2.)
@@ -51,6 +63,47 @@ class TestBezier(unittest.TestCase):
         sequence = self.bezier.get_sequence(100)
         # print(sequence)
 
+    def test_array_call(self):
+        values = np.linspace(0, 1, 20)
+        points = self.bezier(values)
+        self.assertEqual(points.shape, (20, 2))
+        for value, point in zip(values, points):
+            self.assertAlmostEqual(np.linalg.norm(self.bezier(value) - point), 0)
+
+
+class TestBSpline(unittest.TestCase):
+    def setUp(self):
+        controlpoints = [[i, random.random()] for i in range(15)]
+        self.bezier = BSpline(controlpoints)
+
+    test_array_call = TestBezier.test_array_call
+
+    def test_basis(self):
+        for numpoints in range(3, 10):
+            matrix = self.bezier.basefactory.get_matrix(numpoints, np.linspace(0, 1, 30))
+            self.assertTrue(np.allclose(matrix.sum(axis=1), 1))
+            self.assertTrue(np.all(matrix >= 0))
+
+    def test_matrix_cache(self):
+        factory = self.bezier.basefactory
+        values = np.linspace(0, 1, 30)
+        matrix = factory.get_matrix(15, values)
+        for x in np.random.random(factory.max_cached_matrices):
+            self.bezier(x)
+        self.assertIs(factory.get_matrix(15, values), matrix)
+
+    def test_fit_matrix_cache(self):
+        factory = self.bezier.basefactory
+        fit_matrices = factory.get_fit_matrices(15, 30)
+        for num_samples in range(31, 31 + factory.max_cached_matrices):
+            factory.get_fit_matrices(15, num_samples)
+            self.assertIs(factory.get_fit_matrices(15, 30), fit_matrices)
+
+    def test_symmetric(self):
+        curve = SymmetricBSpline([[0.2, 0], [0.5, 0.5], [1, 0]])
+        points = curve(np.linspace(0, 1, 21))
+        self.assertTrue(np.allclose(points[::-1] * [-1, 1], points))
+
 
 
 if __name__ == '__main__':
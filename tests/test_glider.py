@@ -17,11 +17,17 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with OpenGlider.  If not, see <http://www.gnu.org/licenses/>.
+import math
 import random
 import unittest
 
+import numpy as np
+
 from common import *
 import openglider.glider
+from openglider.glider.cell import Panel
+from openglider.vector import norm
+from openglider.vector.projection import flatten_list
 
 
 class GliderTestClass(TestCase):
@@ -67,6 +73,83 @@ class TestGlider(GliderTestClass):
     def copy_complete(self):
         self.glider.copy_complete()
 
+    def test_attachment_point_positions(self):
+        points = self.glider.lineset.attachment_points
+        self.glider.lineset.calc_attachment_point_positions()
+        for point in points:
+            vec = point.vec
+            self.assertAlmostEqual(norm(vec - point.get_position()), 0)
+
+    def test_flatten_list(self):
+        cell = self.glider.cells[len(self.glider.cells) // 2]
+        left, right = flatten_list(cell.prof1, cell.prof2)
+        left_3d, right_3d = cell.prof1.data, cell.prof2.data
+
+        def lengths(line):
+            return np.linalg.norm(np.diff(line, axis=0), axis=1)
+
+        self.assertTrue(np.allclose(lengths(left.data), lengths(left_3d)))
+        self.assertTrue(np.allclose(lengths(right.data), lengths(right_3d)))
+        self.assertTrue(np.allclose(np.linalg.norm(right.data - left.data, axis=1),
+                                    np.linalg.norm(right_3d - left_3d, axis=1)))
+
+    def test_integrate_3d_shaping(self):
+        cell = self.glider.cells[len(self.glider.cells) // 2]
+        inner = cell.get_flattened_cell(midribs=5)["inner"]
+        midribs = cell.get_midribs(5)
+        amounts = Panel.integrate_3d_shaping_panels(cell.panels, cell, 0.03, inner, midribs)
+        for panel, (front, back) in zip(cell.panels, amounts):
+            front_2, back_2 = integrate_3d_shaping(panel, cell, 0.03, inner, midribs)
+            for value, value_2 in zip(front + back, front_2 + back_2):
+                self.assertAlmostEqual(value, value_2)
+            self.assertEqual((front, back), panel.integrate_3d_shaping(cell, 0.03, inner, midribs))
+
+
+def integrate_3d_shaping(panel, cell, sigma, inner_2d, midribs):
+    """
+    Reference implementation (segment-wise) of Panel.integrate_3d_shaping
+    """
+    numribs = len(inner_2d) - 2
+    ribs = [cell.prof1] + midribs + [cell.prof2]
+    positions = panel._get_ik_values(cell, numribs)
+    ff = math.sqrt(math.pi/2)*sigma
+    front = []
+    back = []
+
+    for rib_no in range(numribs + 2):
+        x1, x2 = positions[rib_no]
+        lengthes_2d = inner_2d[rib_no][x1:x2].get_segment_lengthes()
+        lengthes_3d = ribs[rib_no][x1:x2].get_segment_lengthes()
+
+        amounts = []
+        for lengthes in (zip(lengthes_2d, lengthes_3d), zip(lengthes_2d[::-1], lengthes_3d[::-1])):
+            distance = 0
+            amount = 0
+            for l2d, l3d in lengthes:
+                factor = (l3d - l2d) / l3d
+                x = math.erf((distance + l3d) / (sigma*math.sqrt(2))) - math.erf(distance / (sigma*math.sqrt(2)))
+                amount += factor * x
+                distance += l3d
+            amounts.append(amount * ff)
+
+        amount_front, amount_back = amounts
+        total = sum(l3d - l2d for l2d, l3d in zip(lengthes_2d, lengthes_3d))
+
+        if panel.cut_front["type"] != "cut_3d" and panel.cut_back["type"] != "cut_3d":
+            if abs(amount_front + amount_back) > abs(total):
+                normalization = abs(total / (amount_front + amount_back))
+                amount_front *= normalization
+                amount_back *= normalization
+
+        if rib_no == 0 or rib_no == numribs+1:
+            amount_front = 0
+            amount_back = 0
+
+        front.append(amount_front)
+        back.append(amount_back)
+
+    return front, back
+
 
 if __name__ == '__main__':
     unittest.main(verbosity=2)
\ No newline at end of file
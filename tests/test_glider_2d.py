@@ -5,6 +5,7 @@ import os
 from common import *
 from openglider import jsonify
 from openglider.glider import ParametricGlider
+from openglider.glider.parametric.lines import LineSet2D
 
 TEMPDIR =  tempfile.gettempdir()
 
@@ -28,6 +29,26 @@ class GliderTestCase2D(TestCase):
     def test_export_ods(self):
         exp = self.glider2d.export_ods(os.path.join(TEMPDIR, "test.ods"))
 
+    def test_lines_table(self):
+        lineset = self.glider2d.lineset
+        table = lineset.get_input_table()
+        lower = {str(node.name): node for node in lineset.get_lower_attachment_points()}
+        upper = {node.name: node for node in lineset.get_upper_nodes()}
+
+        lineset_2 = LineSet2D.read_input_table(table, lower, upper)
+        self.assertEqual(len(lineset_2.lines), len(lineset.lines))
+        self.assertEqual(lineset_2.get_input_table().dct, table.dct)
+
+    def test_scale_forces(self):
+        lineset = self.glider2d.lineset
+        glider = self.glider2d.get_glider_3d()
+        node = lineset.get_lower_attachment_points()[0]
+        lineset.scale_forces(glider, node, 100.)
+
+        upper_nodes = lineset.get_topology().get_node_influence_nodes(node)
+        force_z = sum(upper.get_node(glider).force[2] for upper in upper_nodes)
+        self.assertAlmostEqual(force_z, 100.)
+
     def test_set_area(self):
         self.glider2d.shape.set_area(10)
         self.assertAlmostEqual(self.glider2d.shape.area, 10)
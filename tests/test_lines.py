@@ -1,8 +1,12 @@
 import unittest
 import os
+import random
+import tempfile
 
-from openglider.lines.import_text import import_lines
+from openglider.lines.import_text import import_lines, export_lines
 from openglider.lines import LineSet
+from openglider.lines.line_types import LineType
+from openglider.vector import norm
 
 
 test_dir = os.path.dirname(os.path.abspath(__file__))
@@ -33,6 +37,51 @@ class TestLines(unittest.TestCase):
     def test_case_4(self):
         self.runcase(test_dir+"/lines/TEST_INPUT_FILE_4.txt")
 
+    def test_line_points(self):
+        key_dict = import_lines(test_dir+"/lines/TEST_INPUT_FILE_1.txt")
+        lineset = LineSet(key_dict["LINES"][2], [10, 0, 1])
+        lineset.recalc()
+
+        points = lineset.get_line_points(numpoints=5)
+        for line, line_points in zip(lineset.lines, points):
+            for i, point in enumerate(line_points):
+                self.assertAlmostEqual(norm(point - line.get_line_point(i / 4)), 0)
+
+        mesh = lineset.get_mesh(numpoints=5)
+        self.assertEqual(len(mesh.polygons["lines"]), 4 * len(lineset.lines))
+
+    def test_export_text(self):
+        for i in range(1, 5):
+            path = test_dir+"/lines/TEST_INPUT_FILE_{}.txt".format(i)
+            lineset = LineSet(import_lines(path)["LINES"][2], [10, 0, 1])
+            with tempfile.NamedTemporaryFile("w", suffix=".txt") as outfile:
+                export_lines(lineset, outfile.name)
+                lines = import_lines(outfile.name)["LINES"][2]
+
+            self.assertEqual(len(lines), len(lineset.lines))
+            for line_1, line_2 in zip(lineset.lines, lines):
+                self.assertEqual(line_1.type, line_2.type)
+                self.assertEqual(line_1.target_length, line_2.target_length)
+                for node_1, node_2 in ((line_1.lower_node, line_2.lower_node),
+                                       (line_1.upper_node, line_2.upper_node)):
+                    self.assertEqual(node_1.type, node_2.type)
+                    self.assertEqual(list(node_1.vec), list(node_2.vec))
+                    self.assertEqual(list(node_1.force), list(node_2.force))
+
+
+
+class TestLineTypes(unittest.TestCase):
+    def test_stretch_factors(self):
+        names = list(LineType.types.keys())
+        type_ids = [random.choice(names) for _ in range(200)]
+        forces = [random.random() * 3000 - 100 for _ in range(200)]
+
+        factors = LineType.get_stretch_factors(type_ids, forces)
+        for name, force, factor in zip(type_ids, forces, factors):
+            line_type = LineType.get(name)
+            self.assertAlmostEqual(factor, line_type.get_stretch_factor(force))
+            self.assertAlmostEqual(factor, 1 + line_type.stretch_interpolation(force) / 100)
+
 
 if __name__ == '__main__':
     unittest.main(verbosity=2)
\ No newline at end of file
@@ -1,10 +1,20 @@
 import unittest
 
+import io
 import tempfile
 import os
+from xml.etree import ElementTree
+import ezdxf
+import numpy as np
 import openglider
 import openglider.plots
 import openglider.plots.glider
+from openglider.plots.drawing import Layout, PlotPart
+from openglider.plots.drawing.export import LayoutData, write_svg
+from openglider.plots.drawing.nesting import Nesting
+from openglider.plots.marks import Arrow
+from openglider.vector.text import Text
+from openglider.vector import PolyLine2D
 from common import TestCase
 
 
@@ -16,6 +26,20 @@ class TestPlots(TestCase):
         self.glider_3d = self.glider_2d.get_glider_3d()
         self.plotmaker = openglider.plots.PlotMaker(self.glider_3d)
 
+    def test_unwrap_workers(self):
+        serial = openglider.plots.PlotMaker(self.glider_3d).unwrap(workers=1).get_all_grouped()
+        parallel = openglider.plots.PlotMaker(self.glider_3d).unwrap(workers=2).get_all_grouped()
+
+        self.assertEqual(parallel.get_svg_drawing().tostring(), serial.get_svg_drawing().tostring())
+
+        # the dxf writer only reads the layout data (the files differ in handles and timestamps)
+        serial_data = LayoutData.from_layout(serial)
+        parallel_data = LayoutData.from_layout(parallel)
+        self.assertEqual(parallel_data.points.tobytes(), serial_data.points.tobytes())
+        self.assertEqual(list(parallel_data.line_offsets), list(serial_data.line_offsets))
+        self.assertEqual(parallel_data.groups, serial_data.groups)
+        self.assertEqual(parallel_data.parts, serial_data.parts)
+
     @unittest.skip("not working")
     def test_patterns_panels(self):
         self.plotmaker.get_panels()
@@ -38,5 +62,166 @@ class TestPlots(TestCase):
         dwg = self.plotmaker.get_all_stacked()["ribs"]
         dwg.export_dxf(os.path.join(TEMPDIR, "test_ribs.dxf"))
 
+
+class TestPlotPart(unittest.TestCase):
+    def test_transform(self):
+        lines = [PolyLine2D(np.random.random((10, 2))) for _ in range(3)]
+        part = PlotPart(cuts=[lines[0].copy()], marks=[line.copy() for line in lines[1:]])
+        self.assertAlmostEqual(part.max_x, max(line.data[:, 0].max() for line in lines))
+
+        part.rotate(0.5)
+        part.move([1, 2])
+        part.scale(2)
+        for line in lines:
+            line.rotate(0.5).move([1, 2]).scale(2)
+
+        for line, line_part in zip(lines, list(part.layers["cuts"]) + list(part.layers["marks"])):
+            self.assertTrue(np.allclose(line.data, line_part.data))
+
+        points = np.concatenate([line.data for line in lines])
+        self.assertTrue(np.allclose(part.bbox[0], points.min(axis=0)))
+        self.assertTrue(np.allclose(part.bbox[2], points.max(axis=0)))
+
+        part.layers["marks"].append(PolyLine2D([[100, 0]]))
+        self.assertEqual(part.max_x, 100)
+
+        # in-place change of a polyline
+        line = list(part.layers["cuts"])[0]
+        line[1] = [200, 0]
+        self.assertEqual(part.max_x, 200)
+        self.assertTrue(np.allclose(part.layers["cuts"].get_points()[1], [200, 0]))
+
+    def test_export(self):
+        parts = [PlotPart(cuts=[PolyLine2D(np.random.random((10, 2)))], marks=[PolyLine2D([[0.5, 0.5]])],
+                          material_code="Ncv#0000FF", name="p{}".format(i)) for i in range(3)]
+        layout = Layout(parts)
+
+        for add_styles in (False, True):
+            drawing = layout.get_svg_drawing()
+            if add_styles:
+                layout.add_svg_styles(drawing)
+            svg = io.StringIO()
+            write_svg(LayoutData.from_layout(layout), svg, add_styles=add_styles)
+            self.assertEqual(svg.getvalue().split("\n", 1)[1], drawing.tostring())
+
+        svg = io.StringIO()
+        write_svg(LayoutData.from_layout(layout), svg, compact=True, precision=2)
+        root = ElementTree.fromstring(svg.getvalue().split("\n", 1)[1])
+        paths = [element.get("d") for element in root.iter("{http://www.w3.org/2000/svg}path")]
+        self.assertEqual(len(paths), 6)
+        start = [float(x) for x in paths[0][1:].split("l")[0].split()]
+        self.assertTrue(np.allclose(start, list(parts[0].layers["cuts"])[0][0], atol=0.005))
+
+        # empty lines are skipped
+        parts[0].layers["marks"].append(PolyLine2D([]))
+        svg = io.StringIO()
+        write_svg(LayoutData.from_layout(layout), svg, compact=True, precision=2)
+        root = ElementTree.fromstring(svg.getvalue().split("\n", 1)[1])
+        self.assertEqual(len(list(root.iter("{http://www.w3.org/2000/svg}path"))), 6)
+
+        # same shape at another position -> one symbol
+        mark = np.round(np.random.random((10, 2)), 2)
+        parts[1].layers["marks"].append(PolyLine2D(mark))
+        parts[2].layers["marks"].append(PolyLine2D(mark + [1, 0]))
+        svg = io.StringIO()
+        write_svg(LayoutData.from_layout(layout), svg, compact=True, precision=2)
+        root = ElementTree.fromstring(svg.getvalue().split("\n", 1)[1])
+        self.assertEqual(len(list(root.iter("{http://www.w3.org/2000/svg}symbol"))), 1)
+        self.assertEqual(len(list(root.iter("{http://www.w3.org/2000/svg}use"))), 2)
+
+        path = os.path.join(TEMPDIR, "test_export.npz")
+        report = layout.export([(path, "npz", None)])
+        self.assertEqual(report[0][0], path)
+
+        data = LayoutData.read_npz(path)
+        self.assertTrue(np.allclose(data.points, LayoutData.from_layout(layout).points))
+        self.assertEqual(data.parts[1], ("p1", "Ncv#0000FF"))
+
+        # the writers work on the data read back
+        self.assertTrue(np.allclose(data.extent, layout.get_extent()))
+        svg = io.StringIO()
+        write_svg(data, svg)
+        svg_layout = io.StringIO()
+        write_svg(LayoutData.from_layout(layout), svg_layout)
+        self.assertEqual(svg.getvalue(), svg_layout.getvalue())
+
+    def test_export_dxf_blocks(self):
+        arrow = Arrow()
+        outline = np.random.random((10, 2))
+        parts = []
+        for i in range(3):
+            p1 = np.random.random(2)
+            p2 = p1 + np.random.random(2)
+            # same outline for every part: cuts are never written as blocks
+            parts.append(PlotPart(cuts=[PolyLine2D(outline + [2 * i, 0])], marks=arrow(p1, p2),
+                                  text=Text("ab{}".format(i), p1, p2).get_vectors(), name="p{}".format(i)))
+        layout = Layout(parts)
+
+        path = os.path.join(TEMPDIR, "test_blocks.dxf")
+        layout.export_dxf(path, blocks=True)
+        # arrow, a, b
+        inserts = ezdxf.readfile(path).modelspace().query("INSERT")
+        self.assertEqual(len(inserts), 9)
+        self.assertEqual({insert.dxf.layer for insert in inserts}, {"marks", "text"})
+
+        # groups are unordered
+        def get_lines(part, layer_name):
+            return sorted((line.data for line in part.layers[layer_name]), key=lambda data: (len(data), data[0, 0]))
+
+        imported = Layout.import_dxf(path)
+        for part, imported_part in zip(parts, imported.parts):
+            for layer_name in ("cuts", "marks", "text"):
+                lines = get_lines(part, layer_name)
+                imported_lines = get_lines(imported_part, layer_name)
+                self.assertEqual(len(lines), len(imported_lines))
+                for line, imported_line in zip(lines, imported_lines):
+                    self.assertTrue(np.allclose(line, imported_line))
+
+
+class TestNesting(unittest.TestCase):
+    @staticmethod
+    def rectangle(width, height, material_code=""):
+        outline = PolyLine2D([[0, 0], [width, 0], [width, height], [0, height], [0, 0]])
+        return PlotPart(cuts=[outline], material_code=material_code)
+
+    def test_pack(self):
+        nesting = Nesting(1., resolution=0.01, distance=0.02)
+        parts = [self.rectangle(0.6, 0.3), self.rectangle(0.3, 0.6), self.rectangle(0.5, 0.4), self.rectangle(2, 0.1)]
+        roll = nesting.pack(parts)
+
+        self.assertEqual(len(roll.parts), 4)
+        for i, part in enumerate(roll.parts):
+            self.assertGreaterEqual(part.min_y, 0)
+            self.assertLessEqual(part.max_y, 1.)
+            for other in roll.parts[i+1:]:
+                dist_x = max(other.min_x - part.max_x, part.min_x - other.max_x)
+                dist_y = max(other.min_y - part.max_y, part.min_y - other.max_y)
+                self.assertGreaterEqual(max(dist_x, dist_y), 0.02)
+
+        area = 0.6*0.3 + 0.3*0.6 + 0.5*0.4 + 2*0.1
+        self.assertAlmostEqual(roll.utilization, area / roll.roll_length, delta=0.05)
+
+    def test_rotations(self):
+        part = self.rectangle(0.3, 1.5)
+        self.assertEqual(Nesting(1.).pack([part]).unplaced[0], part)
+
+        roll = Nesting(1., rotations=(0, 90)).pack([part])
+        self.assertAlmostEqual(roll.roll_length, 1.5, delta=0.02)
+
+    def test_minimize_area(self):
+        part = self.rectangle(0.3, 1.2)
+        part.rotate(0.3)
+        part.minimize_area()
+        self.assertAlmostEqual(part.width, 1.2)
+        self.assertAlmostEqual(part.height, 0.3)
+
+    def test_pack_layout(self):
+        layout = openglider.plots.Layout([self.rectangle(0.2, 0.2, "a"), self.rectangle(0.2, 0.2, "b"),
+                                          self.rectangle(0.2, 0.2, "a")])
+        rolls = Nesting(1.).pack_layout(layout)
+        self.assertEqual(sorted(rolls), ["a", "b"])
+        self.assertEqual(len(rolls["a"].parts), 2)
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -21,6 +21,9 @@
 import os
 import tempfile
 import unittest
+
+import numpy as np
+
 from common import import_dir
 from openglider.airfoil import Profile2D
 from test_vector import *
@@ -45,6 +48,35 @@ class TestProfile(unittest.TestCase):
         x = random.random() * random.randint(-1, 1)
         self.assertAlmostEqual(abs(x), self.prof.profilepoint(x)[0])
 
+    def test_profilepoint_array(self):
+        xvals = np.random.random(20) * 2 - 1
+        heights = np.random.random(20) * 2 - 1
+        points = self.prof.profilepoint(xvals, heights)
+        for x, h, p in zip(xvals, heights, points):
+            self.assertTrue(np.allclose(p, self.prof.profilepoint(x, h)))
+            self.assertTrue(np.allclose(self.prof.profilepoint(abs(x), h), self.prof.align([abs(x), h])))
+        aligned = self.prof.align(np.array([abs(xvals), heights]).T)
+        self.assertTrue(np.allclose(aligned, self.prof.profilepoint(abs(xvals), heights)))
+
+    def test_profilepoint_setitem(self):
+        xvals = np.linspace(-1, 1, 500)
+        self.prof(xvals)
+        i = self.prof.noseindex // 2
+        self.prof[i] = [(self.prof[i - 1][0] + self.prof[i][0]) / 2, self.prof[i][1]]
+        fresh = Profile2D(self.prof.data.copy())
+        self.assertTrue(np.allclose(self.prof(xvals), fresh(xvals)))
+
+    def test_resample(self):
+        other = self.prof.copy()
+        other *= 0.8
+        profiles = [self.prof.copy(), other, self.prof.copy()]
+        x_values = np.linspace(-1, 1, 51)
+        Profile2D.resample(profiles, x_values)
+        for profile, source in zip(profiles, [self.prof, other, self.prof]):
+            source = source.copy()
+            source.x_values = x_values
+            self.assertTrue(np.allclose(profile.data, source.data))
+
     def test_multiplication(self):
         factor = random.random()
         other = self.prof * factor
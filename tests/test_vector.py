@@ -18,8 +18,9 @@
 # You should have received a copy of the GNU General Public License
 # along with OpenGlider.  If not, see <http://www.gnu.org/licenses/>.
 import numpy as np
-from openglider.vector.functions import norm, normalize, rotation_3d
+from openglider.vector.functions import norm, normalize, rotation_3d, cut, minimum_area_rectangle, douglas_peucker
 from openglider.vector.polyline import PolyLine, PolyLine2D
+from openglider.vector.interpolate import Interpolation
 
 
 __author__ = 'simon'
@@ -93,6 +94,28 @@ class TestVector3D(unittest.TestCase):
                                    "\nresult: i2=" + str(new) + " leng2=" + str(leng2) +
                                    " dist=" + str(norm(thalist[start] - thalist[new])))
 
+    def test_positions_at_lengths(self):
+        for thalist in self.vectors:
+            segment_lengths = np.linalg.norm(np.diff(thalist.data, axis=0), axis=1)
+            total = segment_lengths.sum()
+            lengths = np.random.random(20) * total * 1.2 - 0.1 * total
+            positions = thalist.positions_at_lengths(lengths)
+            for length, ik in zip(lengths, positions):
+                # sequential walk along the segments (extrapolate at both ends)
+                i = 0
+                while i < len(segment_lengths) - 1 and length > segment_lengths[i]:
+                    length -= segment_lengths[i]
+                    i += 1
+                self.assertAlmostEqual(ik, i + length / segment_lengths[i])
+
+    def test_length_index_reset(self):
+        thalist = self.vectors[0]
+        length = thalist.get_length()
+        last = len(thalist) - 1
+        last_segment = norm(thalist[last] - thalist[last - 1])
+        thalist[last] = thalist[last - 1]
+        self.assertAlmostEqual(thalist.get_length(), length - last_segment)
+
 
 class TestVector2D(TestVector3D):
     def setUp(self, dim=2):
@@ -105,6 +128,12 @@ class TestVector2D(TestVector3D):
         for thalist in self.vectors:
             thalist.check()
 
+    def test_check_loop(self):
+        line = PolyLine2D([[0, 0], [1, 0], [2, 0], [2, 1], [1.5, -1], [3, -1], [4, -1], [4, -1], [5, -1]])
+        self.assertEqual([(i, j) for i, j, _ in line.get_self_intersections()], [(1, 3)])
+        line.check()
+        self.assertTrue(np.allclose(line.data, [[0, 0], [1.75, 0], [1.5, -1], [3, -1], [4, -1], [5, -1]]))
+
     def test_normvectors(self):
         for thalist in self.vectors:
             i = random.randint(1, len(thalist)-3)  # TODO: Fix for other values
@@ -129,6 +158,20 @@ class TestVector2D(TestVector3D):
             neu = thalist.cut(p1, p2, i - 1)
             #self.assertAlmostEqual(i, neu[1])
 
+    def test_cut_many(self):
+        thalist = self.vectors[0]
+        lines = [(np.random.random(2) * 100, np.random.random(2) * 100) for _ in range(10)]
+        startpoint = random.randint(0, len(thalist) - 1)
+        cuts_many = thalist.cut_many(lines, startpoint, extrapolate=True)
+        for (p1, p2), cuts in zip(lines, cuts_many):
+            self.assertEqual(cuts, list(thalist.cut(p1, p2, startpoint, extrapolate=True)))
+            for ik1, ik2 in cuts:
+                i = min(int(ik1), len(thalist) - 2)
+                point, k1, k2 = cut(thalist[i], thalist[i+1], p1, p2)
+                self.assertTrue(np.isclose(ik1, i + k1))
+                self.assertTrue(np.isclose(ik2, k2))
+                self.assertTrue(np.allclose(thalist[ik1], point))
+
 class TestVectorFunctions3D(unittest.TestCase):
     def setUp(self):
         self.vectors = [
@@ -160,8 +203,52 @@ class TestVectorFunctions3D(unittest.TestCase):
                 for i in range(3):
                     self.assertAlmostEqual(p1[i], p2[i])
 
+    def test_minimum_area_rectangle(self):
+        angle = 2*random.random() - 1
+        rectangle = np.array([[0, 0], [3, 0], [3, 1], [0, 1]])
+        points = np.concatenate([rectangle, np.random.random((100, 2)) * [3, 1]])
+        points = points.dot([[np.cos(angle), np.sin(angle)], [-np.sin(angle), np.cos(angle)]])
+
+        rect_angle, width, height = minimum_area_rectangle(points)
+        self.assertAlmostEqual(width * height, 3)
+        self.assertAlmostEqual(np.cos(rect_angle - angle) ** 2, max(width, height) == width)
+
+    def test_douglas_peucker(self):
+        x = np.linspace(0, 1, 100)
+        line = np.array([x, np.abs(x - 0.5) + 0.001 * np.random.random(100)]).T
+        indices = douglas_peucker(line, 0.01)
+        self.assertEqual(len(indices), 3)
+        self.assertEqual(list(indices[[0, -1]]), [0, 99])
+        self.assertEqual(len(douglas_peucker(line, 0)), 100)
+
 
 
+class TestInterpolation(unittest.TestCase):
+    def setUp(self):
+        x_values = sorted(random.random() for _ in range(20))
+        self.interpolation = Interpolation([[x, random.random()] for x in x_values])
+        self.x_values = [2 * random.random() - 0.5 for _ in range(100)]
+
+    def test_array_call(self):
+        values = self.interpolation(self.x_values)
+        for x, value in zip(self.x_values, values):
+            self.assertAlmostEqual(self.interpolation(x), value)
+
+    def test_extrapolate(self):
+        first, second = self.interpolation.data[:2]
+        x = first[0] - 1
+        value = first[1] + (x - first[0]) / (second[0] - first[0]) * (second[1] - first[1])
+        self.assertAlmostEqual(self.interpolation(x), value)
+
+        self.interpolation.extrapolate = False
+        self.assertRaises(ValueError, self.interpolation, x)
+
+    def test_setitem(self):
+        interpolation = Interpolation([[0., 0], [1, 1], [2, 2], [3, 3]])
+        self.assertAlmostEqual(interpolation(1.5), 1.5)
+        interpolation[1] = [1.8, 1]
+        self.assertAlmostEqual(interpolation(1.5), 1.5 / 1.8)
+
 
 if __name__ == '__main__':
     unittest.main(verbosity=2)
\ No newline at end of file